@@ -595,6 +595,32 @@ def assemble(asm, symmetric=False, format='csr'):
     else:
         return X.asmatrix(format)
 
+def assemble_multi(asms, symmetric=False, format='csr'):
+    """Assemble several matrices over the same pair of spaces.
+
+    The entries of all assemblers in `asms` are computed in a single sweep
+    over the common sparsity pattern. Returns a list of matrices in the
+    given `format`.
+    """
+    kvs0, kvs1 = asms[0].kvs
+    struc = MLStructure.from_kvs(kvs0, kvs1)
+    for asm in asms[1:]:
+        assert all(np.array_equal(bi, bj) for (bi, bj)
+                in zip(MLStructure.from_kvs(*asm.kvs).bidx, struc.bidx)), \
+                'Assemblers must have the same sparsity pattern'
+
+    if isinstance(asms[0], assemble_tools.BaseAssembler2D):
+        data = assemble_tools.generic_assemble_core_multi_2d(asms, struc.bidx, symmetric=symmetric)
+    elif isinstance(asms[0], assemble_tools.BaseAssembler3D):
+        data = assemble_tools.generic_assemble_core_multi_3d(asms, struc.bidx, symmetric=symmetric)
+    else:
+        assert False, 'Unknown assembler type'
+    Xs = [struc.make_mlmatrix(data=D) for D in np.asarray(data)]
+    if format == 'mlb':
+        return Xs
+    else:
+        return [X.asmatrix(format) for X in Xs]
+
 def assemble_vector(asm, symmetric=False, format='csr', layout='blocked'):
     assert layout in ('packed', 'blocked')
 
@@ -190,13 +190,18 @@ cdef IntInterval find_joint_support_functions(ssize_t[:,::1] meshsupp, long i) n
         j += 1
     return make_intv(minj, maxj+1)
 
-# returned array has axes (basis function, grid point, derivative)
 def compute_values_derivs(kv, grid, derivs):
+    """Evaluate all basis functions of `kv` and their derivatives up to order
+    `derivs` at the points `grid`.
+
+    Returns an array of shape `(numdofs, derivs+1, len(grid))`, i.e., the
+    points are the fastest-varying axis.
+    """
     colloc = bspline.collocation_derivs(kv, grid, derivs=derivs)
     colloc = tuple(X.T.A for X in colloc)
     # The assemblers expect the resulting array to be in C-order.  Depending on
     # numpy version, stack() does not guarantee that, so enforce contiguity.
-    return np.ascontiguousarray(np.stack(colloc, axis=-1))
+    return np.ascontiguousarray(np.stack(colloc, axis=1))
 
 
 #### determinants and inverses
@@ -42,39 +42,38 @@ cdef class MassAssembler2D(BaseAssembler2D):
         self.S0.C1 = compute_values_derivs(kvs0[1], gaussgrid[1], derivs=0)
 
         cdef double[:, :, :, ::1] geo_grad_a
-        cdef double[:, ::1] GaussWeight
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        GaussWeight = gaussweights[0][:,None] * gaussweights[1][None,:]
         self.W = np.empty(N + ())
         MassAssembler2D.precompute_fields(
                 geo_grad_a,
-                GaussWeight,
+                gaussweights[0], gaussweights[1],
                 self.W,
         )
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
             double[:, :, :, ::1] _geo_grad_a,
-            double[:, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1,
             # output
             double[:, ::1] _W,
         ) nogil:
         cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
         cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
         cdef double* geo_grad_a
         cdef double GaussWeight
         cdef double W
-        cdef size_t i0
-        cdef size_t i1
 
         for i0 in range(n0):
             for i1 in range(n1):
                 geo_grad_a = &_geo_grad_a[i0, i1, 0, 0]
-                GaussWeight = _GaussWeight[i0, i1]
+                GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1]
 
                 W = (GaussWeight * fabs(((geo_grad_a[0] * geo_grad_a[3]) - (geo_grad_a[1] * geo_grad_a[2]))))
                 _W[i0, i1] = W
@@ -82,31 +81,39 @@ cdef class MassAssembler2D(BaseAssembler2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, ::1] _W,
+            double* _W,
+            size_t n0, size_t n1,
+            size_t s0,
             double* VDu0, double* VDu1,
             double* VDv0, double* VDv1,
+            size_t ng0, size_t ng1,
         ) nogil:
         cdef double result = 0.0
+        cdef double acc1
 
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
-        cdef double W
+        cdef size_t q
         cdef size_t i0
         cdef size_t i1
+        cdef double W
 
         for i0 in range(n0):
+            acc1 = 0.0
             for i1 in range(n1):
-                W = _W[i0, i1]
+                q = i0*s0 + i1
+                W = _W[q]
 
-                result += (((VDu0[1*i0+0] * VDu1[1*i1+0]) * (VDv0[1*i0+0] * VDv1[1*i1+0])) * W)
+                acc1 += (VDu1[i1] * VDv1[i1]) * W
+            result += (VDu0[i0] * VDv0[i0]) * acc1
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[2] i, size_t[2] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t j0, size_t j1) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[2]
@@ -114,28 +121,31 @@ cdef class MassAssembler2D(BaseAssembler2D):
         cdef (double*) values_u[2]
         cdef (double*) values_v[2]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
 
         return MassAssembler2D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
+                &self.W[ g_sta[0], g_sta[1] ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1],
+                self.W.shape[1],
                 values_u[0], values_u[1],
                 values_v[0], values_v[1],
+                self.S0.C0.shape[2], self.S0.C1.shape[2],
         )
 
 cdef class StiffnessAssembler2D(BaseAssembler2D):
@@ -155,29 +165,30 @@ cdef class StiffnessAssembler2D(BaseAssembler2D):
         self.S0.C1 = compute_values_derivs(kvs0[1], gaussgrid[1], derivs=1)
 
         cdef double[:, :, :, ::1] geo_grad_a
-        cdef double[:, ::1] GaussWeight
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        GaussWeight = gaussweights[0][:,None] * gaussweights[1][None,:]
         self.B = np.empty(N + (2, 2))
         StiffnessAssembler2D.precompute_fields(
                 geo_grad_a,
-                GaussWeight,
+                gaussweights[0], gaussweights[1],
                 self.B,
         )
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
             double[:, :, :, ::1] _geo_grad_a,
-            double[:, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1,
             # output
             double[:, :, :, ::1] _B,
         ) nogil:
         cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
         cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
         cdef double _tmp2
         cdef double _tmp1
         cdef double JacInv[4]
@@ -185,13 +196,11 @@ cdef class StiffnessAssembler2D(BaseAssembler2D):
         cdef double* geo_grad_a
         cdef double GaussWeight
         cdef double* B
-        cdef size_t i0
-        cdef size_t i1
 
         for i0 in range(n0):
             for i1 in range(n1):
                 geo_grad_a = &_geo_grad_a[i0, i1, 0, 0]
-                GaussWeight = _GaussWeight[i0, i1]
+                GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1]
                 B = &_B[i0, i1, 0, 0]
 
                 _tmp2 = ((geo_grad_a[0] * geo_grad_a[3]) - (geo_grad_a[1] * geo_grad_a[2]))
@@ -208,35 +217,44 @@ cdef class StiffnessAssembler2D(BaseAssembler2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, :, :, ::1] _B,
+            double* _B,
+            size_t n0, size_t n1,
+            size_t s0,
             double* VDu0, double* VDu1,
             double* VDv0, double* VDv1,
+            size_t ng0, size_t ng1,
         ) nogil:
         cdef double result = 0.0
+        cdef double* VDu0_1 = VDu0 + ng0
+        cdef double* VDu1_1 = VDu1 + ng1
+        cdef double* VDv0_1 = VDv0 + ng0
+        cdef double* VDv1_1 = VDv1 + ng1
 
-        cdef size_t n0 = _B.shape[0]
-        cdef size_t n1 = _B.shape[1]
-        cdef double _tmp3
-        cdef double _tmp4
-        cdef double* B
+        cdef size_t q
         cdef size_t i0
         cdef size_t i1
+        cdef double _tmp4
+        cdef double _tmp3
+        cdef double* B
 
         for i0 in range(n0):
             for i1 in range(n1):
-                B = &_B[i0, i1, 0, 0]
+                q = i0*s0 + i1
+                B = &_B[4*q]
 
-                _tmp3 = (VDu0[2*i0+0] * VDu1[2*i1+1])
-                _tmp4 = (VDu0[2*i0+1] * VDu1[2*i1+0])
-                result += ((((B[0] * _tmp3) + (B[1] * _tmp4)) * (VDv0[2*i0+0] * VDv1[2*i1+1])) + (((B[1] * _tmp3) + (B[3] * _tmp4)) * (VDv0[2*i0+1] * VDv1[2*i1+0])))
+                _tmp4 = (VDu0_1[i0] * VDu1[i1])
+                _tmp3 = (VDu0[i0] * VDu1_1[i1])
+                result += ((((B[0] * _tmp3) + (B[1] * _tmp4)) * (VDv0[i0] * VDv1_1[i1])) + (((B[1] * _tmp3) + (B[3] * _tmp4)) * (VDv0_1[i0] * VDv1[i1])))
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[2] i, size_t[2] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t j0, size_t j1) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[2]
@@ -244,28 +262,31 @@ cdef class StiffnessAssembler2D(BaseAssembler2D):
         cdef (double*) values_u[2]
         cdef (double*) values_v[2]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
 
         return StiffnessAssembler2D.combine(
-                self.B [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
+                &self.B[ g_sta[0], g_sta[1], 0, 0 ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1],
+                self.B.shape[1],
                 values_u[0], values_u[1],
                 values_v[0], values_v[1],
+                self.S0.C0.shape[2], self.S0.C1.shape[2],
         )
 
 cdef class HeatAssembler_ST2D(BaseAssembler2D):
@@ -285,14 +306,14 @@ cdef class HeatAssembler_ST2D(BaseAssembler2D):
         self.S0.C0 = compute_values_derivs(kvs0[0], gaussgrid[0], derivs=1)
         self.S0.C1 = compute_values_derivs(kvs0[1], gaussgrid[1], derivs=1)
 
-        cdef double[:, ::1] GaussWeight
         cdef double[:, :, :, ::1] geo_grad_a
-        GaussWeight = gaussweights[0][:,None] * gaussweights[1][None,:]
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        self.W = np.empty(N + ())
-        self.JacInv = np.empty(N + (2, 2))
+        _npts = int(np.prod(N))
+        _arena = np.empty(5 * _npts)
+        self.W = _arena[0*_npts : 1*_npts].reshape(N + ())
+        self.JacInv = _arena[1*_npts : 5*_npts].reshape(N + (2, 2))
         HeatAssembler_ST2D.precompute_fields(
-                GaussWeight,
+                gaussweights[0], gaussweights[1],
                 geo_grad_a,
                 self.W,
                 self.JacInv,
@@ -301,29 +322,30 @@ cdef class HeatAssembler_ST2D(BaseAssembler2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
-            double[:, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1,
             double[:, :, :, ::1] _geo_grad_a,
             # output
             double[:, ::1] _W,
             double[:, :, :, ::1] _JacInv,
         ) nogil:
-        cdef size_t n0 = _GaussWeight.shape[0]
-        cdef size_t n1 = _GaussWeight.shape[1]
+        cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
+        cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
         cdef double _tmp2
         cdef double _tmp1
         cdef double GaussWeight
         cdef double* geo_grad_a
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
 
         for i0 in range(n0):
             for i1 in range(n1):
-                GaussWeight = _GaussWeight[i0, i1]
+                GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1]
                 geo_grad_a = &_geo_grad_a[i0, i1, 0, 0]
                 JacInv = &_JacInv[i0, i1, 0, 0]
 
@@ -339,40 +361,49 @@ cdef class HeatAssembler_ST2D(BaseAssembler2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, ::1] _W,
-            double[:, :, :, ::1] _JacInv,
+            double* _W,
+            double* _JacInv,
+            size_t n0, size_t n1,
+            size_t s0,
             double* VDu0, double* VDu1,
             double* VDv0, double* VDv1,
+            size_t ng0, size_t ng1,
         ) nogil:
         cdef double result = 0.0
+        cdef double* VDu0_1 = VDu0 + ng0
+        cdef double* VDu1_1 = VDu1 + ng1
+        cdef double* VDv0_1 = VDv0 + ng0
+        cdef double* VDv1_1 = VDv1 + ng1
 
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
+        cdef size_t q
+        cdef size_t i0
+        cdef size_t i1
         cdef double _dv_10
-        cdef double _du_10
         cdef double _du_01
+        cdef double _du_10
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
 
         for i0 in range(n0):
             for i1 in range(n1):
-                W = _W[i0, i1]
-                JacInv = &_JacInv[i0, i1, 0, 0]
-
-                _dv_10 = (VDv0[2*i0+0] * VDv1[2*i1+1])
-                _du_10 = (VDu0[2*i0+0] * VDu1[2*i1+1])
-                _du_01 = (VDu0[2*i0+1] * VDu1[2*i1+0])
-                result += ((((JacInv[0] * _du_10) * (JacInv[0] * _dv_10)) + (_du_01 * (VDv0[2*i0+0] * VDv1[2*i1+0]))) * W)
+                q = i0*s0 + i1
+                W = _W[q]
+                JacInv = &_JacInv[4*q]
+
+                _dv_10 = (VDv0[i0] * VDv1_1[i1])
+                _du_01 = (VDu0_1[i0] * VDu1[i1])
+                _du_10 = (VDu0[i0] * VDu1_1[i1])
+                result += ((((JacInv[0] * _du_10) * (JacInv[0] * _dv_10)) + (_du_01 * (VDv0[i0] * VDv1[i1]))) * W)
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[2] i, size_t[2] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t j0, size_t j1) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[2]
@@ -380,29 +411,32 @@ cdef class HeatAssembler_ST2D(BaseAssembler2D):
         cdef (double*) values_u[2]
         cdef (double*) values_v[2]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
 
         return HeatAssembler_ST2D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
-                self.JacInv [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
+                &self.W[ g_sta[0], g_sta[1] ],
+                &self.JacInv[ g_sta[0], g_sta[1], 0, 0 ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1],
+                self.W.shape[1],
                 values_u[0], values_u[1],
                 values_v[0], values_v[1],
+                self.S0.C0.shape[2], self.S0.C1.shape[2],
         )
 
 cdef class WaveAssembler_ST2D(BaseAssembler2D):
@@ -422,14 +456,14 @@ cdef class WaveAssembler_ST2D(BaseAssembler2D):
         self.S0.C0 = compute_values_derivs(kvs0[0], gaussgrid[0], derivs=2)
         self.S0.C1 = compute_values_derivs(kvs0[1], gaussgrid[1], derivs=2)
 
-        cdef double[:, ::1] GaussWeight
         cdef double[:, :, :, ::1] geo_grad_a
-        GaussWeight = gaussweights[0][:,None] * gaussweights[1][None,:]
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        self.W = np.empty(N + ())
-        self.JacInv = np.empty(N + (2, 2))
+        _npts = int(np.prod(N))
+        _arena = np.empty(5 * _npts)
+        self.W = _arena[0*_npts : 1*_npts].reshape(N + ())
+        self.JacInv = _arena[1*_npts : 5*_npts].reshape(N + (2, 2))
         WaveAssembler_ST2D.precompute_fields(
-                GaussWeight,
+                gaussweights[0], gaussweights[1],
                 geo_grad_a,
                 self.W,
                 self.JacInv,
@@ -438,29 +472,30 @@ cdef class WaveAssembler_ST2D(BaseAssembler2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
-            double[:, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1,
             double[:, :, :, ::1] _geo_grad_a,
             # output
             double[:, ::1] _W,
             double[:, :, :, ::1] _JacInv,
         ) nogil:
-        cdef size_t n0 = _GaussWeight.shape[0]
-        cdef size_t n1 = _GaussWeight.shape[1]
+        cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
+        cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
         cdef double _tmp2
         cdef double _tmp1
         cdef double GaussWeight
         cdef double* geo_grad_a
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
 
         for i0 in range(n0):
             for i1 in range(n1):
-                GaussWeight = _GaussWeight[i0, i1]
+                GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1]
                 geo_grad_a = &_geo_grad_a[i0, i1, 0, 0]
                 JacInv = &_JacInv[i0, i1, 0, 0]
 
@@ -476,42 +511,55 @@ cdef class WaveAssembler_ST2D(BaseAssembler2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, ::1] _W,
-            double[:, :, :, ::1] _JacInv,
+            double* _W,
+            double* _JacInv,
+            size_t n0, size_t n1,
+            size_t s0,
             double* VDu0, double* VDu1,
             double* VDv0, double* VDv1,
+            size_t ng0, size_t ng1,
         ) nogil:
         cdef double result = 0.0
-
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
-        cdef double _dv_01
+        cdef double* VDu0_1 = VDu0 + ng0
+        cdef double* VDu0_2 = VDu0 + 2*ng0
+        cdef double* VDu1_1 = VDu1 + ng1
+        cdef double* VDu1_2 = VDu1 + 2*ng1
+        cdef double* VDv0_1 = VDv0 + ng0
+        cdef double* VDv0_2 = VDv0 + 2*ng0
+        cdef double* VDv1_1 = VDv1 + ng1
+        cdef double* VDv1_2 = VDv1 + 2*ng1
+
+        cdef size_t q
+        cdef size_t i0
+        cdef size_t i1
         cdef double _dv_11
-        cdef double _du_02
+        cdef double _dv_01
         cdef double _du_10
+        cdef double _du_02
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
 
         for i0 in range(n0):
             for i1 in range(n1):
-                W = _W[i0, i1]
-                JacInv = &_JacInv[i0, i1, 0, 0]
-
-                _dv_01 = (VDv0[3*i0+1] * VDv1[3*i1+0])
-                _dv_11 = (VDv0[3*i0+1] * VDv1[3*i1+1])
-                _du_02 = (VDu0[3*i0+2] * VDu1[3*i1+0])
-                _du_10 = (VDu0[3*i0+0] * VDu1[3*i1+1])
+                q = i0*s0 + i1
+                W = _W[q]
+                JacInv = &_JacInv[4*q]
+
+                _dv_11 = (VDv0_1[i0] * VDv1_1[i1])
+                _dv_01 = (VDv0_1[i0] * VDv1[i1])
+                _du_10 = (VDu0[i0] * VDu1_1[i1])
+                _du_02 = (VDu0_2[i0] * VDu1[i1])
                 result += (((_du_02 * _dv_01) + ((JacInv[0] * _du_10) * (JacInv[0] * _dv_11))) * W)
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[2] i, size_t[2] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t j0, size_t j1) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[2]
@@ -519,29 +567,32 @@ cdef class WaveAssembler_ST2D(BaseAssembler2D):
         cdef (double*) values_u[2]
         cdef (double*) values_v[2]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
 
         return WaveAssembler_ST2D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
-                self.JacInv [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
+                &self.W[ g_sta[0], g_sta[1] ],
+                &self.JacInv[ g_sta[0], g_sta[1], 0, 0 ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1],
+                self.W.shape[1],
                 values_u[0], values_u[1],
                 values_v[0], values_v[1],
+                self.S0.C0.shape[2], self.S0.C1.shape[2],
         )
 
 cdef class DivDivAssembler2D(BaseVectorAssembler2D):
@@ -562,14 +613,14 @@ cdef class DivDivAssembler2D(BaseVectorAssembler2D):
         self.S0.C0 = compute_values_derivs(kvs0[0], gaussgrid[0], derivs=1)
         self.S0.C1 = compute_values_derivs(kvs0[1], gaussgrid[1], derivs=1)
 
-        cdef double[:, ::1] GaussWeight
         cdef double[:, :, :, ::1] geo_grad_a
-        GaussWeight = gaussweights[0][:,None] * gaussweights[1][None,:]
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        self.W = np.empty(N + ())
-        self.JacInv = np.empty(N + (2, 2))
+        _npts = int(np.prod(N))
+        _arena = np.empty(5 * _npts)
+        self.W = _arena[0*_npts : 1*_npts].reshape(N + ())
+        self.JacInv = _arena[1*_npts : 5*_npts].reshape(N + (2, 2))
         DivDivAssembler2D.precompute_fields(
-                GaussWeight,
+                gaussweights[0], gaussweights[1],
                 geo_grad_a,
                 self.W,
                 self.JacInv,
@@ -578,35 +629,36 @@ cdef class DivDivAssembler2D(BaseVectorAssembler2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
-            double[:, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1,
             double[:, :, :, ::1] _geo_grad_a,
             # output
             double[:, ::1] _W,
             double[:, :, :, ::1] _JacInv,
         ) nogil:
-        cdef size_t n0 = _GaussWeight.shape[0]
-        cdef size_t n1 = _GaussWeight.shape[1]
-        cdef double _tmp2
+        cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
+        cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
+        cdef double _tmp4
         cdef double _tmp1
         cdef double GaussWeight
         cdef double* geo_grad_a
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
 
         for i0 in range(n0):
             for i1 in range(n1):
-                GaussWeight = _GaussWeight[i0, i1]
+                GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1]
                 geo_grad_a = &_geo_grad_a[i0, i1, 0, 0]
                 JacInv = &_JacInv[i0, i1, 0, 0]
 
-                _tmp2 = ((geo_grad_a[0] * geo_grad_a[3]) - (geo_grad_a[1] * geo_grad_a[2]))
-                _tmp1 = (1.0 / _tmp2)
-                W = (GaussWeight * fabs(_tmp2))
+                _tmp4 = ((geo_grad_a[0] * geo_grad_a[3]) - (geo_grad_a[1] * geo_grad_a[2]))
+                _tmp1 = (1.0 / _tmp4)
+                W = (GaussWeight * fabs(_tmp4))
                 _W[i0, i1] = W
                 JacInv[0] = (_tmp1 * geo_grad_a[3])
                 JacInv[1] = (_tmp1 * -geo_grad_a[1])
@@ -616,52 +668,69 @@ cdef class DivDivAssembler2D(BaseVectorAssembler2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void combine(
-            double[:, ::1] _W,
-            double[:, :, :, ::1] _JacInv,
+            double* _W,
+            double* _JacInv,
+            size_t n0, size_t n1,
+            size_t s0,
             double* VDu0, double* VDu1,
             double* VDv0, double* VDv1,
+            size_t ng0, size_t ng1,
             double result[]
         ) nogil:
-
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
-        cdef double _dv_10
+        cdef double result_0 = 0.0
+        cdef double result_1 = 0.0
+        cdef double result_2 = 0.0
+        cdef double result_3 = 0.0
+        cdef double* VDu0_1 = VDu0 + ng0
+        cdef double* VDu1_1 = VDu1 + ng1
+        cdef double* VDv0_1 = VDv0 + ng0
+        cdef double* VDv1_1 = VDv1 + ng1
+
+        cdef size_t q
+        cdef size_t i0
+        cdef size_t i1
         cdef double _dv_01
-        cdef double _tmp4
-        cdef double _tmp6
-        cdef double _du_10
-        cdef double _du_01
+        cdef double _dv_10
         cdef double _tmp3
+        cdef double _tmp2
+        cdef double _du_01
+        cdef double _du_10
+        cdef double _tmp6
         cdef double _tmp5
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
 
         for i0 in range(n0):
             for i1 in range(n1):
-                W = _W[i0, i1]
-                JacInv = &_JacInv[i0, i1, 0, 0]
-
-                _dv_10 = (VDv0[2*i0+0] * VDv1[2*i1+1])
-                _dv_01 = (VDv0[2*i0+1] * VDv1[2*i1+0])
-                _tmp4 = ((JacInv[0] * _dv_10) + (JacInv[2] * _dv_01))
-                _tmp6 = ((JacInv[1] * _dv_10) + (JacInv[3] * _dv_01))
-                _du_10 = (VDu0[2*i0+0] * VDu1[2*i1+1])
-                _du_01 = (VDu0[2*i0+1] * VDu1[2*i1+0])
-                _tmp3 = ((JacInv[0] * _du_10) + (JacInv[2] * _du_01))
-                _tmp5 = ((JacInv[1] * _du_10) + (JacInv[3] * _du_01))
-                result[0] += ((_tmp3 * _tmp4) * W)
-                result[1] += ((_tmp5 * _tmp4) * W)
-                result[2] += ((_tmp3 * _tmp6) * W)
-                result[3] += ((_tmp5 * _tmp6) * W)
+                q = i0*s0 + i1
+                W = _W[q]
+                JacInv = &_JacInv[4*q]
+
+                _dv_01 = (VDv0_1[i0] * VDv1[i1])
+                _dv_10 = (VDv0[i0] * VDv1_1[i1])
+                _tmp3 = (((JacInv[1] * _dv_10) + (JacInv[3] * _dv_01)) * W)
+                _tmp2 = (((JacInv[0] * _dv_10) + (JacInv[2] * _dv_01)) * W)
+                _du_01 = (VDu0_1[i0] * VDu1[i1])
+                _du_10 = (VDu0[i0] * VDu1_1[i1])
+                _tmp6 = ((JacInv[1] * _du_10) + (JacInv[3] * _du_01))
+                _tmp5 = ((JacInv[0] * _du_10) + (JacInv[2] * _du_01))
+                result_0 += (_tmp5 * _tmp2)
+                result_1 += (_tmp6 * _tmp2)
+                result_2 += (_tmp5 * _tmp3)
+                result_3 += (_tmp6 * _tmp3)
+        result[0] += result_0
+        result[1] += result_1
+        result[2] += result_2
+        result[3] += result_3
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef void entry_impl(self, size_t[2] i, size_t[2] j, double result[]) nogil:
+    @cython.cdivision(True)
+    cdef void entry_impl(self, size_t i0, size_t i1, size_t j0, size_t j1, double result[]) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[2]
@@ -669,29 +738,32 @@ cdef class DivDivAssembler2D(BaseVectorAssembler2D):
         cdef (double*) values_u[2]
         cdef (double*) values_v[2]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return   # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return   # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
 
         DivDivAssembler2D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
-                self.JacInv [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
+                &self.W[ g_sta[0], g_sta[1] ],
+                &self.JacInv[ g_sta[0], g_sta[1], 0, 0 ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1],
+                self.W.shape[1],
                 values_u[0], values_u[1],
                 values_v[0], values_v[1],
+                self.S0.C0.shape[2], self.S0.C1.shape[2],
                 result
         )
 
@@ -713,40 +785,39 @@ cdef class L2FunctionalAssembler2D(BaseAssembler2D):
         self.S0.C1 = compute_values_derivs(kvs0[1], gaussgrid[1], derivs=0)
 
         cdef double[:, :, :, ::1] geo_grad_a
-        cdef double[:, ::1] GaussWeight
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        GaussWeight = gaussweights[0][:,None] * gaussweights[1][None,:]
-        self.W = np.empty(N + ())
         self.f_a = grid_eval(f, self.gaussgrid)
+        self.W = np.empty(N + ())
         L2FunctionalAssembler2D.precompute_fields(
                 geo_grad_a,
-                GaussWeight,
+                gaussweights[0], gaussweights[1],
                 self.W,
         )
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
             double[:, :, :, ::1] _geo_grad_a,
-            double[:, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1,
             # output
             double[:, ::1] _W,
         ) nogil:
         cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
         cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
         cdef double* geo_grad_a
         cdef double GaussWeight
         cdef double W
-        cdef size_t i0
-        cdef size_t i1
 
         for i0 in range(n0):
             for i1 in range(n1):
                 geo_grad_a = &_geo_grad_a[i0, i1, 0, 0]
-                GaussWeight = _GaussWeight[i0, i1]
+                GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1]
 
                 W = (GaussWeight * fabs(((geo_grad_a[0] * geo_grad_a[3]) - (geo_grad_a[1] * geo_grad_a[2]))))
                 _W[i0, i1] = W
@@ -754,51 +825,62 @@ cdef class L2FunctionalAssembler2D(BaseAssembler2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, ::1] _W,
-            double[:, ::1] _f_a,
+            double* _W,
+            double* _f_a,
+            size_t n0, size_t n1,
+            size_t s0,
             double* VDu0, double* VDu1,
+            size_t ng0, size_t ng1,
         ) nogil:
         cdef double result = 0.0
+        cdef double acc1
 
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
-        cdef double W
-        cdef double f_a
+        cdef size_t q
         cdef size_t i0
         cdef size_t i1
+        cdef double W
+        cdef double f_a
 
         for i0 in range(n0):
+            acc1 = 0.0
             for i1 in range(n1):
-                W = _W[i0, i1]
-                f_a = _f_a[i0, i1]
+                q = i0*s0 + i1
+                W = _W[q]
+                f_a = _f_a[q]
 
-                result += ((f_a * (VDu0[1*i0+0] * VDu1[1*i1+0])) * W)
+                acc1 += (VDu1[i1]) * f_a * W
+            result += (VDu0[i0]) * acc1
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[2] i, size_t[2] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t j0, size_t j1) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[2]
         cdef size_t g_end[2]
         cdef (double*) values_u[2]
-        intv = make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1])
+        intv = make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1])
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
-        intv = make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1])
+        values_u[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
+        intv = make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1])
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
 
         return L2FunctionalAssembler2D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
-                self.f_a [ g_sta[0]:g_end[0], g_sta[1]:g_end[1] ],
+                &self.W[ g_sta[0], g_sta[1] ],
+                &self.f_a[ g_sta[0], g_sta[1] ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1],
+                self.W.shape[1],
                 values_u[0], values_u[1],
+                self.S0.C0.shape[2], self.S0.C1.shape[2],
         )
 
     def update(self, f=None):
@@ -822,42 +904,41 @@ cdef class MassAssembler3D(BaseAssembler3D):
         self.S0.C2 = compute_values_derivs(kvs0[2], gaussgrid[2], derivs=0)
 
         cdef double[:, :, :, :, ::1] geo_grad_a
-        cdef double[:, :, ::1] GaussWeight
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        GaussWeight = gaussweights[0][:,None,None] * gaussweights[1][None,:,None] * gaussweights[2][None,None,:]
         self.W = np.empty(N + ())
         MassAssembler3D.precompute_fields(
                 geo_grad_a,
-                GaussWeight,
+                gaussweights[0], gaussweights[1], gaussweights[2],
                 self.W,
         )
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
             double[:, :, :, :, ::1] _geo_grad_a,
-            double[:, :, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1, double[::1] _GaussWeight2,
             # output
             double[:, :, ::1] _W,
         ) nogil:
         cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
         cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
         cdef size_t n2 = _geo_grad_a.shape[2]
+        cdef size_t i2
         cdef double* geo_grad_a
         cdef double GaussWeight
         cdef double W
-        cdef size_t i0
-        cdef size_t i1
-        cdef size_t i2
 
         for i0 in range(n0):
             for i1 in range(n1):
                 for i2 in range(n2):
                     geo_grad_a = &_geo_grad_a[i0, i1, i2, 0, 0]
-                    GaussWeight = _GaussWeight[i0, i1, i2]
+                    GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1] * _GaussWeight2[i2]
 
                     W = (GaussWeight * fabs((((geo_grad_a[0] * ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))) - (geo_grad_a[1] * ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6])))) + (geo_grad_a[2] * ((geo_grad_a[3] * geo_grad_a[7]) - (geo_grad_a[4] * geo_grad_a[6]))))))
                     _W[i0, i1, i2] = W
@@ -865,34 +946,44 @@ cdef class MassAssembler3D(BaseAssembler3D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, :, ::1] _W,
+            double* _W,
+            size_t n0, size_t n1, size_t n2,
+            size_t s0, size_t s1,
             double* VDu0, double* VDu1, double* VDu2,
             double* VDv0, double* VDv1, double* VDv2,
+            size_t ng0, size_t ng1, size_t ng2,
         ) nogil:
         cdef double result = 0.0
+        cdef double acc1
+        cdef double acc2
 
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
-        cdef size_t n2 = _W.shape[2]
-        cdef double W
+        cdef size_t q
         cdef size_t i0
         cdef size_t i1
         cdef size_t i2
+        cdef double W
 
         for i0 in range(n0):
+            acc1 = 0.0
             for i1 in range(n1):
+                acc2 = 0.0
                 for i2 in range(n2):
-                    W = _W[i0, i1, i2]
+                    q = i0*s0 + i1*s1 + i2
+                    W = _W[q]
 
-                    result += (((VDu0[1*i0+0] * VDu1[1*i1+0] * VDu2[1*i2+0]) * (VDv0[1*i0+0] * VDv1[1*i1+0] * VDv2[1*i2+0])) * W)
+                    acc2 += (VDu2[i2] * VDv2[i2]) * W
+                acc1 += (VDu1[i1] * VDv1[i1]) * acc2
+            result += (VDu0[i0] * VDv0[i0]) * acc1
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[3] i, size_t[3] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t i2, size_t j0, size_t j1, size_t j2) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[3]
@@ -900,37 +991,40 @@ cdef class MassAssembler3D(BaseAssembler3D):
         cdef (double*) values_u[3]
         cdef (double*) values_v[3]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp2[j[2],0], self.S0.meshsupp2[j[2],1]),
-                make_intv(self.S0.meshsupp2[i[2],0], self.S0.meshsupp2[i[2],1]),
+                make_intv(self.S0.meshsupp2[j2,0], self.S0.meshsupp2[j2,1]),
+                make_intv(self.S0.meshsupp2[i2,0], self.S0.meshsupp2[i2,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[2] = self.nqp * intv.a    # start of Gauss nodes
         g_end[2] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[2] = &self.S0.C2[ j[2], g_sta[2], 0 ]
-        values_v[2] = &self.S0.C2[ i[2], g_sta[2], 0 ]
+        values_u[2] = &self.S0.C2[ j2, 0, g_sta[2] ]
+        values_v[2] = &self.S0.C2[ i2, 0, g_sta[2] ]
 
         return MassAssembler3D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
+                &self.W[ g_sta[0], g_sta[1], g_sta[2] ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1], g_end[2] - g_sta[2],
+                self.W.shape[1] * self.W.shape[2], self.W.shape[2],
                 values_u[0], values_u[1], values_u[2],
                 values_v[0], values_v[1], values_v[2],
+                self.S0.C0.shape[2], self.S0.C1.shape[2], self.S0.C2.shape[2],
         )
 
 cdef class StiffnessAssembler3D(BaseAssembler3D):
@@ -951,33 +1045,35 @@ cdef class StiffnessAssembler3D(BaseAssembler3D):
         self.S0.C2 = compute_values_derivs(kvs0[2], gaussgrid[2], derivs=1)
 
         cdef double[:, :, :, :, ::1] geo_grad_a
-        cdef double[:, :, ::1] GaussWeight
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        GaussWeight = gaussweights[0][:,None,None] * gaussweights[1][None,:,None] * gaussweights[2][None,None,:]
         self.B = np.empty(N + (3, 3))
         StiffnessAssembler3D.precompute_fields(
                 geo_grad_a,
-                GaussWeight,
+                gaussweights[0], gaussweights[1], gaussweights[2],
                 self.B,
         )
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
             double[:, :, :, :, ::1] _geo_grad_a,
-            double[:, :, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1, double[::1] _GaussWeight2,
             # output
             double[:, :, :, :, ::1] _B,
         ) nogil:
         cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
         cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
         cdef size_t n2 = _geo_grad_a.shape[2]
-        cdef double _tmp3
-        cdef double _tmp4
+        cdef size_t i2
         cdef double _tmp5
+        cdef double _tmp4
+        cdef double _tmp3
         cdef double _tmp2
         cdef double _tmp1
         cdef double JacInv[9]
@@ -985,20 +1081,17 @@ cdef class StiffnessAssembler3D(BaseAssembler3D):
         cdef double* geo_grad_a
         cdef double GaussWeight
         cdef double* B
-        cdef size_t i0
-        cdef size_t i1
-        cdef size_t i2
 
         for i0 in range(n0):
             for i1 in range(n1):
                 for i2 in range(n2):
                     geo_grad_a = &_geo_grad_a[i0, i1, i2, 0, 0]
-                    GaussWeight = _GaussWeight[i0, i1, i2]
+                    GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1] * _GaussWeight2[i2]
                     B = &_B[i0, i1, i2, 0, 0]
 
-                    _tmp3 = ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))
-                    _tmp4 = ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6]))
                     _tmp5 = ((geo_grad_a[3] * geo_grad_a[7]) - (geo_grad_a[4] * geo_grad_a[6]))
+                    _tmp4 = ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6]))
+                    _tmp3 = ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))
                     _tmp2 = (((geo_grad_a[0] * _tmp3) - (geo_grad_a[1] * _tmp4)) + (geo_grad_a[2] * _tmp5))
                     _tmp1 = (1.0 / _tmp2)
                     JacInv[0] = (_tmp1 * _tmp3)
@@ -1021,40 +1114,62 @@ cdef class StiffnessAssembler3D(BaseAssembler3D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, :, :, :, ::1] _B,
+            double* _B,
+            size_t n0, size_t n1, size_t n2,
+            size_t s0, size_t s1,
             double* VDu0, double* VDu1, double* VDu2,
             double* VDv0, double* VDv1, double* VDv2,
+            size_t ng0, size_t ng1, size_t ng2,
         ) nogil:
         cdef double result = 0.0
-
-        cdef size_t n0 = _B.shape[0]
-        cdef size_t n1 = _B.shape[1]
-        cdef size_t n2 = _B.shape[2]
-        cdef double _tmp6
-        cdef double _tmp7
-        cdef double _tmp8
-        cdef double* B
+        cdef double _u_p00
+        cdef double _u_p01
+        cdef double _u_p10
+        cdef double _v_p00
+        cdef double _v_p01
+        cdef double _v_p10
+        cdef double* VDu0_1 = VDu0 + ng0
+        cdef double* VDu1_1 = VDu1 + ng1
+        cdef double* VDu2_1 = VDu2 + ng2
+        cdef double* VDv0_1 = VDv0 + ng0
+        cdef double* VDv1_1 = VDv1 + ng1
+        cdef double* VDv2_1 = VDv2 + ng2
+
+        cdef size_t q
         cdef size_t i0
         cdef size_t i1
         cdef size_t i2
+        cdef double _tmp8
+        cdef double _tmp7
+        cdef double _tmp6
+        cdef double* B
 
         for i0 in range(n0):
             for i1 in range(n1):
+                _u_p00 = VDu0[i0] * VDu1[i1]
+                _u_p01 = VDu0[i0] * VDu1_1[i1]
+                _u_p10 = VDu0_1[i0] * VDu1[i1]
+                _v_p00 = VDv0[i0] * VDv1[i1]
+                _v_p01 = VDv0[i0] * VDv1_1[i1]
+                _v_p10 = VDv0_1[i0] * VDv1[i1]
                 for i2 in range(n2):
-                    B = &_B[i0, i1, i2, 0, 0]
+                    q = i0*s0 + i1*s1 + i2
+                    B = &_B[9*q]
 
-                    _tmp6 = (VDu0[2*i0+0] * VDu1[2*i1+0] * VDu2[2*i2+1])
-                    _tmp7 = (VDu0[2*i0+0] * VDu1[2*i1+1] * VDu2[2*i2+0])
-                    _tmp8 = (VDu0[2*i0+1] * VDu1[2*i1+0] * VDu2[2*i2+0])
-                    result += ((((((B[0] * _tmp6) + (B[1] * _tmp7)) + (B[2] * _tmp8)) * (VDv0[2*i0+0] * VDv1[2*i1+0] * VDv2[2*i2+1])) + ((((B[1] * _tmp6) + (B[4] * _tmp7)) + (B[5] * _tmp8)) * (VDv0[2*i0+0] * VDv1[2*i1+1] * VDv2[2*i2+0]))) + ((((B[2] * _tmp6) + (B[5] * _tmp7)) + (B[8] * _tmp8)) * (VDv0[2*i0+1] * VDv1[2*i1+0] * VDv2[2*i2+0])))
+                    _tmp8 = (_u_p10 * VDu2[i2])
+                    _tmp7 = (_u_p01 * VDu2[i2])
+                    _tmp6 = (_u_p00 * VDu2_1[i2])
+                    result += ((((((B[0] * _tmp6) + (B[1] * _tmp7)) + (B[2] * _tmp8)) * (_v_p00 * VDv2_1[i2])) + ((((B[1] * _tmp6) + (B[4] * _tmp7)) + (B[5] * _tmp8)) * (_v_p01 * VDv2[i2]))) + ((((B[2] * _tmp6) + (B[5] * _tmp7)) + (B[8] * _tmp8)) * (_v_p10 * VDv2[i2])))
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[3] i, size_t[3] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t i2, size_t j0, size_t j1, size_t j2) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[3]
@@ -1062,37 +1177,40 @@ cdef class StiffnessAssembler3D(BaseAssembler3D):
         cdef (double*) values_u[3]
         cdef (double*) values_v[3]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp2[j[2],0], self.S0.meshsupp2[j[2],1]),
-                make_intv(self.S0.meshsupp2[i[2],0], self.S0.meshsupp2[i[2],1]),
+                make_intv(self.S0.meshsupp2[j2,0], self.S0.meshsupp2[j2,1]),
+                make_intv(self.S0.meshsupp2[i2,0], self.S0.meshsupp2[i2,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[2] = self.nqp * intv.a    # start of Gauss nodes
         g_end[2] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[2] = &self.S0.C2[ j[2], g_sta[2], 0 ]
-        values_v[2] = &self.S0.C2[ i[2], g_sta[2], 0 ]
+        values_u[2] = &self.S0.C2[ j2, 0, g_sta[2] ]
+        values_v[2] = &self.S0.C2[ i2, 0, g_sta[2] ]
 
         return StiffnessAssembler3D.combine(
-                self.B [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
+                &self.B[ g_sta[0], g_sta[1], g_sta[2], 0, 0 ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1], g_end[2] - g_sta[2],
+                self.B.shape[1] * self.B.shape[2], self.B.shape[2],
                 values_u[0], values_u[1], values_u[2],
                 values_v[0], values_v[1], values_v[2],
+                self.S0.C0.shape[2], self.S0.C1.shape[2], self.S0.C2.shape[2],
         )
 
 cdef class HeatAssembler_ST3D(BaseAssembler3D):
@@ -1113,14 +1231,14 @@ cdef class HeatAssembler_ST3D(BaseAssembler3D):
         self.S0.C1 = compute_values_derivs(kvs0[1], gaussgrid[1], derivs=1)
         self.S0.C2 = compute_values_derivs(kvs0[2], gaussgrid[2], derivs=1)
 
-        cdef double[:, :, ::1] GaussWeight
         cdef double[:, :, :, :, ::1] geo_grad_a
-        GaussWeight = gaussweights[0][:,None,None] * gaussweights[1][None,:,None] * gaussweights[2][None,None,:]
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        self.W = np.empty(N + ())
-        self.JacInv = np.empty(N + (3, 3))
+        _npts = int(np.prod(N))
+        _arena = np.empty(10 * _npts)
+        self.W = _arena[0*_npts : 1*_npts].reshape(N + ())
+        self.JacInv = _arena[1*_npts : 10*_npts].reshape(N + (3, 3))
         HeatAssembler_ST3D.precompute_fields(
-                GaussWeight,
+                gaussweights[0], gaussweights[1], gaussweights[2],
                 geo_grad_a,
                 self.W,
                 self.JacInv,
@@ -1129,41 +1247,42 @@ cdef class HeatAssembler_ST3D(BaseAssembler3D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
-            double[:, :, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1, double[::1] _GaussWeight2,
             double[:, :, :, :, ::1] _geo_grad_a,
             # output
             double[:, :, ::1] _W,
             double[:, :, :, :, ::1] _JacInv,
         ) nogil:
-        cdef size_t n0 = _GaussWeight.shape[0]
-        cdef size_t n1 = _GaussWeight.shape[1]
-        cdef size_t n2 = _GaussWeight.shape[2]
-        cdef double _tmp3
-        cdef double _tmp4
+        cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
+        cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
+        cdef size_t n2 = _geo_grad_a.shape[2]
+        cdef size_t i2
         cdef double _tmp5
+        cdef double _tmp4
+        cdef double _tmp3
         cdef double _tmp2
         cdef double _tmp1
         cdef double GaussWeight
         cdef double* geo_grad_a
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
-        cdef size_t i2
 
         for i0 in range(n0):
             for i1 in range(n1):
                 for i2 in range(n2):
-                    GaussWeight = _GaussWeight[i0, i1, i2]
+                    GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1] * _GaussWeight2[i2]
                     geo_grad_a = &_geo_grad_a[i0, i1, i2, 0, 0]
                     JacInv = &_JacInv[i0, i1, i2, 0, 0]
 
-                    _tmp3 = ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))
-                    _tmp4 = ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6]))
                     _tmp5 = ((geo_grad_a[3] * geo_grad_a[7]) - (geo_grad_a[4] * geo_grad_a[6]))
+                    _tmp4 = ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6]))
+                    _tmp3 = ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))
                     _tmp2 = (((geo_grad_a[0] * _tmp3) - (geo_grad_a[1] * _tmp4)) + (geo_grad_a[2] * _tmp5))
                     _tmp1 = (1.0 / _tmp2)
                     W = (GaussWeight * fabs(_tmp2))
@@ -1181,47 +1300,67 @@ cdef class HeatAssembler_ST3D(BaseAssembler3D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, :, ::1] _W,
-            double[:, :, :, :, ::1] _JacInv,
+            double* _W,
+            double* _JacInv,
+            size_t n0, size_t n1, size_t n2,
+            size_t s0, size_t s1,
             double* VDu0, double* VDu1, double* VDu2,
             double* VDv0, double* VDv1, double* VDv2,
+            size_t ng0, size_t ng1, size_t ng2,
         ) nogil:
         cdef double result = 0.0
-
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
-        cdef size_t n2 = _W.shape[2]
-        cdef double _dv_100
+        cdef double _u_p00
+        cdef double _u_p01
+        cdef double _v_p00
+        cdef double _v_p01
+        cdef double _u_p10
+        cdef double* VDu0_1 = VDu0 + ng0
+        cdef double* VDu1_1 = VDu1 + ng1
+        cdef double* VDu2_1 = VDu2 + ng2
+        cdef double* VDv0_1 = VDv0 + ng0
+        cdef double* VDv1_1 = VDv1 + ng1
+        cdef double* VDv2_1 = VDv2 + ng2
+
+        cdef size_t q
+        cdef size_t i0
+        cdef size_t i1
+        cdef size_t i2
         cdef double _dv_010
-        cdef double _du_100
-        cdef double _du_010
+        cdef double _dv_100
         cdef double _du_001
+        cdef double _du_010
+        cdef double _du_100
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
-        cdef size_t i2
 
         for i0 in range(n0):
             for i1 in range(n1):
+                _u_p00 = VDu0[i0] * VDu1[i1]
+                _u_p01 = VDu0[i0] * VDu1_1[i1]
+                _v_p00 = VDv0[i0] * VDv1[i1]
+                _v_p01 = VDv0[i0] * VDv1_1[i1]
+                _u_p10 = VDu0_1[i0] * VDu1[i1]
                 for i2 in range(n2):
-                    W = _W[i0, i1, i2]
-                    JacInv = &_JacInv[i0, i1, i2, 0, 0]
-
-                    _dv_100 = (VDv0[2*i0+0] * VDv1[2*i1+0] * VDv2[2*i2+1])
-                    _dv_010 = (VDv0[2*i0+0] * VDv1[2*i1+1] * VDv2[2*i2+0])
-                    _du_100 = (VDu0[2*i0+0] * VDu1[2*i1+0] * VDu2[2*i2+1])
-                    _du_010 = (VDu0[2*i0+0] * VDu1[2*i1+1] * VDu2[2*i2+0])
-                    _du_001 = (VDu0[2*i0+1] * VDu1[2*i1+0] * VDu2[2*i2+0])
-                    result += ((((((JacInv[0] * _du_100) + (JacInv[3] * _du_010)) * ((JacInv[0] * _dv_100) + (JacInv[3] * _dv_010))) + (((JacInv[1] * _du_100) + (JacInv[4] * _du_010)) * ((JacInv[1] * _dv_100) + (JacInv[4] * _dv_010)))) + (_du_001 * (VDv0[2*i0+0] * VDv1[2*i1+0] * VDv2[2*i2+0]))) * W)
+                    q = i0*s0 + i1*s1 + i2
+                    W = _W[q]
+                    JacInv = &_JacInv[9*q]
+
+                    _dv_010 = (_v_p01 * VDv2[i2])
+                    _dv_100 = (_v_p00 * VDv2_1[i2])
+                    _du_001 = (_u_p10 * VDu2[i2])
+                    _du_010 = (_u_p01 * VDu2[i2])
+                    _du_100 = (_u_p00 * VDu2_1[i2])
+                    result += ((((((JacInv[0] * _du_100) + (JacInv[3] * _du_010)) * ((JacInv[0] * _dv_100) + (JacInv[3] * _dv_010))) + (((JacInv[1] * _du_100) + (JacInv[4] * _du_010)) * ((JacInv[1] * _dv_100) + (JacInv[4] * _dv_010)))) + (_du_001 * (_v_p00 * VDv2[i2]))) * W)
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[3] i, size_t[3] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t i2, size_t j0, size_t j1, size_t j2) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[3]
@@ -1229,38 +1368,41 @@ cdef class HeatAssembler_ST3D(BaseAssembler3D):
         cdef (double*) values_u[3]
         cdef (double*) values_v[3]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp2[j[2],0], self.S0.meshsupp2[j[2],1]),
-                make_intv(self.S0.meshsupp2[i[2],0], self.S0.meshsupp2[i[2],1]),
+                make_intv(self.S0.meshsupp2[j2,0], self.S0.meshsupp2[j2,1]),
+                make_intv(self.S0.meshsupp2[i2,0], self.S0.meshsupp2[i2,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[2] = self.nqp * intv.a    # start of Gauss nodes
         g_end[2] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[2] = &self.S0.C2[ j[2], g_sta[2], 0 ]
-        values_v[2] = &self.S0.C2[ i[2], g_sta[2], 0 ]
+        values_u[2] = &self.S0.C2[ j2, 0, g_sta[2] ]
+        values_v[2] = &self.S0.C2[ i2, 0, g_sta[2] ]
 
         return HeatAssembler_ST3D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
-                self.JacInv [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
+                &self.W[ g_sta[0], g_sta[1], g_sta[2] ],
+                &self.JacInv[ g_sta[0], g_sta[1], g_sta[2], 0, 0 ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1], g_end[2] - g_sta[2],
+                self.W.shape[1] * self.W.shape[2], self.W.shape[2],
                 values_u[0], values_u[1], values_u[2],
                 values_v[0], values_v[1], values_v[2],
+                self.S0.C0.shape[2], self.S0.C1.shape[2], self.S0.C2.shape[2],
         )
 
 cdef class WaveAssembler_ST3D(BaseAssembler3D):
@@ -1281,14 +1423,14 @@ cdef class WaveAssembler_ST3D(BaseAssembler3D):
         self.S0.C1 = compute_values_derivs(kvs0[1], gaussgrid[1], derivs=2)
         self.S0.C2 = compute_values_derivs(kvs0[2], gaussgrid[2], derivs=2)
 
-        cdef double[:, :, ::1] GaussWeight
         cdef double[:, :, :, :, ::1] geo_grad_a
-        GaussWeight = gaussweights[0][:,None,None] * gaussweights[1][None,:,None] * gaussweights[2][None,None,:]
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        self.W = np.empty(N + ())
-        self.JacInv = np.empty(N + (3, 3))
+        _npts = int(np.prod(N))
+        _arena = np.empty(10 * _npts)
+        self.W = _arena[0*_npts : 1*_npts].reshape(N + ())
+        self.JacInv = _arena[1*_npts : 10*_npts].reshape(N + (3, 3))
         WaveAssembler_ST3D.precompute_fields(
-                GaussWeight,
+                gaussweights[0], gaussweights[1], gaussweights[2],
                 geo_grad_a,
                 self.W,
                 self.JacInv,
@@ -1297,41 +1439,42 @@ cdef class WaveAssembler_ST3D(BaseAssembler3D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
-            double[:, :, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1, double[::1] _GaussWeight2,
             double[:, :, :, :, ::1] _geo_grad_a,
             # output
             double[:, :, ::1] _W,
             double[:, :, :, :, ::1] _JacInv,
         ) nogil:
-        cdef size_t n0 = _GaussWeight.shape[0]
-        cdef size_t n1 = _GaussWeight.shape[1]
-        cdef size_t n2 = _GaussWeight.shape[2]
-        cdef double _tmp3
-        cdef double _tmp4
+        cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
+        cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
+        cdef size_t n2 = _geo_grad_a.shape[2]
+        cdef size_t i2
         cdef double _tmp5
+        cdef double _tmp4
+        cdef double _tmp3
         cdef double _tmp2
         cdef double _tmp1
         cdef double GaussWeight
         cdef double* geo_grad_a
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
-        cdef size_t i2
 
         for i0 in range(n0):
             for i1 in range(n1):
                 for i2 in range(n2):
-                    GaussWeight = _GaussWeight[i0, i1, i2]
+                    GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1] * _GaussWeight2[i2]
                     geo_grad_a = &_geo_grad_a[i0, i1, i2, 0, 0]
                     JacInv = &_JacInv[i0, i1, i2, 0, 0]
 
-                    _tmp3 = ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))
-                    _tmp4 = ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6]))
                     _tmp5 = ((geo_grad_a[3] * geo_grad_a[7]) - (geo_grad_a[4] * geo_grad_a[6]))
+                    _tmp4 = ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6]))
+                    _tmp3 = ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))
                     _tmp2 = (((geo_grad_a[0] * _tmp3) - (geo_grad_a[1] * _tmp4)) + (geo_grad_a[2] * _tmp5))
                     _tmp1 = (1.0 / _tmp2)
                     W = (GaussWeight * fabs(_tmp2))
@@ -1349,49 +1492,75 @@ cdef class WaveAssembler_ST3D(BaseAssembler3D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, :, ::1] _W,
-            double[:, :, :, :, ::1] _JacInv,
+            double* _W,
+            double* _JacInv,
+            size_t n0, size_t n1, size_t n2,
+            size_t s0, size_t s1,
             double* VDu0, double* VDu1, double* VDu2,
             double* VDv0, double* VDv1, double* VDv2,
+            size_t ng0, size_t ng1, size_t ng2,
         ) nogil:
         cdef double result = 0.0
-
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
-        cdef size_t n2 = _W.shape[2]
-        cdef double _dv_001
-        cdef double _dv_101
+        cdef double _u_p20
+        cdef double _v_p10
+        cdef double _u_p00
+        cdef double _u_p01
+        cdef double _v_p11
+        cdef double* VDu0_1 = VDu0 + ng0
+        cdef double* VDu0_2 = VDu0 + 2*ng0
+        cdef double* VDu1_1 = VDu1 + ng1
+        cdef double* VDu1_2 = VDu1 + 2*ng1
+        cdef double* VDu2_1 = VDu2 + ng2
+        cdef double* VDu2_2 = VDu2 + 2*ng2
+        cdef double* VDv0_1 = VDv0 + ng0
+        cdef double* VDv0_2 = VDv0 + 2*ng0
+        cdef double* VDv1_1 = VDv1 + ng1
+        cdef double* VDv1_2 = VDv1 + 2*ng1
+        cdef double* VDv2_1 = VDv2 + ng2
+        cdef double* VDv2_2 = VDv2 + 2*ng2
+
+        cdef size_t q
+        cdef size_t i0
+        cdef size_t i1
+        cdef size_t i2
         cdef double _dv_011
-        cdef double _du_002
-        cdef double _du_100
+        cdef double _dv_101
+        cdef double _dv_001
         cdef double _du_010
+        cdef double _du_100
+        cdef double _du_002
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
-        cdef size_t i2
 
         for i0 in range(n0):
             for i1 in range(n1):
+                _u_p20 = VDu0_2[i0] * VDu1[i1]
+                _v_p10 = VDv0_1[i0] * VDv1[i1]
+                _u_p00 = VDu0[i0] * VDu1[i1]
+                _u_p01 = VDu0[i0] * VDu1_1[i1]
+                _v_p11 = VDv0_1[i0] * VDv1_1[i1]
                 for i2 in range(n2):
-                    W = _W[i0, i1, i2]
-                    JacInv = &_JacInv[i0, i1, i2, 0, 0]
-
-                    _dv_001 = (VDv0[3*i0+1] * VDv1[3*i1+0] * VDv2[3*i2+0])
-                    _dv_101 = (VDv0[3*i0+1] * VDv1[3*i1+0] * VDv2[3*i2+1])
-                    _dv_011 = (VDv0[3*i0+1] * VDv1[3*i1+1] * VDv2[3*i2+0])
-                    _du_002 = (VDu0[3*i0+2] * VDu1[3*i1+0] * VDu2[3*i2+0])
-                    _du_100 = (VDu0[3*i0+0] * VDu1[3*i1+0] * VDu2[3*i2+1])
-                    _du_010 = (VDu0[3*i0+0] * VDu1[3*i1+1] * VDu2[3*i2+0])
+                    q = i0*s0 + i1*s1 + i2
+                    W = _W[q]
+                    JacInv = &_JacInv[9*q]
+
+                    _dv_011 = (_v_p11 * VDv2[i2])
+                    _dv_101 = (_v_p10 * VDv2_1[i2])
+                    _dv_001 = (_v_p10 * VDv2[i2])
+                    _du_010 = (_u_p01 * VDu2[i2])
+                    _du_100 = (_u_p00 * VDu2_1[i2])
+                    _du_002 = (_u_p20 * VDu2[i2])
                     result += (((_du_002 * _dv_001) + ((((JacInv[0] * _du_100) + (JacInv[3] * _du_010)) * ((JacInv[0] * _dv_101) + (JacInv[3] * _dv_011))) + (((JacInv[1] * _du_100) + (JacInv[4] * _du_010)) * ((JacInv[1] * _dv_101) + (JacInv[4] * _dv_011))))) * W)
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[3] i, size_t[3] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t i2, size_t j0, size_t j1, size_t j2) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[3]
@@ -1399,38 +1568,41 @@ cdef class WaveAssembler_ST3D(BaseAssembler3D):
         cdef (double*) values_u[3]
         cdef (double*) values_v[3]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp2[j[2],0], self.S0.meshsupp2[j[2],1]),
-                make_intv(self.S0.meshsupp2[i[2],0], self.S0.meshsupp2[i[2],1]),
+                make_intv(self.S0.meshsupp2[j2,0], self.S0.meshsupp2[j2,1]),
+                make_intv(self.S0.meshsupp2[i2,0], self.S0.meshsupp2[i2,1]),
         )
         if intv.a >= intv.b: return 0.0  # no intersection of support
         g_sta[2] = self.nqp * intv.a    # start of Gauss nodes
         g_end[2] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[2] = &self.S0.C2[ j[2], g_sta[2], 0 ]
-        values_v[2] = &self.S0.C2[ i[2], g_sta[2], 0 ]
+        values_u[2] = &self.S0.C2[ j2, 0, g_sta[2] ]
+        values_v[2] = &self.S0.C2[ i2, 0, g_sta[2] ]
 
         return WaveAssembler_ST3D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
-                self.JacInv [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
+                &self.W[ g_sta[0], g_sta[1], g_sta[2] ],
+                &self.JacInv[ g_sta[0], g_sta[1], g_sta[2], 0, 0 ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1], g_end[2] - g_sta[2],
+                self.W.shape[1] * self.W.shape[2], self.W.shape[2],
                 values_u[0], values_u[1], values_u[2],
                 values_v[0], values_v[1], values_v[2],
+                self.S0.C0.shape[2], self.S0.C1.shape[2], self.S0.C2.shape[2],
         )
 
 cdef class DivDivAssembler3D(BaseVectorAssembler3D):
@@ -1452,14 +1624,14 @@ cdef class DivDivAssembler3D(BaseVectorAssembler3D):
         self.S0.C1 = compute_values_derivs(kvs0[1], gaussgrid[1], derivs=1)
         self.S0.C2 = compute_values_derivs(kvs0[2], gaussgrid[2], derivs=1)
 
-        cdef double[:, :, ::1] GaussWeight
         cdef double[:, :, :, :, ::1] geo_grad_a
-        GaussWeight = gaussweights[0][:,None,None] * gaussweights[1][None,:,None] * gaussweights[2][None,None,:]
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        self.W = np.empty(N + ())
-        self.JacInv = np.empty(N + (3, 3))
+        _npts = int(np.prod(N))
+        _arena = np.empty(10 * _npts)
+        self.W = _arena[0*_npts : 1*_npts].reshape(N + ())
+        self.JacInv = _arena[1*_npts : 10*_npts].reshape(N + (3, 3))
         DivDivAssembler3D.precompute_fields(
-                GaussWeight,
+                gaussweights[0], gaussweights[1], gaussweights[2],
                 geo_grad_a,
                 self.W,
                 self.JacInv,
@@ -1468,41 +1640,42 @@ cdef class DivDivAssembler3D(BaseVectorAssembler3D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
-            double[:, :, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1, double[::1] _GaussWeight2,
             double[:, :, :, :, ::1] _geo_grad_a,
             # output
             double[:, :, ::1] _W,
             double[:, :, :, :, ::1] _JacInv,
         ) nogil:
-        cdef size_t n0 = _GaussWeight.shape[0]
-        cdef size_t n1 = _GaussWeight.shape[1]
-        cdef size_t n2 = _GaussWeight.shape[2]
-        cdef double _tmp9
-        cdef double _tmp10
+        cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
+        cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
+        cdef size_t n2 = _geo_grad_a.shape[2]
+        cdef size_t i2
         cdef double _tmp11
+        cdef double _tmp10
+        cdef double _tmp9
         cdef double _tmp2
         cdef double _tmp1
         cdef double GaussWeight
         cdef double* geo_grad_a
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
-        cdef size_t i2
 
         for i0 in range(n0):
             for i1 in range(n1):
                 for i2 in range(n2):
-                    GaussWeight = _GaussWeight[i0, i1, i2]
+                    GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1] * _GaussWeight2[i2]
                     geo_grad_a = &_geo_grad_a[i0, i1, i2, 0, 0]
                     JacInv = &_JacInv[i0, i1, i2, 0, 0]
 
-                    _tmp9 = ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))
-                    _tmp10 = ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6]))
                     _tmp11 = ((geo_grad_a[3] * geo_grad_a[7]) - (geo_grad_a[4] * geo_grad_a[6]))
+                    _tmp10 = ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6]))
+                    _tmp9 = ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))
                     _tmp2 = (((geo_grad_a[0] * _tmp9) - (geo_grad_a[1] * _tmp10)) + (geo_grad_a[2] * _tmp11))
                     _tmp1 = (1.0 / _tmp2)
                     W = (GaussWeight * fabs(_tmp2))
@@ -1520,68 +1693,108 @@ cdef class DivDivAssembler3D(BaseVectorAssembler3D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void combine(
-            double[:, :, ::1] _W,
-            double[:, :, :, :, ::1] _JacInv,
+            double* _W,
+            double* _JacInv,
+            size_t n0, size_t n1, size_t n2,
+            size_t s0, size_t s1,
             double* VDu0, double* VDu1, double* VDu2,
             double* VDv0, double* VDv1, double* VDv2,
+            size_t ng0, size_t ng1, size_t ng2,
             double result[]
         ) nogil:
-
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
-        cdef size_t n2 = _W.shape[2]
-        cdef double _dv_100
-        cdef double _dv_010
+        cdef double result_0 = 0.0
+        cdef double result_1 = 0.0
+        cdef double result_2 = 0.0
+        cdef double result_3 = 0.0
+        cdef double result_4 = 0.0
+        cdef double result_5 = 0.0
+        cdef double result_6 = 0.0
+        cdef double result_7 = 0.0
+        cdef double result_8 = 0.0
+        cdef double _u_p00
+        cdef double _u_p01
+        cdef double _u_p10
+        cdef double _v_p00
+        cdef double _v_p01
+        cdef double _v_p10
+        cdef double* VDu0_1 = VDu0 + ng0
+        cdef double* VDu1_1 = VDu1 + ng1
+        cdef double* VDu2_1 = VDu2 + ng2
+        cdef double* VDv0_1 = VDv0 + ng0
+        cdef double* VDv1_1 = VDv1 + ng1
+        cdef double* VDv2_1 = VDv2 + ng2
+
+        cdef size_t q
+        cdef size_t i0
+        cdef size_t i1
+        cdef size_t i2
         cdef double _dv_001
+        cdef double _dv_010
+        cdef double _dv_100
+        cdef double _tmp5
         cdef double _tmp4
-        cdef double _tmp7
-        cdef double _tmp8
-        cdef double _du_100
-        cdef double _du_010
-        cdef double _du_001
         cdef double _tmp3
-        cdef double _tmp5
+        cdef double _du_001
+        cdef double _du_010
+        cdef double _du_100
+        cdef double _tmp8
+        cdef double _tmp7
         cdef double _tmp6
         cdef double W
         cdef double* JacInv
-        cdef size_t i0
-        cdef size_t i1
-        cdef size_t i2
 
         for i0 in range(n0):
             for i1 in range(n1):
+                _u_p00 = VDu0[i0] * VDu1[i1]
+                _u_p01 = VDu0[i0] * VDu1_1[i1]
+                _u_p10 = VDu0_1[i0] * VDu1[i1]
+                _v_p00 = VDv0[i0] * VDv1[i1]
+                _v_p01 = VDv0[i0] * VDv1_1[i1]
+                _v_p10 = VDv0_1[i0] * VDv1[i1]
                 for i2 in range(n2):
-                    W = _W[i0, i1, i2]
-                    JacInv = &_JacInv[i0, i1, i2, 0, 0]
-
-                    _dv_100 = (VDv0[2*i0+0] * VDv1[2*i1+0] * VDv2[2*i2+1])
-                    _dv_010 = (VDv0[2*i0+0] * VDv1[2*i1+1] * VDv2[2*i2+0])
-                    _dv_001 = (VDv0[2*i0+1] * VDv1[2*i1+0] * VDv2[2*i2+0])
-                    _tmp4 = (((JacInv[0] * _dv_100) + (JacInv[3] * _dv_010)) + (JacInv[6] * _dv_001))
-                    _tmp7 = (((JacInv[1] * _dv_100) + (JacInv[4] * _dv_010)) + (JacInv[7] * _dv_001))
-                    _tmp8 = (((JacInv[2] * _dv_100) + (JacInv[5] * _dv_010)) + (JacInv[8] * _dv_001))
-                    _du_100 = (VDu0[2*i0+0] * VDu1[2*i1+0] * VDu2[2*i2+1])
-                    _du_010 = (VDu0[2*i0+0] * VDu1[2*i1+1] * VDu2[2*i2+0])
-                    _du_001 = (VDu0[2*i0+1] * VDu1[2*i1+0] * VDu2[2*i2+0])
-                    _tmp3 = (((JacInv[0] * _du_100) + (JacInv[3] * _du_010)) + (JacInv[6] * _du_001))
-                    _tmp5 = (((JacInv[1] * _du_100) + (JacInv[4] * _du_010)) + (JacInv[7] * _du_001))
-                    _tmp6 = (((JacInv[2] * _du_100) + (JacInv[5] * _du_010)) + (JacInv[8] * _du_001))
-                    result[0] += ((_tmp3 * _tmp4) * W)
-                    result[1] += ((_tmp5 * _tmp4) * W)
-                    result[2] += ((_tmp6 * _tmp4) * W)
-                    result[3] += ((_tmp3 * _tmp7) * W)
-                    result[4] += ((_tmp5 * _tmp7) * W)
-                    result[5] += ((_tmp6 * _tmp7) * W)
-                    result[6] += ((_tmp3 * _tmp8) * W)
-                    result[7] += ((_tmp5 * _tmp8) * W)
-                    result[8] += ((_tmp6 * _tmp8) * W)
+                    q = i0*s0 + i1*s1 + i2
+                    W = _W[q]
+                    JacInv = &_JacInv[9*q]
+
+                    _dv_001 = (_v_p10 * VDv2[i2])
+                    _dv_010 = (_v_p01 * VDv2[i2])
+                    _dv_100 = (_v_p00 * VDv2_1[i2])
+                    _tmp5 = ((((JacInv[2] * _dv_100) + (JacInv[5] * _dv_010)) + (JacInv[8] * _dv_001)) * W)
+                    _tmp4 = ((((JacInv[1] * _dv_100) + (JacInv[4] * _dv_010)) + (JacInv[7] * _dv_001)) * W)
+                    _tmp3 = ((((JacInv[0] * _dv_100) + (JacInv[3] * _dv_010)) + (JacInv[6] * _dv_001)) * W)
+                    _du_001 = (_u_p10 * VDu2[i2])
+                    _du_010 = (_u_p01 * VDu2[i2])
+                    _du_100 = (_u_p00 * VDu2_1[i2])
+                    _tmp8 = (((JacInv[2] * _du_100) + (JacInv[5] * _du_010)) + (JacInv[8] * _du_001))
+                    _tmp7 = (((JacInv[1] * _du_100) + (JacInv[4] * _du_010)) + (JacInv[7] * _du_001))
+                    _tmp6 = (((JacInv[0] * _du_100) + (JacInv[3] * _du_010)) + (JacInv[6] * _du_001))
+                    result_0 += (_tmp6 * _tmp3)
+                    result_1 += (_tmp7 * _tmp3)
+                    result_2 += (_tmp8 * _tmp3)
+                    result_3 += (_tmp6 * _tmp4)
+                    result_4 += (_tmp7 * _tmp4)
+                    result_5 += (_tmp8 * _tmp4)
+                    result_6 += (_tmp6 * _tmp5)
+                    result_7 += (_tmp7 * _tmp5)
+                    result_8 += (_tmp8 * _tmp5)
+        result[0] += result_0
+        result[1] += result_1
+        result[2] += result_2
+        result[3] += result_3
+        result[4] += result_4
+        result[5] += result_5
+        result[6] += result_6
+        result[7] += result_7
+        result[8] += result_8
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef void entry_impl(self, size_t[3] i, size_t[3] j, double result[]) nogil:
+    @cython.cdivision(True)
+    cdef void entry_impl(self, size_t i0, size_t i1, size_t i2, size_t j0, size_t j1, size_t j2, double result[]) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[3]
@@ -1589,38 +1802,41 @@ cdef class DivDivAssembler3D(BaseVectorAssembler3D):
         cdef (double*) values_u[3]
         cdef (double*) values_v[3]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp0[j[0],0], self.S0.meshsupp0[j[0],1]),
-                make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1]),
+                make_intv(self.S0.meshsupp0[j0,0], self.S0.meshsupp0[j0,1]),
+                make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1]),
         )
         if intv.a >= intv.b: return   # no intersection of support
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ j[0], g_sta[0], 0 ]
-        values_v[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
+        values_u[0] = &self.S0.C0[ j0, 0, g_sta[0] ]
+        values_v[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp1[j[1],0], self.S0.meshsupp1[j[1],1]),
-                make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1]),
+                make_intv(self.S0.meshsupp1[j1,0], self.S0.meshsupp1[j1,1]),
+                make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1]),
         )
         if intv.a >= intv.b: return   # no intersection of support
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ j[1], g_sta[1], 0 ]
-        values_v[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
+        values_u[1] = &self.S0.C1[ j1, 0, g_sta[1] ]
+        values_v[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
         intv = intersect_intervals(
-                make_intv(self.S0.meshsupp2[j[2],0], self.S0.meshsupp2[j[2],1]),
-                make_intv(self.S0.meshsupp2[i[2],0], self.S0.meshsupp2[i[2],1]),
+                make_intv(self.S0.meshsupp2[j2,0], self.S0.meshsupp2[j2,1]),
+                make_intv(self.S0.meshsupp2[i2,0], self.S0.meshsupp2[i2,1]),
         )
         if intv.a >= intv.b: return   # no intersection of support
         g_sta[2] = self.nqp * intv.a    # start of Gauss nodes
         g_end[2] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[2] = &self.S0.C2[ j[2], g_sta[2], 0 ]
-        values_v[2] = &self.S0.C2[ i[2], g_sta[2], 0 ]
+        values_u[2] = &self.S0.C2[ j2, 0, g_sta[2] ]
+        values_v[2] = &self.S0.C2[ i2, 0, g_sta[2] ]
 
         DivDivAssembler3D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
-                self.JacInv [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
+                &self.W[ g_sta[0], g_sta[1], g_sta[2] ],
+                &self.JacInv[ g_sta[0], g_sta[1], g_sta[2], 0, 0 ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1], g_end[2] - g_sta[2],
+                self.W.shape[1] * self.W.shape[2], self.W.shape[2],
                 values_u[0], values_u[1], values_u[2],
                 values_v[0], values_v[1], values_v[2],
+                self.S0.C0.shape[2], self.S0.C1.shape[2], self.S0.C2.shape[2],
                 result
         )
 
@@ -1643,43 +1859,42 @@ cdef class L2FunctionalAssembler3D(BaseAssembler3D):
         self.S0.C2 = compute_values_derivs(kvs0[2], gaussgrid[2], derivs=0)
 
         cdef double[:, :, :, :, ::1] geo_grad_a
-        cdef double[:, :, ::1] GaussWeight
         geo_grad_a = geo.grid_jacobian(self.gaussgrid)
-        GaussWeight = gaussweights[0][:,None,None] * gaussweights[1][None,:,None] * gaussweights[2][None,None,:]
-        self.W = np.empty(N + ())
         self.f_a = grid_eval(f, self.gaussgrid)
+        self.W = np.empty(N + ())
         L2FunctionalAssembler3D.precompute_fields(
                 geo_grad_a,
-                GaussWeight,
+                gaussweights[0], gaussweights[1], gaussweights[2],
                 self.W,
         )
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef void precompute_fields(
             # input
             double[:, :, :, :, ::1] _geo_grad_a,
-            double[:, :, ::1] _GaussWeight,
+            double[::1] _GaussWeight0, double[::1] _GaussWeight1, double[::1] _GaussWeight2,
             # output
             double[:, :, ::1] _W,
         ) nogil:
         cdef size_t n0 = _geo_grad_a.shape[0]
+        cdef size_t i0
         cdef size_t n1 = _geo_grad_a.shape[1]
+        cdef size_t i1
         cdef size_t n2 = _geo_grad_a.shape[2]
+        cdef size_t i2
         cdef double* geo_grad_a
         cdef double GaussWeight
         cdef double W
-        cdef size_t i0
-        cdef size_t i1
-        cdef size_t i2
 
         for i0 in range(n0):
             for i1 in range(n1):
                 for i2 in range(n2):
                     geo_grad_a = &_geo_grad_a[i0, i1, i2, 0, 0]
-                    GaussWeight = _GaussWeight[i0, i1, i2]
+                    GaussWeight = _GaussWeight0[i0] * _GaussWeight1[i1] * _GaussWeight2[i2]
 
                     W = (GaussWeight * fabs((((geo_grad_a[0] * ((geo_grad_a[4] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[7]))) - (geo_grad_a[1] * ((geo_grad_a[3] * geo_grad_a[8]) - (geo_grad_a[5] * geo_grad_a[6])))) + (geo_grad_a[2] * ((geo_grad_a[3] * geo_grad_a[7]) - (geo_grad_a[4] * geo_grad_a[6]))))))
                     _W[i0, i1, i2] = W
@@ -1687,58 +1902,71 @@ cdef class L2FunctionalAssembler3D(BaseAssembler3D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
+    @cython.cdivision(True)
     @staticmethod
     cdef double combine(
-            double[:, :, ::1] _W,
-            double[:, :, ::1] _f_a,
+            double* _W,
+            double* _f_a,
+            size_t n0, size_t n1, size_t n2,
+            size_t s0, size_t s1,
             double* VDu0, double* VDu1, double* VDu2,
+            size_t ng0, size_t ng1, size_t ng2,
         ) nogil:
         cdef double result = 0.0
+        cdef double acc1
+        cdef double acc2
 
-        cdef size_t n0 = _W.shape[0]
-        cdef size_t n1 = _W.shape[1]
-        cdef size_t n2 = _W.shape[2]
-        cdef double W
-        cdef double f_a
+        cdef size_t q
         cdef size_t i0
         cdef size_t i1
         cdef size_t i2
+        cdef double W
+        cdef double f_a
 
         for i0 in range(n0):
+            acc1 = 0.0
             for i1 in range(n1):
+                acc2 = 0.0
                 for i2 in range(n2):
-                    W = _W[i0, i1, i2]
-                    f_a = _f_a[i0, i1, i2]
+                    q = i0*s0 + i1*s1 + i2
+                    W = _W[q]
+                    f_a = _f_a[q]
 
-                    result += ((f_a * (VDu0[1*i0+0] * VDu1[1*i1+0] * VDu2[1*i2+0])) * W)
+                    acc2 += (VDu2[i2]) * f_a * W
+                acc1 += (VDu1[i1]) * acc2
+            result += (VDu0[i0]) * acc1
         return result
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
-    cdef double entry_impl(self, size_t[3] i, size_t[3] j) nogil:
+    @cython.cdivision(True)
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t i2, size_t j0, size_t j1, size_t j2) nogil:
         cdef int k
         cdef IntInterval intv
         cdef size_t g_sta[3]
         cdef size_t g_end[3]
         cdef (double*) values_u[3]
-        intv = make_intv(self.S0.meshsupp0[i[0],0], self.S0.meshsupp0[i[0],1])
+        intv = make_intv(self.S0.meshsupp0[i0,0], self.S0.meshsupp0[i0,1])
         g_sta[0] = self.nqp * intv.a    # start of Gauss nodes
         g_end[0] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[0] = &self.S0.C0[ i[0], g_sta[0], 0 ]
-        intv = make_intv(self.S0.meshsupp1[i[1],0], self.S0.meshsupp1[i[1],1])
+        values_u[0] = &self.S0.C0[ i0, 0, g_sta[0] ]
+        intv = make_intv(self.S0.meshsupp1[i1,0], self.S0.meshsupp1[i1,1])
         g_sta[1] = self.nqp * intv.a    # start of Gauss nodes
         g_end[1] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[1] = &self.S0.C1[ i[1], g_sta[1], 0 ]
-        intv = make_intv(self.S0.meshsupp2[i[2],0], self.S0.meshsupp2[i[2],1])
+        values_u[1] = &self.S0.C1[ i1, 0, g_sta[1] ]
+        intv = make_intv(self.S0.meshsupp2[i2,0], self.S0.meshsupp2[i2,1])
         g_sta[2] = self.nqp * intv.a    # start of Gauss nodes
         g_end[2] = self.nqp * intv.b    # end of Gauss nodes
-        values_u[2] = &self.S0.C2[ i[2], g_sta[2], 0 ]
+        values_u[2] = &self.S0.C2[ i2, 0, g_sta[2] ]
 
         return L2FunctionalAssembler3D.combine(
-                self.W [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
-                self.f_a [ g_sta[0]:g_end[0], g_sta[1]:g_end[1], g_sta[2]:g_end[2] ],
+                &self.W[ g_sta[0], g_sta[1], g_sta[2] ],
+                &self.f_a[ g_sta[0], g_sta[1], g_sta[2] ],
+                g_end[0] - g_sta[0], g_end[1] - g_sta[1], g_end[2] - g_sta[2],
+                self.W.shape[1] * self.W.shape[2], self.W.shape[2],
                 values_u[0], values_u[1], values_u[2],
+                self.S0.C0.shape[2], self.S0.C1.shape[2], self.S0.C2.shape[2],
         )
 
     def update(self, f=None):
@@ -1,42 +1,63 @@
-from jinja2 import Template
+import io
+from collections import ChainMap
+
+import numpy as np
+
+from jinja2 import Environment
 from pyiga import vform
 
+# indentation strings by level; extended on demand by CodeGen
+_INDENTS = ['', '    ', '        ', '            ', '                ']
+
 class CodeGen:
     """Basic code generation helper for Cython."""
     def __init__(self):
-        self._lines = []
+        self._buf = io.StringIO()
+        self._level = 0
         self._indent = ''
 
     def indent(self, num=1):
-        self._indent += num * '    '
+        self._level += num
+        while len(_INDENTS) <= self._level:
+            _INDENTS.append(_INDENTS[-1] + '    ')
+        self._indent = _INDENTS[self._level]
 
     def dedent(self, num=1):
-        self._indent = self._indent[(4*num):]
+        self._level = max(self._level - num, 0)
+        self._indent = _INDENTS[self._level]
 
     def put(self, s):
-        if len(s) == 0:
-            self._lines.append('')
-        else:
-            self._lines.append(self._indent + s)
+        if s:
+            self._buf.write(self._indent)
+            self._buf.write(s)
+        self._buf.write('\n')
 
     def putf(self, s, **kwargs):
         self.put(s.format(**kwargs))
 
+    def put_lines(self, lines):
+        """Write several non-empty lines at the current indentation in one go."""
+        lines = list(lines)
+        if lines:
+            sep = '\n' + self._indent
+            self._buf.write(self._indent + sep.join(lines) + '\n')
+
     def declare_local_variable(self, type, name, init=None):
         if init is not None:
-            self.putf('cdef {type} {name} = {init}', type=type, name=name, init=init)
+            self.put('cdef %s %s = %s' % (type, name, init))
         else:
-            self.putf('cdef {type} {name}', type=type, name=name)
+            self.put('cdef %s %s' % (type, name))
 
     def for_loop(self, idx, upper):
-        self.putf('for {idx} in range({upper}):', idx=idx, upper=upper)
+        self.put('for %s in range(%s):' % (idx, upper))
         self.indent()
 
     def end_loop(self):
         self.dedent()
 
     def result(self):
-        return '\n'.join(self._lines)
+        # lines are newline-terminated; drop the final one to match join semantics
+        return self._buf.getvalue()[:-1]
 
 
 class AsmGenerator:
@@ -48,6 +69,8 @@ class AsmGenerator:
         self.dim = self.vform.dim
         self.vec = self.vform.vec
         self.updatable = tuple(inp for inp in vform.inputs if inp.updatable)
+        self._cache = {}    # memoized results of dimrep/extend_dim/tensorprod
+        self._pderiv_prefix = {}    # (name, D[:-1]) -> hoisted partial product
 
         # fixup PartialDerivExprs for code generation
         for bf in self.vform.basis_funs:
@@ -66,39 +89,96 @@ class AsmGenerator:
         self.code.put(s)
 
     def putf(self, s, **kwargs):
-        env = dict(self.env)
-        env.update(kwargs)
-        self.code.putf(s, **env)
+        self.code.put(s.format_map(ChainMap(kwargs, self.env)))
 
     def dimrep(self, s, sep=', '):
-        return sep.join([s.format(k, **self.env) for k in range(self.dim)])
+        key = ('dimrep', s, sep)
+        r = self._cache.get(key)
+        if r is None:
+            r = self._cache[key] = sep.join([s.format(k) for k in range(self.dim)])
+        return r
 
     def extend_dim(self, i):
         # ex.: dim = 3, i = 1  ->  'None,:,None'
-        slices = self.dim * ['None']
-        slices[i] = ':'
-        return ','.join(slices)
+        key = ('extend_dim', i)
+        r = self._cache.get(key)
+        if r is None:
+            slices = self.dim * ['None']
+            slices[i] = ':'
+            r = self._cache[key] = ','.join(slices)
+        return r
 
     def tensorprod(self, var):
-        return ' * '.join(['{0}[{1}][{2}]'.format(var, k, self.extend_dim(k))
-            for k in range(self.dim)])
+        key = ('tensorprod', var)
+        r = self._cache.get(key)
+        if r is None:
+            r = self._cache[key] = ' * '.join(['{0}[{1}][{2}]'.format(var, k, self.extend_dim(k))
+                for k in range(self.dim)])
+        return r
 
     def gen_pderiv(self, basisfun, D, idx='i'):
         """Generate code for computing parametric partial derivative of `basisfun` of order `D=(Dx1, ..., Dxd)`"""
         D = tuple(reversed(D))  # x is last axis
         assert len(D) == self.dim
         assert all(0 <= d <= self.numderiv for d in D)
-        factors = [
-                "VD{var}{k}[{nderiv}*{idx}{k}+{ofs}]".format(
-                    var = basisfun.name,
-                    idx = idx,
-                    k   = k,
-                    ofs = D[k],
-                    nderiv = self.numderiv+1, # includes 0-th derivative
-                )
-                for k in range(self.dim)]
+        # the 1D tables have the Gauss points as the fastest axis; higher
+        # derivatives are accessed through the pointers set up by
+        # declare_deriv_pointers()
+        if idx == 'i':
+            prefix = self._pderiv_prefix.get((basisfun.name, D[:-1]))
+            if prefix:
+                return '(%s * %s)' % (prefix, self.pderiv_factor(basisfun, D[-1], self.dim - 1))
+        factors = [self.pderiv_factor(basisfun, D[k], k, idx) for k in range(self.dim)]
         return '(' + ' * '.join(factors) + ')'
 
+    def hoisted_pderiv_prefixes(self):
+        """Find the partial products of 1D factors of the basis function
+        derivatives used in the kernel which are invariant in the inner
+        loops, i.e., the products over the axes `0, ..., k` for `0 < k < dim-1`.
+
+        Returns:
+            a list of tuples `(k, key, name, code)`, where the partial product
+            over the axes `0, ..., k` should be computed into the variable
+            `name` at the start of the loop over `i{k}`; `key` is the pair
+            of the basis function name and the derivative orders along these
+            axes (in storage order)
+        """
+        hoisted = []
+        names = {}
+        for pd in vform.iterexprs(self.vform.exprs, deep=True, type=vform.PartialDerivExpr):
+            bfun = pd.basisfun
+            D = tuple(reversed(pd.D))   # x is last axis
+            for k in range(1, self.dim - 1):
+                key = (bfun.name, D[:k+1])
+                if key in names:
+                    continue
+                names[key] = '_%s_p%s' % (bfun.name, ''.join(str(d) for d in D[:k+1]))
+                lhs = (self.pderiv_factor(bfun, D[0], 0) if k == 1
+                        else names[(bfun.name, D[:k])])
+                hoisted.append((k, key, names[key],
+                    '%s * %s' % (lhs, self.pderiv_factor(bfun, D[k], k))))
+        return hoisted
+
+    def pderiv_factor(self, basisfun, d, k, idx='i'):
+        """Generate code for the 1D factor along axis `k` (in storage order) of a
+        partial derivative of `basisfun`, with derivative order `d` along that axis."""
+        if d == 0:
+            return 'VD%s%d[%s%d]' % (basisfun.name, k, idx, k)
+        else:
+            return 'VD%s%d_%d[%s%d]' % (basisfun.name, k, d, idx, k)
+
+    def declare_deriv_pointers(self):
+        """Declare one pointer per basis function, axis and derivative order
+        into the 1D basis tables. The number of derivatives is known at
+        code generation time, so the derivative stride never appears in the
+        Gauss point loops."""
+        for bfun in self.vform.basis_funs:
+            for k in range(self.dim):
+                for d in range(1, self.numderiv + 1):
+                    ofs = ('ng%d' % k) if d == 1 else ('%d*ng%d' % (d, k))
+                    self.declare_pointer('VD%s%d_%d' % (bfun.name, k, d),
+                            'VD%s%d + %s' % (bfun.name, k, ofs))
+
     def declare_index(self, name, init=None):
         self.code.declare_local_variable('size_t', name, init)
 
@@ -108,35 +188,43 @@ class AsmGenerator:
     def declare_pointer(self, name, init=None):
         self.code.declare_local_variable('double*', name, init)
 
-    def declare_vec(self, name, size=None):
+    def declare_vec(self, name, size=None, zero=False):
         if size is None:
             size = self.dim
         self.putf('cdef double {name}[{size}]', name=name, size=size)
+        if zero:
+            self.put(' = '.join('%s[%d]' % (name, k) for k in range(size)) + ' = 0.0')
 
-    def gen_assign(self, var, expr):
+    def assign_entries(self, var, expr):
+        """Return (index, expression) pairs for the entries of a vector or
+        matrix `expr` to be assigned to `var`."""
         if expr.is_vector():
-            for k in range(expr.shape[0]):
-                self.putf('{name}[{k}] = {rhs}',
-                        name=var.name,
-                        k=k,
-                        rhs=expr[k].gencode())
-        elif expr.is_matrix():
-            m, n = expr.shape
-            for i in range(m):
-                for j in range(n):
-                    if var.symmetric and i > j:
-                        continue
-                    self.putf('{name}[{k}] = {rhs}',
-                            name=var.name,
-                            k=i*m + j,
-                            rhs=expr[i,j].gencode())
+            return [(k, expr[k]) for k in range(expr.shape[0])]
         else:
+            m, n = expr.shape
+            # matrices are stored row-major; only upper triangle for symmetric ones
+            return [(i*n + j, expr[i,j]) for i in range(m) for j in range(n)
+                    if not (var.symmetric and i > j)]
+
+    def has_zero_entries(self, var):
+        return (var.expr is not None and not var.is_scalar() and
+                any(e.is_zero() for _, e in self.assign_entries(var, var.expr)))
+
+    def gen_assign(self, var, expr, skip_zeros=False):
+        if expr.is_scalar():
             self.put(var.name + ' = ' + expr.gencode())
+            return
+        for k, e in self.assign_entries(var, expr):
+            # with skip_zeros, the storage has been zeroed on declaration
+            if skip_zeros and e.is_zero():
+                continue
+            self.putf('{name}[{k}] = {rhs}', name=var.name, k=k, rhs=e.gencode())
 
     def cython_pragmas(self):
         self.put('@cython.boundscheck(False)')
         self.put('@cython.wraparound(False)')
         self.put('@cython.initializedcheck(False)')
+        self.put('@cython.cdivision(True)')
 
     def field_type(self, var):
         return 'double[{X}:1]'.format(X=', '.join((self.dim + len(var.shape)) * ':'))
@@ -149,15 +237,27 @@ class AsmGenerator:
                 self.declare_pointer(var.name)
         else:   # no ref - declare local storage
             if var.is_vector():
-                self.declare_vec(var.name, size=var.shape[0])
+                self.declare_vec(var.name, size=var.shape[0], zero=self.has_zero_entries(var))
             elif var.is_matrix():
-                self.declare_vec(var.name, size=var.shape[0]*var.shape[1])
+                self.declare_vec(var.name, size=var.shape[0]*var.shape[1], zero=self.has_zero_entries(var))
             else:
                 self.declare_scalar(var.name)
 
+    def is_inline_weight(self, var):
+        """Gauss weights which are only needed during precomputation are not
+        stored as a dense tensor product; the 1D weight vectors are passed
+        instead and multiplied at each Gauss point."""
+        return var.src == '@GaussWeight' and not var.is_global
+
+    def inline_weight_load(self, var):
+        return '%s = %s' % (var.name, self.dimrep('_%s{0}[i{0}]' % var.name, sep=' * '))
+
     def declare_params(self, params):
         for var in params:
-            self.putf('{type} _{name},', type=self.field_type(var), name=var.name)
+            if self.is_inline_weight(var):
+                self.put(self.dimrep('double[::1] _%s{}' % var.name) + ',')
+            else:
+                self.putf('{type} _{name},', type=self.field_type(var), name=var.name)
 
     def declare_array_vars(self, vars):
         for var in vars:
@@ -165,23 +265,57 @@ class AsmGenerator:
                     X=', '.join((self.dim + len(var.shape)) * ':'),
                     name=var.name)
 
-    def load_field_var(self, var, I, ref_only=False):
+    def field_var_load(self, var, I, ref_only=False):
+        """Return the statement which loads field variable `var` at grid index `I`, or None."""
+        name = var.name
         if var.is_scalar():
-            if not ref_only: self.putf('{name} = _{name}[{I}]', name=var.name, I=I)
+            if not ref_only: return '%s = _%s[%s]' % (name, name, I)
         elif var.is_vector():
-            self.putf('{name} = &_{name}[{I}, 0]', name=var.name, I=I)
+            return '%s = &_%s[%s, 0]' % (name, name, I)
         elif var.is_matrix():
-            self.putf('{name} = &_{name}[{I}, 0, 0]', name=var.name, I=I)
+            return '%s = &_%s[%s, 0, 0]' % (name, name, I)
+        return None
+
+    def load_field_var(self, var, I, ref_only=False):
+        line = self.field_var_load(var, I, ref_only)
+        if line is not None:
+            self.put(line)
+
+    def field_var_load_raw(self, var):
+        """Load field variable `var` through its base pointer at linear grid index `q`."""
+        size = 1
+        for n in var.shape:
+            size *= n
+        ofs = 'q' if size == 1 else ('%d*q' % size)
+        if var.is_scalar():
+            return '%s = _%s[%s]' % (var.name, var.name, ofs)
+        else:
+            return '%s = &_%s[%s]' % (var.name, var.name, ofs)
+
+    def start_loop_with_fields(self, fields_in, fields_out=[], local_vars=[], raw=False,
+            loop_prologue=None):
+        """Start the loop over all Gauss points and load the field variables.
+
+        If `raw` is True, the input fields are given as base pointers together
+        with the grid extents `n{k}` and the grid strides `s{k}`, and no output
+        fields are allowed. Otherwise, all fields are memoryviews.
 
-    def start_loop_with_fields(self, fields_in, fields_out=[], local_vars=[]):
+        If given, `loop_prologue(k)` is called to emit code at the start of the
+        body of each loop over `i{k}` except the innermost one.
+        """
         fields = fields_in + fields_out
+        dims = range(self.dim)
 
-        # get input size from an arbitrary field variable
-        for k in range(self.dim):
-            self.declare_index(
-                    'n%d' % k,
-                    '_{var}.shape[{k}]'.format(k=k, var=fields[0].name)
-            )
+        # get input size from an arbitrary field variable, declare iteration indices
+        if raw:
+            assert not fields_out
+            self.declare_index('q')
+        else:
+            size_var = [var for var in fields if not self.is_inline_weight(var)][0]
+        for k in dims:
+            if not raw:
+                self.declare_index('n%d' % k, '_%s.shape[%d]' % (size_var.name, k))
+            self.declare_index('i%d' % k)
 
         # temp storage for local variables
         for var in local_vars:
@@ -191,27 +325,30 @@ class AsmGenerator:
         for var in fields:
             self.declare_var(var, ref=True)
 
-        # declare iteration indices
-        for k in range(self.dim):
-            self.declare_index('i%d' % k)
-
         # start the for loop
         self.put('')
-        for k in range(self.dim):
+        for k in dims:
             self.code.for_loop('i%d' % k, 'n%d' % k)
-
-        # generate assignments for field variables
-        I = self.dimrep('i{}')  # current grid index
-        for var in fields_in:
-            self.load_field_var(var, I)
-        for var in fields_out:
-            # these have no values yet, only get a reference
-            self.load_field_var(var, I, ref_only=True)
+            if loop_prologue and k < self.dim - 1:
+                loop_prologue(k)
+
+        # generate assignments for field variables;
+        # output fields have no values yet, only get a reference
+        if raw:
+            self.put('q = ' + ' + '.join(['i%d*s%d' % (k, k) for k in range(self.dim - 1)]
+                + ['i%d' % (self.dim - 1)]))
+            loads = [self.field_var_load_raw(var) for var in fields_in]
+        else:
+            I = self.dimrep('i{}')  # current grid index
+            loads = ([self.inline_weight_load(var) if self.is_inline_weight(var)
+                        else self.field_var_load(var, I) for var in fields_in] +
+                     [self.field_var_load(var, I, ref_only=True) for var in fields_out])
+        self.code.put_lines(line for line in loads if line is not None)
         self.put('')
 
         # generate code for computing local variables
         for var in local_vars:
-            self.gen_assign(var, var.expr)
+            self.gen_assign(var, var.expr, skip_zeros=True)
 
     def generate_kernel(self):
         # function definition
@@ -224,21 +361,36 @@ class AsmGenerator:
         array_params = [var for var in self.vform.kernel_deps if var.is_array]
         local_vars   = [var for var in self.vform.kernel_deps if not var.is_array]
 
-        # parameters
-        self.declare_params(array_params)
+        # parameters: field variables are passed as pointers to the first
+        # Gauss point of the current window, together with the window
+        # extents and the grid strides of the field arrays
+        for var in array_params:
+            self.put('double* _%s,' % var.name)
+        self.put(self.dimrep('size_t n{}') + ',')
+        if self.dim > 1:
+            self.put(', '.join('size_t s%d' % k for k in range(self.dim - 1)) + ',')
 
         # arrays for basis function values/derivatives
         for bfun in self.vform.basis_funs:
             self.put(self.dimrep('double* VD%s{}' % bfun.name) + ',')
+        self.put(self.dimrep('size_t ng{}') + ',')
 
         if self.vec:    # for vector assemblers, result is passed as a pointer
             self.put('double result[]')
         self.dedent()
         self.put(') nogil:')
 
+        separable = self.separable_term()
+        hoisted = [] if separable else self.hoisted_pderiv_prefixes()
+
         # local variables
-        if not self.vec:    # for vector assemblers, result is passed as a pointer
-            self.declare_scalar('result', '0.0')
+        self.declare_accumulators()
+        if separable:
+            for k in range(1, self.dim):
+                self.declare_scalar('acc%d' % k)
+        for _, _, name, _ in hoisted:
+            self.declare_scalar(name)
+        self.declare_deriv_pointers()
 
         self.declare_custom_variables()
 
@@ -246,34 +398,119 @@ class AsmGenerator:
 
         ############################################################
         # main loop over all Gauss points
-        self.start_loop_with_fields(array_params, local_vars=local_vars)
+        if separable:
+            self.start_loop_with_fields(array_params, local_vars=local_vars, raw=True,
+                    loop_prologue=lambda k: self.put('acc%d = 0.0' % (k + 1)))
+        else:
+            def put_hoisted(k):
+                for level, _, name, code in hoisted:
+                    if level == k:
+                        self.put('%s = %s' % (name, code))
+            # the innermost loop uses the partial products over all outer axes
+            self._pderiv_prefix = {key: name for k, key, name, _ in hoisted
+                    if k == self.dim - 2}
+            self.start_loop_with_fields(array_params, local_vars=local_vars, raw=True,
+                    loop_prologue=put_hoisted)
 
         # if needed, generate custom code for the bilinear form a(u,v)
         self.generate_biform_custom()
 
-        # generate code for all expressions in the bilinear form
-        if self.vec:
-            for expr in self.vform.exprs:
-                for i, e_i in enumerate(expr):
-                    self.put(('result[%d] += ' % i) + e_i.gencode())
+        if separable:
+            # sum factorization: contract with the 1D factors axis by axis
+            pderivs, coeff = separable
+            acc = lambda k: 'acc%d' % k if k > 0 else 'result'
+            def axis_factor(k):
+                return ' * '.join(self.pderiv_factor(pd.basisfun, tuple(reversed(pd.D))[k], k)
+                        for pd in pderivs)
+            self.put('%s += (%s) * %s' % (acc(self.dim - 1), axis_factor(self.dim - 1), coeff))
+            for k in reversed(range(self.dim)):
+                self.code.end_loop()
+                if k > 0:
+                    self.put('%s += (%s) * %s' % (acc(k - 1), axis_factor(k - 1), acc(k)))
         else:
-            for expr in self.vform.exprs:
-                self.put('result += ' + expr.gencode())
+            # generate code for all expressions in the bilinear form
+            self.generate_accumulation()
+            self._pderiv_prefix = {}
 
-        # end main loop
-        for _ in range(self.dim):
-            self.code.end_loop()
+            # end main loop
+            for _ in range(self.dim):
+                self.code.end_loop()
         ############################################################
 
-        if not self.vec:
-            self.put('return result')
+        self.store_accumulators()
         self.end_function()
 
+    def separable_term(self):
+        """Check if the form is a single product of basis function values or
+        derivatives with a coefficient which does not depend on the basis
+        functions. Each such product factors into one 1D factor per axis times
+        the coefficient, and the kernel can then sum over the Gauss points one
+        axis at a time.
+
+        Returns:
+            a pair `(pderivs, coeff)` of the :class:`PartialDerivExpr` factors
+            and the code for the coefficient, or None if the form does not
+            have this structure.
+        """
+        if self.vec or len(self.vform.exprs) != 1:
+            return None
+        if type(self).generate_biform_custom is not AsmGenerator.generate_biform_custom:
+            return None
+        factors = []
+        def collect(e):
+            if isinstance(e, vform.ScalarOperExpr) and e.oper == '*':
+                for c in e.children:
+                    collect(c)
+            else:
+                factors.append(e)
+        collect(self.vform.exprs[0])
+        pderivs = [f for f in factors if isinstance(f, vform.PartialDerivExpr)]
+        coeffs = [f for f in factors if not isinstance(f, vform.PartialDerivExpr)]
+        if not pderivs or not coeffs:
+            return None
+        if any(True for _ in vform.iterexprs(coeffs, deep=True, type=vform.PartialDerivExpr)):
+            return None
+        return pderivs, ' * '.join(c.gencode() for c in coeffs)
+
+    def declare_accumulators(self):
+        # vector results are summed in local scalars and only written to
+        # result[] after the loop, so that the inner loop is a pure scalar
+        # reduction which the C compiler can vectorize
+        if self.vec:
+            for i in range(self.vec):
+                self.declare_scalar('result_%d' % i, '0.0')
+        else:
+            self.declare_scalar('result', '0.0')
+
+    def store_accumulators(self):
+        if self.vec:
+            for i in range(self.vec):
+                self.put('result[%d] += result_%d' % (i, i))
+        else:
+            self.put('return result')
+
+    def generate_accumulation(self):
+        """Generate the update of `result` at the current Gauss point.
+
+        All terms of the form are summed into a single accumulation per
+        result entry."""
+        if self.vec:
+            terms = [[] for _ in range(self.vec)]
+            for expr in self.vform.exprs:
+                for i, e_i in enumerate(expr):
+                    terms[i].append(e_i.gencode())
+            for i, terms_i in enumerate(terms):
+                self.put(('result_%d += ' % i) + ' + '.join(terms_i))
+        else:
+            self.put('result += ' + ' + '.join(expr.gencode() for expr in self.vform.exprs))
+
     def gen_entry_impl_header(self):
         if self.vec:
-            funcdecl = 'cdef void entry_impl(self, size_t[{dim}] i, size_t[{dim}] j, double result[]) nogil:'.format(dim=self.dim)
+            funcdecl = 'cdef void entry_impl(self, %s, double result[]) nogil:'
         else:
-            funcdecl = 'cdef double entry_impl(self, size_t[{dim}] i, size_t[{dim}] j) nogil:'.format(dim=self.dim)
+            funcdecl = 'cdef double entry_impl(self, %s) nogil:'
+        # indices are passed as scalars, one per dimension
+        funcdecl = funcdecl % (self.dimrep('size_t i{}') + ', ' + self.dimrep('size_t j{}'))
         zeroret = '' if self.vec else '0.0'  # for vector assemblers, result[] is 0-initialized
 
         self.cython_pragmas()
@@ -296,13 +533,13 @@ class AsmGenerator:
         for k in range(self.dim):
             if len(idx_bfun) == 1:
                 idx, bfun = idx_bfun[0]
-                self.putf('intv = make_intv(self.S{space}.meshsupp{k}[{idx}[{k}],0], self.S{space}.meshsupp{k}[{idx}[{k}],1])',
+                self.putf('intv = make_intv(self.S{space}.meshsupp{k}[{idx}{k},0], self.S{space}.meshsupp{k}[{idx}{k},1])',
                         k=k, space=bfun.space, idx=idx)
             elif len(idx_bfun) == 2:
                 self.putf('intv = intersect_intervals(')
                 self.indent(2)
                 for idx,bfun in idx_bfun:
-                    self.putf('make_intv(self.S{space}.meshsupp{k}[{idx}[{k}],0], self.S{space}.meshsupp{k}[{idx}[{k}],1]),',
+                    self.putf('make_intv(self.S{space}.meshsupp{k}[{idx}{k},0], self.S{space}.meshsupp{k}[{idx}{k},1]),',
                             k=k, space=bfun.space, idx=idx)
                 self.dedent(2)
                 self.put(')')
@@ -313,7 +550,7 @@ class AsmGenerator:
 
             # a_ij = a(phi_j, phi_i)  -- second index (j) corresponds to first (trial) function
             for idx,bfun in idx_bfun:
-                self.putf('values_{name}[{k}] = &self.S{space}.C{k}[ {idx}[{k}], g_sta[{k}], 0 ]',
+                self.putf('values_{name}[{k}] = &self.S{space}.C{k}[ {idx}{k}, 0, g_sta[{k}] ]',
                         k=k, name=bfun.name, space=bfun.space, idx=idx)
         self.put('')
 
@@ -329,14 +566,23 @@ class AsmGenerator:
         self.indent(2)
 
         # generate array variable arguments
-        idx = self.dimrep('g_sta[{0}]:g_end[{0}]')
-        for var in self.vform.kernel_deps:
-            if var.is_array:
-                self.putf('self.{name} [ {idx} ],', name=var.name, idx=idx)
+        array_vars = [var for var in self.vform.kernel_deps if var.is_array]
+        idx = self.dimrep('g_sta[{0}]')
+        for var in array_vars:
+            self.putf('&self.{name}[ {idx} ],', name=var.name,
+                    idx=', '.join([idx] + len(var.shape) * ['0']))
+        self.put(self.dimrep('g_end[{0}] - g_sta[{0}]') + ',')
+        if self.dim > 1:
+            f = array_vars[0].name
+            self.put(', '.join(
+                ' * '.join('self.%s.shape[%d]' % (f, j) for j in range(k + 1, self.dim))
+                for k in range(self.dim - 1)) + ',')
 
         # generate basis function value arguments
         for bfun in self.vform.basis_funs:
             self.put(self.dimrep('values_%s[{0}]' % bfun.name) + ',')
+        # stride between derivatives in the basis function tables
+        self.put(self.dimrep('self.S%s.C{0}.shape[2]' % self.vform.basis_funs[0].space) + ',')
 
         # generate output argument if needed (for vector assemblers)
         if self.vec:
@@ -396,21 +642,36 @@ N = tuple(gg.shape[0] for gg in gaussgrid)  # grid dimensions""".splitlines():
 
         # declare array storage for non-global variables
         self.declare_array_vars(var for var in self.vform.precomp_deps
-                if var.is_array and not var.is_global)
+                if var.is_array and not var.is_global and not self.is_inline_weight(var))
 
         def array_var_ref(var):
             assert var.is_array
             return ('self.' if var.is_global else '') + var.name
 
         # declare/initialize array variables
+        precomp_arrays = []
         for var in vf.linear_deps:
             # exclude virtual basis function nodes '@u', '@v'
-            if not isinstance(var, str) and var.is_array:
-                arr = array_var_ref(var)
+            if not isinstance(var, str) and var.is_array and not self.is_inline_weight(var):
                 if var.src:
-                    self.putf("{arr} = {src}", arr=arr, src=self.parse_src(var))
+                    self.putf("{arr} = {src}", arr=array_var_ref(var), src=self.parse_src(var))
                 elif var.expr:  # custom precomputed field var
-                    self.putf("{arr} = np.empty(N + {shape})", arr=arr, shape=var.shape)
+                    precomp_arrays.append(var)
+
+        # allocate storage for custom precomputed field vars
+        if len(precomp_arrays) == 1:
+            var = precomp_arrays[0]
+            self.putf("{arr} = np.empty(N + {shape})", arr=array_var_ref(var), shape=var.shape)
+        elif precomp_arrays:
+            # take all fields from one contiguous buffer
+            sizes = [int(np.prod(var.shape)) for var in precomp_arrays]
+            self.put('_npts = int(np.prod(N))')
+            self.putf('_arena = np.empty({total} * _npts)', total=sum(sizes))
+            ofs = 0
+            for var, size in zip(precomp_arrays, sizes):
+                self.putf("{arr} = _arena[{a}*_npts : {b}*_npts].reshape(N + {shape})",
+                        arr=array_var_ref(var), a=ofs, b=ofs + size, shape=var.shape)
+                ofs += size
 
         if vf.precomp:
             # call precompute function
@@ -418,7 +679,10 @@ N = tuple(gg.shape[0] for gg in gaussgrid)  # grid dimensions""".splitlines():
             self.indent(2)
             # generate arguments for input and output fields
             for var in vf.precomp_deps + vf.precomp:
-                self.put(array_var_ref(var) + ',')
+                if self.is_inline_weight(var):
+                    self.put(self.dimrep('gaussweights[{0}]') + ',')
+                else:
+                    self.put(array_var_ref(var) + ',')
             self.dedent(2)
             self.put(')')
 
@@ -529,7 +793,42 @@ N = tuple(gg.shape[0] for gg in gaussgrid)  # grid dimensions""".splitlines():
 # Generic templates for assembler infrastructure
 ################################################################################
 
-tmpl_generic = Template(r'''
+# shared environment; templates are compiled once at import time
+_jinja_env = Environment(trim_blocks=True, lstrip_blocks=True, autoescape=False)
+
+tmpl_generic = _jinja_env.from_string(r'''
+{# advance the multi-index I to its lexicographic successor within self.S0.ndofs;
+   leaves the enclosing loop after the last index #}
+{# blocks{k} lists all block indices on level k, lower{k} only those on or
+   below the diagonal; in symmetric assembly, a level below a diagonal block
+   iterates over lower{k} and thus never visits blocks above the diagonal #}
+{% macro block_lists() %}
+{% for k in range(1, DIM) %}
+    cdef size_t[::1] blocks{{k}} = np.arange(MU{{k}}, dtype=np.uintp)
+    cdef size_t[::1] lower{{k}} = np.flatnonzero(bidx[{{k}}][:, 1] <= bidx[{{k}}][:, 0]).astype(np.uintp)
+{% endfor %}
+{% endmacro %}
+{% macro block_list_args(ind) %}
+{% for k in range(1, DIM) %}
+{{ ind }}lower{{k}}, blocks{{k}},
+{% endfor %}
+{% endmacro %}
+{% macro block_list_params() %}
+{% for k in range(1, DIM) %}
+    size_t[::1] lower{{k}}, size_t[::1] blocks{{k}},
+{% endfor %}
+{% endmacro %}
+{% macro inline_next_lex(ind) %}
+{% for k in range(DIM - 1, -1, -1) %}
+{{ ind }}{{ indent(DIM - 1 - k) }}I[{{k}}] += 1
+{{ ind }}{{ indent(DIM - 1 - k) }}if I[{{k}}] == self.S0.ndofs[{{k}}]:
+{% if k > 0 %}
+{{ ind }}{{ indent(DIM - k) }}I[{{k}}] = 0
+{% else %}
+{{ ind }}{{ indent(DIM - k) }}break
+{%- endif %}
+{% endfor %}
+{% endmacro %}
 ################################################################################
 # {{DIM}}D Assemblers
 ################################################################################
@@ -537,21 +836,21 @@ tmpl_generic = Template(r'''
 cdef struct SpaceInfo{{DIM}}:
     size_t[{{DIM}}] ndofs
     int[{{DIM}}] p
-    {%- for k in range(DIM) %}
+    {% for k in range(DIM) %}
     ssize_t[:,::1] meshsupp{{k}}
-    {%- endfor %}
-    # 1D basis values. Indices: basis function, mesh point, derivative
-    {%- for k in range(DIM) %}
+    {% endfor %}
+    # 1D basis values. Indices: basis function, derivative, mesh point
+    {% for k in range(DIM) %}
     double[:, :, ::1] C{{k}}
-    {%- endfor %}
+    {% endfor %}
 
 cdef void clear_spaceinfo{{DIM}}(SpaceInfo{{DIM}} & S):
-    {%- for k in range(DIM) %}
+    {% for k in range(DIM) %}
     S.meshsupp{{k}} = None
-    {%- endfor %}
-    {%- for k in range(DIM) %}
+    {% endfor %}
+    {% for k in range(DIM) %}
     S.C{{k}} = None
-    {%- endfor %}
+    {% endfor %}
 
 cdef void init_spaceinfo{{DIM}}(SpaceInfo{{DIM}} & S, kvs):
     # work around Cython bug: memoryviews in structs are not properly initialized
@@ -560,9 +859,9 @@ cdef void init_spaceinfo{{DIM}}(SpaceInfo{{DIM}} & S, kvs):
     assert len(kvs) == {{DIM}}, "Assembler requires {{DIM}} knot vectors"
     S.ndofs[:] = [kv.numdofs for kv in kvs]
     S.p[:]     = [kv.p for kv in kvs]
-    {%- for k in range(DIM) %}
+    {% for k in range(DIM) %}
     S.meshsupp{{k}} = kvs[{{k}}].mesh_support_idx_all()
-    {%- endfor %}
+    {% endfor %}
 
 cdef class BaseAssembler{{DIM}}D:
     cdef readonly int arity
@@ -583,7 +882,7 @@ cdef class BaseAssembler{{DIM}}D:
         clear_spaceinfo{{DIM}}(self.S0)
         clear_spaceinfo{{DIM}}(self.S1)
 
-    cdef double entry_impl(self, size_t[{{DIM}}] i, size_t[{{DIM}}] j) nogil:
+    cdef double entry_impl(self, {{ dimrepeat('size_t i{}') }}, {{ dimrepeat('size_t j{}') }}) nogil:
         return -9999.99  # Not implemented
 
     cpdef double entry1(self, size_t i):
@@ -593,7 +892,7 @@ cdef class BaseAssembler{{DIM}}D:
         cdef size_t[{{DIM}}] I, J
         with nogil:
             from_seq{{DIM}}(i, self.S0.ndofs, I)
-            return self.entry_impl(I, <size_t*>0)
+            return self.entry_impl({{ dimrepeat('I[{}]') }}, {{ dimrepeat('0') }})
 
     cpdef double entry(self, size_t i, size_t j):
         """Compute an entry of the matrix."""
@@ -603,20 +902,28 @@ cdef class BaseAssembler{{DIM}}D:
         with nogil:
             from_seq{{DIM}}(i, self.S1.ndofs, I)
             from_seq{{DIM}}(j, self.S0.ndofs, J)
-            return self.entry_impl(I, J)
+            return self.entry_impl({{ dimrepeat('I[{}]') }}, {{ dimrepeat('J[{}]') }})
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cdef void multi_entries_chunk(self, size_t[:,::1] idx_arr, double[::1] out) nogil:
+    cdef void multi_entries_chunk(self, size_t[:,::1] idx_arr, double[::1] out, size_t sta, size_t end) nogil:
+        """Compute the entries with indices `sta <= k < end` in `idx_arr`."""
         if self.arity != 2:
             return
         cdef size_t[{{DIM}}] I, J
         cdef size_t k
 
-        for k in range(idx_arr.shape[0]):
+        for k in range(sta, end):
             from_seq{{DIM}}(idx_arr[k,0], self.S1.ndofs, I)
             from_seq{{DIM}}(idx_arr[k,1], self.S0.ndofs, J)
-            out[k] = self.entry_impl(I, J)
+            out[k] = self.entry_impl({{ dimrepeat('I[{}]') }}, {{ dimrepeat('J[{}]') }})
+
+    @cython.cdivision(True)
+    cdef void multi_entries_parallel(self, size_t[:,::1] idx_arr, double[::1] out, int num_threads) nogil:
+        cdef size_t n = idx_arr.shape[0]
+        cdef int t
+        for t in prange(num_threads, num_threads=num_threads, schedule='static'):
+            self.multi_entries_chunk(idx_arr, out, t * n // num_threads, (t + 1) * n // num_threads)
 
     def multi_entries(self, indices):
         """Compute all entries given by `indices`.
@@ -635,22 +942,12 @@ cdef class BaseAssembler{{DIM}}D:
 
         cdef double[::1] result = np.empty(idx_arr.shape[0])
 
-        num_threads = pyiga.get_max_threads()
-        if num_threads <= 1:
-            self.multi_entries_chunk(idx_arr, result)
-        else:
-            thread_pool = get_thread_pool()
-
-            def asm_chunk(idxchunk, out):
-                cdef size_t[:, ::1] idxchunk_ = idxchunk
-                cdef double[::1] out_ = out
-                with nogil:
-                    self.multi_entries_chunk(idxchunk_, out_)
-
-            results = thread_pool.map(asm_chunk,
-                        chunk_tasks(idx_arr, num_threads),
-                        chunk_tasks(result, num_threads))
-            list(results)   # wait for threads to finish
+        cdef int num_threads = pyiga.get_max_threads()
+        with nogil:
+            if num_threads <= 1:
+                self.multi_entries_chunk(idx_arr, result, 0, idx_arr.shape[0])
+            else:
+                self.multi_entries_parallel(idx_arr, result, num_threads)
         return result
 
     @cython.boundscheck(False)
@@ -662,15 +959,13 @@ cdef class BaseAssembler{{DIM}}D:
         cdef double[{{ dimrepeat(':') }}:1] _result = result
         cdef double* out = &_result[ {{ dimrepeat('0') }} ]
 
-        cdef size_t[{{DIM}}] I, zero
-        {{ dimrepeat('zero[{}]', sep=' = ') }} = 0
+        cdef size_t[{{DIM}}] I
         {{ dimrepeat('I[{}]', sep=' = ') }} = 0
         with nogil:
             while True:
-               out[0] = self.entry_impl(I, <size_t*>0)
-               out += 1
-               if not next_lexicographic{{DIM}}(I, zero, self.S0.ndofs):
-                   break
+                out[0] = self.entry_impl({{ dimrepeat('I[{}]') }}, {{ dimrepeat('0') }})
+                out += 1
+{{ inline_next_lex(indent(4)) }}
         return result
 
     def entry_func_ptr(self):
@@ -689,73 +984,190 @@ def generic_assemble_core_{{DIM}}d(BaseAssembler{{DIM}}D asm, bidx, bint symmetr
     {{ dimrepeat('bidx{}') }} = bidx
     {{ dimrepeat('MU{}') }} = {{ dimrepeat('bidx{}.shape[0]') }}
 
+    # the kernels read row and column indices from separate contiguous arrays
+    cdef unsigned[::1] {{ dimrepeat('bidx{0}_i, bidx{0}_j') }}
+{% for k in range(DIM) %}
+    bidx{{k}}_i = np.ascontiguousarray(bidx[{{k}}][:, 0])
+    bidx{{k}}_j = np.ascontiguousarray(bidx[{{k}}][:, 1])
+{% endfor %}
+
     cdef size_t[::1] {{ dimrepeat('transp{}') }}
     if symmetric:
-    {%- for k in range(DIM) %}
+    {% for k in range(DIM) %}
         transp{{k}} = get_transpose_idx_for_bidx(bidx{{k}})
-    {%- endfor %}
+    {% endfor %}
     else:
         {{ dimrepeat('transp{}', sep=' = ') }} = None
+{{ block_lists() }}
 
-    entries = np.zeros(({{ dimrepeat('MU{}') }}))
+    # every entry is written by the kernel, either directly or as a transposed entry
+    entries = np.empty(({{ dimrepeat('MU{}') }}))
 
     cdef int num_threads = pyiga.get_max_threads()
 
-    for mu0 in prange(MU0, num_threads=num_threads, nogil=True):
+    # rows of blocks differ in cost (in symmetric assembly, rows near the
+    # diagonal skip many blocks), so distribute them dynamically
+    for mu0 in prange(MU0, num_threads=num_threads, nogil=True, schedule='dynamic'):
         _asm_core_{{DIM}}d_kernel(asm, symmetric,
-            {{ dimrepeat('bidx{}') }},
+            {{ dimrepeat('bidx{0}_i, bidx{0}_j') }},
             {{ dimrepeat('transp{}') }},
-            entries,
+{{ block_list_args('            ') }}            entries,
             mu0)
     return entries
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def generic_assemble_core_multi_{{DIM}}d(asms, bidx, bint symmetric=False):
+    """Assemble several bilinear forms over the same pair of spaces in a
+    single sweep over their common sparsity pattern.
+
+    Returns an array of entries whose first axis corresponds to `asms`.
+    """
+    cdef BaseAssembler{{DIM}}D asm
+    cdef vector[void*] asm_ptrs
+    for asm in asms:
+        if asm.arity != 2:
+            return None
+        asm_ptrs.push_back(<void*>asm)
+    cdef size_t num_asm = asm_ptrs.size()
+    if num_asm == 0:
+        return None
+    cdef void** asm_arr = &asm_ptrs[0]
+
+    cdef unsigned[:, ::1] {{ dimrepeat('bidx{}') }}
+    cdef long {{ dimrepeat('mu{}') }}, {{ dimrepeat('MU{}') }}
+    cdef double[:, {{ dimrepeat(':') }}:1] entries
+
+    {{ dimrepeat('bidx{}') }} = bidx
+    {{ dimrepeat('MU{}') }} = {{ dimrepeat('bidx{}.shape[0]') }}
+
+    cdef unsigned[::1] {{ dimrepeat('bidx{0}_i, bidx{0}_j') }}
+{% for k in range(DIM) %}
+    bidx{{k}}_i = np.ascontiguousarray(bidx[{{k}}][:, 0])
+    bidx{{k}}_j = np.ascontiguousarray(bidx[{{k}}][:, 1])
+{% endfor %}
+
+    cdef size_t[::1] {{ dimrepeat('transp{}') }}
+    if symmetric:
+    {% for k in range(DIM) %}
+        transp{{k}} = get_transpose_idx_for_bidx(bidx{{k}})
+    {% endfor %}
+    else:
+        {{ dimrepeat('transp{}', sep=' = ') }} = None
+{{ block_lists() }}
+
+    entries = np.empty((num_asm, {{ dimrepeat('MU{}') }}))
+
+    cdef int num_threads = pyiga.get_max_threads()
+
+    # rows of blocks differ in cost (in symmetric assembly, rows near the
+    # diagonal skip many blocks), so distribute them dynamically
+    for mu0 in prange(MU0, num_threads=num_threads, nogil=True, schedule='dynamic'):
+        _asm_core_multi_{{DIM}}d_kernel(asm_arr, num_asm, symmetric,
+            {{ dimrepeat('bidx{0}_i, bidx{0}_j') }},
+            {{ dimrepeat('transp{}') }},
+{{ block_list_args('            ') }}            entries,
+            mu0)
+    return entries
+
+{# kernel for one row mu0 of blocks; with MULTI, the entries of several
+   assemblers are computed in the same traversal.
+   The block loops are deliberately not unrolled: their bodies are dominated
+   by the virtual call to entry_impl, which the C compiler cannot inline. #}
+{% macro scalar_kernel(MULTI) %}
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.initializedcheck(False)
-cdef void _asm_core_{{DIM}}d_kernel(
+cdef void _asm_core_{{ 'multi_' if MULTI }}{{DIM}}d_kernel(
+{% if MULTI %}
+    void** asms,
+    size_t num_asm,
+{% else %}
     BaseAssembler{{DIM}}D asm,
+{% endif %}
     bint symmetric,
-    {{ dimrepeat('unsigned[:, ::1] bidx{}') }},
+    {{ dimrepeat('unsigned[::1] bidx{0}_i, unsigned[::1] bidx{0}_j') }},
     {{ dimrepeat('size_t[::1] transp{}') }},
-    double[{{ dimrepeat(':') }}:1] entries,
+{{ block_list_params() }}    double[{{ ':, ' if MULTI }}{{ dimrepeat(':') }}:1] entries,
     long _mu0
 ) nogil:
-    cdef size_t[{{DIM}}] i, j
-    cdef int {{ dimrepeat('diag{}') }}
+    cdef size_t {{ dimrepeat('i{}') }}, {{ dimrepeat('j{}') }}
+    cdef int diag0
+    cdef bint {{ dimrepeat('ondiag{}') }}
     cdef double entry
     cdef long {{ dimrepeat('mu{}') }}, {{ dimrepeat('MU{}') }}
+    cdef size_t {{ dimrepeat('t{}') }}      # transposed block indices
+{% for k in range(1, DIM) %}
+    cdef size_t* blk{{k}}
+{% endfor %}
+    cdef size_t {{ dimrepeat('nblk{}', lower=1) }}, {{ dimrepeat('m{}', lower=1) }}
+{% if MULTI %}
+    cdef size_t a
+{% endif %}
 
     mu0 = _mu0
-    {{ dimrepeat('MU{}') }} = {{ dimrepeat('bidx{}.shape[0]') }}
+    {{ dimrepeat('MU{}') }} = {{ dimrepeat('bidx{}_i.shape[0]') }}
 
-    i[0] = bidx0[mu0, 0]
-    j[0] = bidx0[mu0, 1]
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
 
+    {{ dimrepeat('ondiag{}', sep=' = ') }} = False
+    {{ dimrepeat('t{}', sep=' = ') }} = 0
     if symmetric:
-        diag0 = <int>j[0] - <int>i[0]
+        diag0 = <int>j0 - <int>i0
         if diag0 > 0:       # block is above diagonal?
             return
+        ondiag0 = (diag0 == 0)
+        t0 = transp0[mu0]
 {% for k in range(1, DIM) %}
-{{ indent(k)   }}for mu{{k}} in range(MU{{k}}):
-{{ indent(k)   }}    i[{{k}}] = bidx{{k}}[mu{{k}}, 0]
-{{ indent(k)   }}    j[{{k}}] = bidx{{k}}[mu{{k}}, 1]
+
+{{ indent(k)   }}if ondiag{{k-1}}:     # skip blocks above the diagonal
+{{ indent(k)   }}    blk{{k}} = &lower{{k}}[0]
+{{ indent(k)   }}    nblk{{k}} = lower{{k}}.shape[0]
+{{ indent(k)   }}else:
+{{ indent(k)   }}    blk{{k}} = &blocks{{k}}[0]
+{{ indent(k)   }}    nblk{{k}} = MU{{k}}
+{{ indent(k)   }}for m{{k}} in range(nblk{{k}}):
+{{ indent(k)   }}    mu{{k}} = blk{{k}}[m{{k}}]
+{{ indent(k)   }}    i{{k}} = bidx{{k}}_i[mu{{k}}]
+{{ indent(k)   }}    j{{k}} = bidx{{k}}_j[mu{{k}}]
 
 {{ indent(k)   }}    if symmetric:
-{{ indent(k)   }}        diag{{k}} = <int>j[{{k}}] - <int>i[{{k}}]
-{{ indent(k)   }}        if {{ dimrepeat('diag{} == 0', sep=' and ', upper=k) }} and diag{{k}} > 0:
-{{ indent(k)   }}            continue
+{{ indent(k)   }}        ondiag{{k}} = ondiag{{k-1}} & (j{{k}} == i{{k}})
+{{ indent(k)   }}        t{{k}} = transp{{k}}[mu{{k}}]
 {% endfor %}
-{{ indent(DIM) }}entry = asm.entry_impl(i, j)
+
+{% if MULTI %}
+{{ indent(DIM) }}for a in range(num_asm):
+{{ indent(DIM) }}    entry = (<BaseAssembler{{DIM}}D>asms[a]).entry_impl({{ dimrepeat('i{}') }}, {{ dimrepeat('j{}') }})
+{{ indent(DIM) }}    entries[a, {{ dimrepeat('mu{}') }}] = entry
+
+{{ indent(DIM) }}    if symmetric:
+{{ indent(DIM) }}        if not ondiag{{DIM-1}}:     # are we off the diagonal?
+{{ indent(DIM) }}            entries[ a, {{ dimrepeat('t{}') }} ] = entry   # then also write into the transposed entry
+{% else %}
+{{ indent(DIM) }}entry = asm.entry_impl({{ dimrepeat('i{}') }}, {{ dimrepeat('j{}') }})
 {{ indent(DIM) }}entries[{{ dimrepeat('mu{}') }}] = entry
 
 {{ indent(DIM) }}if symmetric:
-{{ indent(DIM) }}    if {{ dimrepeat('diag{} != 0', sep=' or ') }}:     # are we off the diagonal?
-{{ indent(DIM) }}        entries[ {{ dimrepeat('transp{0}[mu{0}]') }} ] = entry   # then also write into the transposed entry
+{{ indent(DIM) }}    if not ondiag{{DIM-1}}:     # are we off the diagonal?
+{{ indent(DIM) }}        entries[ {{ dimrepeat('t{}') }} ] = entry   # then also write into the transposed entry
+{% endif %}
+{% endmacro %}
+{{ scalar_kernel(False) }}
 
+{{ scalar_kernel(True) }}
 
-# helper function for fast low-rank assembler
+# helper function for fast low-rank assembler; calls entry_impl directly to
+# avoid the cpdef dispatch and the GIL release in entry() for every entry
 cdef double _entry_func_{{DIM}}d(size_t i, size_t j, void * data):
-    return (<BaseAssembler{{DIM}}D>data).entry(i, j)
+    cdef BaseAssembler{{DIM}}D asm = <BaseAssembler{{DIM}}D>data
+    cdef size_t[{{DIM}}] I, J
+    if asm.arity != 2:
+        return 0.0
+    from_seq{{DIM}}(i, asm.S1.ndofs, I)
+    from_seq{{DIM}}(j, asm.S0.ndofs, J)
+    return asm.entry_impl({{ dimrepeat('I[{}]') }}, {{ dimrepeat('J[{}]') }})
 
 
 
@@ -788,13 +1200,13 @@ cdef class BaseVectorAssembler{{DIM}}D:
     cdef inline void from_seq(self, size_t i, size_t[{{DIM + 1}}] out) nogil:
         out[{{DIM}}] = i % self.numcomp[0]
         i /= self.numcomp[0]
-        {%- for k in range(1, DIM)|reverse %}
+        {% for k in range(1, DIM)|reverse %}
         out[{{k}}] = i % self.S0.ndofs[{{k}}]
         i /= self.S0.ndofs[{{k}}]
-        {%- endfor %}
+        {% endfor %}
         out[0] = i
 
-    cdef void entry_impl(self, size_t[{{DIM}}] i, size_t[{{DIM}}] j, double result[]) nogil:
+    cdef void entry_impl(self, {{ dimrepeat('size_t i{}') }}, {{ dimrepeat('size_t j{}') }}, double result[]) nogil:
         pass
 
     @cython.boundscheck(False)
@@ -802,20 +1214,28 @@ cdef class BaseVectorAssembler{{DIM}}D:
     def assemble_vector(self):
         if self.arity != 1:
             return None
-        result = np.zeros(tuple(self.S0.ndofs) + (self.numcomp[0],), order='C')
-        cdef double[{{ dimrepeat(':') }}, ::1] _result = result
-        cdef double* out = &_result[ {{ dimrepeat('0') }}, 0 ]
-
-        cdef size_t[{{DIM}}] I, zero
-        {{ dimrepeat('zero[{}]', sep=' = ') }} = 0
+        # each component is stored as a contiguous grid (structure of arrays);
+        # the result is returned as a view with the components as the last axis
+        cdef size_t nc = self.numcomp[0]
+        result = np.empty((nc,) + tuple(self.S0.ndofs), order='C')
+        cdef double[:, {{ dimrepeat(':') }}:1] _result = result
+        cdef double* out = &_result[ 0, {{ dimrepeat('0') }} ]
+        cdef size_t stride = {{ dimrepeat('self.S0.ndofs[{}]', sep=' * ') }}
+        cdef double[::1] buf = np.empty(nc)
+        cdef size_t c
+
+        cdef size_t[{{DIM}}] I
         {{ dimrepeat('I[{}]', sep=' = ') }} = 0
         with nogil:
             while True:
-               self.entry_impl(I, <size_t*>0, out)
-               out += self.numcomp[0]
-               if not next_lexicographic{{DIM}}(I, zero, self.S0.ndofs):
-                   break
-        return result
+                for c in range(nc):
+                    buf[c] = 0.0
+                self.entry_impl({{ dimrepeat('I[{}]') }}, {{ dimrepeat('0') }}, &buf[0])
+                for c in range(nc):
+                    out[c * stride] = buf[c]
+                out += 1
+{{ inline_next_lex(indent(4)) }}
+        return np.moveaxis(result, 0, -1)
 
 
 @cython.boundscheck(False)
@@ -824,79 +1244,153 @@ def generic_assemble_core_vec_{{DIM}}d(BaseVectorAssembler{{DIM}}D asm, bidx, bi
     if asm.arity != 2:
         return None
     cdef unsigned[:, ::1] {{ dimrepeat('bidx{}') }}
-    cdef long {{ dimrepeat('mu{}') }}, {{ dimrepeat('MU{}') }}
+    cdef long {{ dimrepeat('mu{}') }}, {{ dimrepeat('MU{}') }}, flat
     cdef double[{{ dimrepeat(':') }}, ::1] entries
     cdef size_t[2] numcomp
 
     {{ dimrepeat('bidx{}') }} = bidx
     {{ dimrepeat('MU{}') }} = {{ dimrepeat('bidx{}.shape[0]') }}
 
+    # the kernels read row and column indices from separate contiguous arrays
+    cdef unsigned[::1] {{ dimrepeat('bidx{0}_i, bidx{0}_j') }}
+{% for k in range(DIM) %}
+    bidx{{k}}_i = np.ascontiguousarray(bidx[{{k}}][:, 0])
+    bidx{{k}}_j = np.ascontiguousarray(bidx[{{k}}][:, 1])
+{% endfor %}
+
     cdef size_t[::1] {{ dimrepeat('transp{}') }}
     if symmetric:
-    {%- for k in range(DIM) %}
+    {% for k in range(DIM) %}
         transp{{k}} = get_transpose_idx_for_bidx(bidx{{k}})
-    {%- endfor %}
+    {% endfor %}
     else:
         {{ dimrepeat('transp{}', sep=' = ') }} = None
+{{ block_lists() }}
 
     numcomp[:] = asm.num_components()
-    entries = np.zeros(({{ dimrepeat('MU{}') }}, numcomp[0]*numcomp[1]))
+    # every block is cleared by the kernel right before it is computed
+    entries = np.empty(({{ dimrepeat('MU{}') }}, numcomp[0]*numcomp[1]))
 
     cdef int num_threads = pyiga.get_max_threads()
 
-    for mu0 in prange(MU0, num_threads=num_threads, nogil=True):
-        _asm_core_vec_{{DIM}}d_kernel(asm, symmetric,
-            {{ dimrepeat('bidx{}') }},
-            {{ dimrepeat('transp{}') }},
-            numcomp,
-            entries,
-            mu0)
+    if symmetric:
+        for mu0 in prange(MU0, num_threads=num_threads, nogil=True, schedule='dynamic'):
+            _asm_core_vec_{{DIM}}d_kernel_sym(asm,
+                {{ dimrepeat('bidx{0}_i, bidx{0}_j') }},
+                {{ dimrepeat('transp{}') }},
+{{ block_list_args('                ') }}                numcomp,
+                entries,
+                mu0)
+    else:
+        # collapse the block loops into one flat parallel loop
+        for flat in prange({{ dimrepeat('MU{}', sep=' * ') }}, num_threads=num_threads, nogil=True):
+            _asm_core_vec_{{DIM}}d_kernel_nosym(asm,
+                {{ dimrepeat('bidx{0}_i, bidx{0}_j') }},
+                numcomp,
+                entries,
+                flat)
     return entries
 
+{# kernel for one row mu0 of blocks; the symmetric and the nonsymmetric
+   variant are emitted separately so that neither has runtime branches on
+   the symmetry flag #}
+{% macro vec_kernel(SYM) %}
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.initializedcheck(False)
-cdef void _asm_core_vec_{{DIM}}d_kernel(
+@cython.cdivision(True)
+cdef void _asm_core_vec_{{DIM}}d_kernel_{{ 'sym' if SYM else 'nosym' }}(
     BaseVectorAssembler{{DIM}}D asm,
-    bint symmetric,
-    {{ dimrepeat('unsigned[:, ::1] bidx{}') }},
+    {{ dimrepeat('unsigned[::1] bidx{0}_i, unsigned[::1] bidx{0}_j') }},
+{% if SYM %}
     {{ dimrepeat('size_t[::1] transp{}') }},
+{{ block_list_params() }}{% endif %}
     size_t[2] numcomp,
     double[{{ dimrepeat(':') }}, ::1] entries,
-    long _mu0
+    long {{ '_mu0' if SYM else '_flat' }}
 ) nogil:
-    cdef size_t[{{DIM}}] i, j
-    cdef int {{ dimrepeat('diag{}') }}
-    cdef long {{ dimrepeat('mu{}') }}, {{ dimrepeat('MU{}') }}
+    cdef size_t {{ dimrepeat('i{}') }}, {{ dimrepeat('j{}') }}
+{% if SYM %}
+    cdef int diag0
+    cdef bint {{ dimrepeat('ondiag{}') }}
     cdef int row, col
+    cdef double* dst
+    cdef size_t {{ dimrepeat('t{}') }}      # transposed block indices
+{% for k in range(1, DIM) %}
+    cdef size_t* blk{{k}}
+{% endfor %}
+    cdef size_t {{ dimrepeat('nblk{}', lower=1) }}, {{ dimrepeat('m{}', lower=1) }}
+{% endif %}
+    cdef long {{ dimrepeat('mu{}') }}, {{ dimrepeat('MU{}') }}
+    cdef double* src
+    # copy the component counts into locals; they cannot change across the
+    # opaque entry_impl() calls, which the compiler cannot know for numcomp[]
+    cdef size_t nc0 = numcomp[0], nc1 = numcomp[1], ncc = nc0 * nc1
+{% if SYM %}
 
     mu0 = _mu0
-    {{ dimrepeat('MU{}') }} = {{ dimrepeat('bidx{}.shape[0]') }}
+    {{ dimrepeat('MU{}') }} = {{ dimrepeat('bidx{}_i.shape[0]') }}
 
-    i[0] = bidx0[mu0, 0]
-    j[0] = bidx0[mu0, 1]
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
 
-    if symmetric:
-        diag0 = <int>j[0] - <int>i[0]
-        if diag0 > 0:       # block is above diagonal?
-            return
+    diag0 = <int>j0 - <int>i0
+    if diag0 > 0:       # block is above diagonal?
+        return
+    ondiag0 = (diag0 == 0)
+    t0 = transp0[mu0]
 {% for k in range(1, DIM) %}
-{{ indent(k)   }}for mu{{k}} in range(MU{{k}}):
-{{ indent(k)   }}    i[{{k}}] = bidx{{k}}[mu{{k}}, 0]
-{{ indent(k)   }}    j[{{k}}] = bidx{{k}}[mu{{k}}, 1]
 
-{{ indent(k)   }}    if symmetric:
-{{ indent(k)   }}        diag{{k}} = <int>j[{{k}}] - <int>i[{{k}}]
-{{ indent(k)   }}        if {{ dimrepeat('diag{} == 0', sep=' and ', upper=k) }} and diag{{k}} > 0:
-{{ indent(k)   }}            continue
+{{ indent(k)   }}if ondiag{{k-1}}:     # skip blocks above the diagonal
+{{ indent(k)   }}    blk{{k}} = &lower{{k}}[0]
+{{ indent(k)   }}    nblk{{k}} = lower{{k}}.shape[0]
+{{ indent(k)   }}else:
+{{ indent(k)   }}    blk{{k}} = &blocks{{k}}[0]
+{{ indent(k)   }}    nblk{{k}} = MU{{k}}
+{{ indent(k)   }}for m{{k}} in range(nblk{{k}}):
+{{ indent(k)   }}    mu{{k}} = blk{{k}}[m{{k}}]
+{{ indent(k)   }}    i{{k}} = bidx{{k}}_i[mu{{k}}]
+{{ indent(k)   }}    j{{k}} = bidx{{k}}_j[mu{{k}}]
+
+{{ indent(k)   }}    ondiag{{k}} = ondiag{{k-1}} & (j{{k}} == i{{k}})
+{{ indent(k)   }}    t{{k}} = transp{{k}}[mu{{k}}]
 {% endfor %}
-{{ indent(DIM) }}asm.entry_impl(i, j, &entries[ {{ dimrepeat('mu{}') }}, 0 ])
 
-{{ indent(DIM) }}if symmetric:
-{{ indent(DIM) }}    if {{ dimrepeat('diag{} != 0', sep=' or ') }}:     # are we off the diagonal?
-{{ indent(DIM) }}        for row in range(numcomp[1]):
-{{ indent(DIM) }}            for col in range(numcomp[0]):
-{{ indent(DIM) }}                entries[{{ dimrepeat('transp{0}[mu{0}]') }}, col*numcomp[0] + row] = entries[{{ dimrepeat('mu{}') }}, row*numcomp[0] + col]
+{{ indent(DIM) }}src = &entries[ {{ dimrepeat('mu{}') }}, 0 ]
+{{ indent(DIM) }}memset(src, 0, ncc * sizeof(double))
+{{ indent(DIM) }}asm.entry_impl({{ dimrepeat('i{}') }}, {{ dimrepeat('j{}') }}, src)
+
+{{ indent(DIM) }}if not ondiag{{DIM-1}}:     # are we off the diagonal?
+{{ indent(DIM) }}    # both blocks are contiguous; copy the transposed block through raw pointers
+{{ indent(DIM) }}    dst = &entries[ {{ dimrepeat('t{}') }}, 0 ]
+{{ indent(DIM) }}    for row in range(nc1):
+{{ indent(DIM) }}        for col in range(nc0):
+{{ indent(DIM) }}            dst[col*nc0 + row] = src[row*nc0 + col]
+{% else %}
+
+    # without symmetry, all blocks are independent; the caller runs a single
+    # flat loop over the whole block space and we decompose the flat index
+    # into the multi-index (mu0, ..., mu{{DIM-1}}) in C order
+    {{ dimrepeat('MU{}') }} = {{ dimrepeat('bidx{}_i.shape[0]') }}
+{% for k in range(DIM-1, 0, -1) %}
+    mu{{k}} = _flat % MU{{k}}
+    _flat = _flat // MU{{k}}
+{% endfor %}
+    mu0 = _flat
+
+{% for k in range(DIM) %}
+    i{{k}} = bidx{{k}}_i[mu{{k}}]
+    j{{k}} = bidx{{k}}_j[mu{{k}}]
+{% endfor %}
+
+    src = &entries[ {{ dimrepeat('mu{}') }}, 0 ]
+    memset(src, 0, ncc * sizeof(double))
+    asm.entry_impl({{ dimrepeat('i{}') }}, {{ dimrepeat('j{}') }}, src)
+{% endif %}
+{% endmacro %}
+{{ vec_kernel(True) }}
+
+{{ vec_kernel(False) }}
 
 ''')
 
@@ -904,8 +1398,8 @@ cdef void _asm_core_vec_{{DIM}}d_kernel(
 def generate_generic(dim):
     DIM = dim
 
-    def dimrepeat(s, sep=', ', upper=DIM):
-        return sep.join([s.format(k) for k in range(upper)])
+    def dimrepeat(s, sep=', ', upper=DIM, lower=0):
+        return sep.join([s.format(k) for k in range(lower, upper)])
 
     def indent(num):
         return num * '    ';
@@ -9,7 +9,7 @@ cdef struct SpaceInfo2:
     int[2] p
     ssize_t[:,::1] meshsupp0
     ssize_t[:,::1] meshsupp1
-    # 1D basis values. Indices: basis function, mesh point, derivative
+    # 1D basis values. Indices: basis function, derivative, mesh point
     double[:, :, ::1] C0
     double[:, :, ::1] C1
 
@@ -48,7 +48,7 @@ cdef class BaseAssembler2D:
         clear_spaceinfo2(self.S0)
         clear_spaceinfo2(self.S1)
 
-    cdef double entry_impl(self, size_t[2] i, size_t[2] j) nogil:
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t j0, size_t j1) nogil:
         return -9999.99  # Not implemented
 
     cpdef double entry1(self, size_t i):
@@ -58,7 +58,7 @@ cdef class BaseAssembler2D:
         cdef size_t[2] I, J
         with nogil:
             from_seq2(i, self.S0.ndofs, I)
-            return self.entry_impl(I, <size_t*>0)
+            return self.entry_impl(I[0], I[1], 0, 0)
 
     cpdef double entry(self, size_t i, size_t j):
         """Compute an entry of the matrix."""
@@ -68,20 +68,28 @@ cdef class BaseAssembler2D:
         with nogil:
             from_seq2(i, self.S1.ndofs, I)
             from_seq2(j, self.S0.ndofs, J)
-            return self.entry_impl(I, J)
+            return self.entry_impl(I[0], I[1], J[0], J[1])
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cdef void multi_entries_chunk(self, size_t[:,::1] idx_arr, double[::1] out) nogil:
+    cdef void multi_entries_chunk(self, size_t[:,::1] idx_arr, double[::1] out, size_t sta, size_t end) nogil:
+        """Compute the entries with indices `sta <= k < end` in `idx_arr`."""
         if self.arity != 2:
             return
         cdef size_t[2] I, J
         cdef size_t k
 
-        for k in range(idx_arr.shape[0]):
+        for k in range(sta, end):
             from_seq2(idx_arr[k,0], self.S1.ndofs, I)
             from_seq2(idx_arr[k,1], self.S0.ndofs, J)
-            out[k] = self.entry_impl(I, J)
+            out[k] = self.entry_impl(I[0], I[1], J[0], J[1])
+
+    @cython.cdivision(True)
+    cdef void multi_entries_parallel(self, size_t[:,::1] idx_arr, double[::1] out, int num_threads) nogil:
+        cdef size_t n = idx_arr.shape[0]
+        cdef int t
+        for t in prange(num_threads, num_threads=num_threads, schedule='static'):
+            self.multi_entries_chunk(idx_arr, out, t * n // num_threads, (t + 1) * n // num_threads)
 
     def multi_entries(self, indices):
         """Compute all entries given by `indices`.
@@ -100,22 +108,12 @@ cdef class BaseAssembler2D:
 
         cdef double[::1] result = np.empty(idx_arr.shape[0])
 
-        num_threads = pyiga.get_max_threads()
-        if num_threads <= 1:
-            self.multi_entries_chunk(idx_arr, result)
-        else:
-            thread_pool = get_thread_pool()
-
-            def asm_chunk(idxchunk, out):
-                cdef size_t[:, ::1] idxchunk_ = idxchunk
-                cdef double[::1] out_ = out
-                with nogil:
-                    self.multi_entries_chunk(idxchunk_, out_)
-
-            results = thread_pool.map(asm_chunk,
-                        chunk_tasks(idx_arr, num_threads),
-                        chunk_tasks(result, num_threads))
-            list(results)   # wait for threads to finish
+        cdef int num_threads = pyiga.get_max_threads()
+        with nogil:
+            if num_threads <= 1:
+                self.multi_entries_chunk(idx_arr, result, 0, idx_arr.shape[0])
+            else:
+                self.multi_entries_parallel(idx_arr, result, num_threads)
         return result
 
     @cython.boundscheck(False)
@@ -127,15 +125,18 @@ cdef class BaseAssembler2D:
         cdef double[:, ::1] _result = result
         cdef double* out = &_result[ 0, 0 ]
 
-        cdef size_t[2] I, zero
-        zero[0] = zero[1] = 0
+        cdef size_t[2] I
         I[0] = I[1] = 0
         with nogil:
             while True:
-               out[0] = self.entry_impl(I, <size_t*>0)
-               out += 1
-               if not next_lexicographic2(I, zero, self.S0.ndofs):
-                   break
+                out[0] = self.entry_impl(I[0], I[1], 0, 0)
+                out += 1
+                I[1] += 1
+                if I[1] == self.S0.ndofs[1]:
+                    I[1] = 0
+                    I[0] += 1
+                    if I[0] == self.S0.ndofs[0]:
+                        break
         return result
 
     def entry_func_ptr(self):
@@ -154,21 +155,92 @@ def generic_assemble_core_2d(BaseAssembler2D asm, bidx, bint symmetric=False):
     bidx0, bidx1 = bidx
     MU0, MU1 = bidx0.shape[0], bidx1.shape[0]
 
+    # the kernels read row and column indices from separate contiguous arrays
+    cdef unsigned[::1] bidx0_i, bidx0_j, bidx1_i, bidx1_j
+    bidx0_i = np.ascontiguousarray(bidx[0][:, 0])
+    bidx0_j = np.ascontiguousarray(bidx[0][:, 1])
+    bidx1_i = np.ascontiguousarray(bidx[1][:, 0])
+    bidx1_j = np.ascontiguousarray(bidx[1][:, 1])
+
     cdef size_t[::1] transp0, transp1
     if symmetric:
         transp0 = get_transpose_idx_for_bidx(bidx0)
         transp1 = get_transpose_idx_for_bidx(bidx1)
     else:
         transp0 = transp1 = None
+    cdef size_t[::1] blocks1 = np.arange(MU1, dtype=np.uintp)
+    cdef size_t[::1] lower1 = np.flatnonzero(bidx[1][:, 1] <= bidx[1][:, 0]).astype(np.uintp)
+
 
-    entries = np.zeros((MU0, MU1))
+    # every entry is written by the kernel, either directly or as a transposed entry
+    entries = np.empty((MU0, MU1))
 
     cdef int num_threads = pyiga.get_max_threads()
 
-    for mu0 in prange(MU0, num_threads=num_threads, nogil=True):
+    # rows of blocks differ in cost (in symmetric assembly, rows near the
+    # diagonal skip many blocks), so distribute them dynamically
+    for mu0 in prange(MU0, num_threads=num_threads, nogil=True, schedule='dynamic'):
         _asm_core_2d_kernel(asm, symmetric,
-            bidx0, bidx1,
+            bidx0_i, bidx0_j, bidx1_i, bidx1_j,
             transp0, transp1,
+            lower1, blocks1,
+            entries,
+            mu0)
+    return entries
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def generic_assemble_core_multi_2d(asms, bidx, bint symmetric=False):
+    """Assemble several bilinear forms over the same pair of spaces in a
+    single sweep over their common sparsity pattern.
+
+    Returns an array of entries whose first axis corresponds to `asms`.
+    """
+    cdef BaseAssembler2D asm
+    cdef vector[void*] asm_ptrs
+    for asm in asms:
+        if asm.arity != 2:
+            return None
+        asm_ptrs.push_back(<void*>asm)
+    cdef size_t num_asm = asm_ptrs.size()
+    if num_asm == 0:
+        return None
+    cdef void** asm_arr = &asm_ptrs[0]
+
+    cdef unsigned[:, ::1] bidx0, bidx1
+    cdef long mu0, mu1, MU0, MU1
+    cdef double[:, :, ::1] entries
+
+    bidx0, bidx1 = bidx
+    MU0, MU1 = bidx0.shape[0], bidx1.shape[0]
+
+    cdef unsigned[::1] bidx0_i, bidx0_j, bidx1_i, bidx1_j
+    bidx0_i = np.ascontiguousarray(bidx[0][:, 0])
+    bidx0_j = np.ascontiguousarray(bidx[0][:, 1])
+    bidx1_i = np.ascontiguousarray(bidx[1][:, 0])
+    bidx1_j = np.ascontiguousarray(bidx[1][:, 1])
+
+    cdef size_t[::1] transp0, transp1
+    if symmetric:
+        transp0 = get_transpose_idx_for_bidx(bidx0)
+        transp1 = get_transpose_idx_for_bidx(bidx1)
+    else:
+        transp0 = transp1 = None
+    cdef size_t[::1] blocks1 = np.arange(MU1, dtype=np.uintp)
+    cdef size_t[::1] lower1 = np.flatnonzero(bidx[1][:, 1] <= bidx[1][:, 0]).astype(np.uintp)
+
+
+    entries = np.empty((num_asm, MU0, MU1))
+
+    cdef int num_threads = pyiga.get_max_threads()
+
+    # rows of blocks differ in cost (in symmetric assembly, rows near the
+    # diagonal skip many blocks), so distribute them dynamically
+    for mu0 in prange(MU0, num_threads=num_threads, nogil=True, schedule='dynamic'):
+        _asm_core_multi_2d_kernel(asm_arr, num_asm, symmetric,
+            bidx0_i, bidx0_j, bidx1_i, bidx1_j,
+            transp0, transp1,
+            lower1, blocks1,
             entries,
             mu0)
     return entries
@@ -179,47 +251,131 @@ def generic_assemble_core_2d(BaseAssembler2D asm, bidx, bint symmetric=False):
 cdef void _asm_core_2d_kernel(
     BaseAssembler2D asm,
     bint symmetric,
-    unsigned[:, ::1] bidx0, unsigned[:, ::1] bidx1,
+    unsigned[::1] bidx0_i, unsigned[::1] bidx0_j, unsigned[::1] bidx1_i, unsigned[::1] bidx1_j,
     size_t[::1] transp0, size_t[::1] transp1,
+    size_t[::1] lower1, size_t[::1] blocks1,
     double[:, ::1] entries,
     long _mu0
 ) nogil:
-    cdef size_t[2] i, j
-    cdef int diag0, diag1
+    cdef size_t i0, i1, j0, j1
+    cdef int diag0
+    cdef bint ondiag0, ondiag1
     cdef double entry
     cdef long mu0, mu1, MU0, MU1
+    cdef size_t t0, t1      # transposed block indices
+    cdef size_t* blk1
+    cdef size_t nblk1, m1
 
     mu0 = _mu0
-    MU0, MU1 = bidx0.shape[0], bidx1.shape[0]
+    MU0, MU1 = bidx0_i.shape[0], bidx1_i.shape[0]
 
-    i[0] = bidx0[mu0, 0]
-    j[0] = bidx0[mu0, 1]
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
 
+    ondiag0 = ondiag1 = False
+    t0 = t1 = 0
     if symmetric:
-        diag0 = <int>j[0] - <int>i[0]
+        diag0 = <int>j0 - <int>i0
         if diag0 > 0:       # block is above diagonal?
             return
+        ondiag0 = (diag0 == 0)
+        t0 = transp0[mu0]
 
-    for mu1 in range(MU1):
-        i[1] = bidx1[mu1, 0]
-        j[1] = bidx1[mu1, 1]
+    if ondiag0:     # skip blocks above the diagonal
+        blk1 = &lower1[0]
+        nblk1 = lower1.shape[0]
+    else:
+        blk1 = &blocks1[0]
+        nblk1 = MU1
+    for m1 in range(nblk1):
+        mu1 = blk1[m1]
+        i1 = bidx1_i[mu1]
+        j1 = bidx1_j[mu1]
 
         if symmetric:
-            diag1 = <int>j[1] - <int>i[1]
-            if diag0 == 0 and diag1 > 0:
-                continue
+            ondiag1 = ondiag0 & (j1 == i1)
+            t1 = transp1[mu1]
 
-        entry = asm.entry_impl(i, j)
+        entry = asm.entry_impl(i0, i1, j0, j1)
         entries[mu0, mu1] = entry
 
         if symmetric:
-            if diag0 != 0 or diag1 != 0:     # are we off the diagonal?
-                entries[ transp0[mu0], transp1[mu1] ] = entry   # then also write into the transposed entry
+            if not ondiag1:     # are we off the diagonal?
+                entries[ t0, t1 ] = entry   # then also write into the transposed entry
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef void _asm_core_multi_2d_kernel(
+    void** asms,
+    size_t num_asm,
+    bint symmetric,
+    unsigned[::1] bidx0_i, unsigned[::1] bidx0_j, unsigned[::1] bidx1_i, unsigned[::1] bidx1_j,
+    size_t[::1] transp0, size_t[::1] transp1,
+    size_t[::1] lower1, size_t[::1] blocks1,
+    double[:, :, ::1] entries,
+    long _mu0
+) nogil:
+    cdef size_t i0, i1, j0, j1
+    cdef int diag0
+    cdef bint ondiag0, ondiag1
+    cdef double entry
+    cdef long mu0, mu1, MU0, MU1
+    cdef size_t t0, t1      # transposed block indices
+    cdef size_t* blk1
+    cdef size_t nblk1, m1
+    cdef size_t a
+
+    mu0 = _mu0
+    MU0, MU1 = bidx0_i.shape[0], bidx1_i.shape[0]
+
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
+
+    ondiag0 = ondiag1 = False
+    t0 = t1 = 0
+    if symmetric:
+        diag0 = <int>j0 - <int>i0
+        if diag0 > 0:       # block is above diagonal?
+            return
+        ondiag0 = (diag0 == 0)
+        t0 = transp0[mu0]
+
+    if ondiag0:     # skip blocks above the diagonal
+        blk1 = &lower1[0]
+        nblk1 = lower1.shape[0]
+    else:
+        blk1 = &blocks1[0]
+        nblk1 = MU1
+    for m1 in range(nblk1):
+        mu1 = blk1[m1]
+        i1 = bidx1_i[mu1]
+        j1 = bidx1_j[mu1]
+
+        if symmetric:
+            ondiag1 = ondiag0 & (j1 == i1)
+            t1 = transp1[mu1]
+
+        for a in range(num_asm):
+            entry = (<BaseAssembler2D>asms[a]).entry_impl(i0, i1, j0, j1)
+            entries[a, mu0, mu1] = entry
 
+            if symmetric:
+                if not ondiag1:     # are we off the diagonal?
+                    entries[ a, t0, t1 ] = entry   # then also write into the transposed entry
 
-# helper function for fast low-rank assembler
+
+# helper function for fast low-rank assembler; calls entry_impl directly to
+# avoid the cpdef dispatch and the GIL release in entry() for every entry
 cdef double _entry_func_2d(size_t i, size_t j, void * data):
-    return (<BaseAssembler2D>data).entry(i, j)
+    cdef BaseAssembler2D asm = <BaseAssembler2D>data
+    cdef size_t[2] I, J
+    if asm.arity != 2:
+        return 0.0
+    from_seq2(i, asm.S1.ndofs, I)
+    from_seq2(j, asm.S0.ndofs, J)
+    return asm.entry_impl(I[0], I[1], J[0], J[1])
 
 
 
@@ -256,7 +412,7 @@ cdef class BaseVectorAssembler2D:
         i /= self.S0.ndofs[1]
         out[0] = i
 
-    cdef void entry_impl(self, size_t[2] i, size_t[2] j, double result[]) nogil:
+    cdef void entry_impl(self, size_t i0, size_t i1, size_t j0, size_t j1, double result[]) nogil:
         pass
 
     @cython.boundscheck(False)
@@ -264,20 +420,33 @@ cdef class BaseVectorAssembler2D:
     def assemble_vector(self):
         if self.arity != 1:
             return None
-        result = np.zeros(tuple(self.S0.ndofs) + (self.numcomp[0],), order='C')
+        # each component is stored as a contiguous grid (structure of arrays);
+        # the result is returned as a view with the components as the last axis
+        cdef size_t nc = self.numcomp[0]
+        result = np.empty((nc,) + tuple(self.S0.ndofs), order='C')
         cdef double[:, :, ::1] _result = result
         cdef double* out = &_result[ 0, 0, 0 ]
+        cdef size_t stride = self.S0.ndofs[0] * self.S0.ndofs[1]
+        cdef double[::1] buf = np.empty(nc)
+        cdef size_t c
 
-        cdef size_t[2] I, zero
-        zero[0] = zero[1] = 0
+        cdef size_t[2] I
         I[0] = I[1] = 0
         with nogil:
             while True:
-               self.entry_impl(I, <size_t*>0, out)
-               out += self.numcomp[0]
-               if not next_lexicographic2(I, zero, self.S0.ndofs):
-                   break
-        return result
+                for c in range(nc):
+                    buf[c] = 0.0
+                self.entry_impl(I[0], I[1], 0, 0, &buf[0])
+                for c in range(nc):
+                    out[c * stride] = buf[c]
+                out += 1
+                I[1] += 1
+                if I[1] == self.S0.ndofs[1]:
+                    I[1] = 0
+                    I[0] += 1
+                    if I[0] == self.S0.ndofs[0]:
+                        break
+        return np.moveaxis(result, 0, -1)
 
 
 @cython.boundscheck(False)
@@ -286,78 +455,155 @@ def generic_assemble_core_vec_2d(BaseVectorAssembler2D asm, bidx, bint symmetric
     if asm.arity != 2:
         return None
     cdef unsigned[:, ::1] bidx0, bidx1
-    cdef long mu0, mu1, MU0, MU1
+    cdef long mu0, mu1, MU0, MU1, flat
     cdef double[:, :, ::1] entries
     cdef size_t[2] numcomp
 
     bidx0, bidx1 = bidx
     MU0, MU1 = bidx0.shape[0], bidx1.shape[0]
 
+    # the kernels read row and column indices from separate contiguous arrays
+    cdef unsigned[::1] bidx0_i, bidx0_j, bidx1_i, bidx1_j
+    bidx0_i = np.ascontiguousarray(bidx[0][:, 0])
+    bidx0_j = np.ascontiguousarray(bidx[0][:, 1])
+    bidx1_i = np.ascontiguousarray(bidx[1][:, 0])
+    bidx1_j = np.ascontiguousarray(bidx[1][:, 1])
+
     cdef size_t[::1] transp0, transp1
     if symmetric:
         transp0 = get_transpose_idx_for_bidx(bidx0)
         transp1 = get_transpose_idx_for_bidx(bidx1)
     else:
         transp0 = transp1 = None
+    cdef size_t[::1] blocks1 = np.arange(MU1, dtype=np.uintp)
+    cdef size_t[::1] lower1 = np.flatnonzero(bidx[1][:, 1] <= bidx[1][:, 0]).astype(np.uintp)
+
 
     numcomp[:] = asm.num_components()
-    entries = np.zeros((MU0, MU1, numcomp[0]*numcomp[1]))
+    # every block is cleared by the kernel right before it is computed
+    entries = np.empty((MU0, MU1, numcomp[0]*numcomp[1]))
 
     cdef int num_threads = pyiga.get_max_threads()
 
-    for mu0 in prange(MU0, num_threads=num_threads, nogil=True):
-        _asm_core_vec_2d_kernel(asm, symmetric,
-            bidx0, bidx1,
-            transp0, transp1,
-            numcomp,
-            entries,
-            mu0)
+    if symmetric:
+        for mu0 in prange(MU0, num_threads=num_threads, nogil=True, schedule='dynamic'):
+            _asm_core_vec_2d_kernel_sym(asm,
+                bidx0_i, bidx0_j, bidx1_i, bidx1_j,
+                transp0, transp1,
+                lower1, blocks1,
+                numcomp,
+                entries,
+                mu0)
+    else:
+        # collapse the block loops into one flat parallel loop
+        for flat in prange(MU0 * MU1, num_threads=num_threads, nogil=True):
+            _asm_core_vec_2d_kernel_nosym(asm,
+                bidx0_i, bidx0_j, bidx1_i, bidx1_j,
+                numcomp,
+                entries,
+                flat)
     return entries
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.initializedcheck(False)
-cdef void _asm_core_vec_2d_kernel(
+@cython.cdivision(True)
+cdef void _asm_core_vec_2d_kernel_sym(
     BaseVectorAssembler2D asm,
-    bint symmetric,
-    unsigned[:, ::1] bidx0, unsigned[:, ::1] bidx1,
+    unsigned[::1] bidx0_i, unsigned[::1] bidx0_j, unsigned[::1] bidx1_i, unsigned[::1] bidx1_j,
     size_t[::1] transp0, size_t[::1] transp1,
+    size_t[::1] lower1, size_t[::1] blocks1,
     size_t[2] numcomp,
     double[:, :, ::1] entries,
     long _mu0
 ) nogil:
-    cdef size_t[2] i, j
-    cdef int diag0, diag1
-    cdef long mu0, mu1, MU0, MU1
+    cdef size_t i0, i1, j0, j1
+    cdef int diag0
+    cdef bint ondiag0, ondiag1
     cdef int row, col
+    cdef double* dst
+    cdef size_t t0, t1      # transposed block indices
+    cdef size_t* blk1
+    cdef size_t nblk1, m1
+    cdef long mu0, mu1, MU0, MU1
+    cdef double* src
+    # copy the component counts into locals; they cannot change across the
+    # opaque entry_impl() calls, which the compiler cannot know for numcomp[]
+    cdef size_t nc0 = numcomp[0], nc1 = numcomp[1], ncc = nc0 * nc1
 
     mu0 = _mu0
-    MU0, MU1 = bidx0.shape[0], bidx1.shape[0]
+    MU0, MU1 = bidx0_i.shape[0], bidx1_i.shape[0]
 
-    i[0] = bidx0[mu0, 0]
-    j[0] = bidx0[mu0, 1]
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
 
-    if symmetric:
-        diag0 = <int>j[0] - <int>i[0]
-        if diag0 > 0:       # block is above diagonal?
-            return
+    diag0 = <int>j0 - <int>i0
+    if diag0 > 0:       # block is above diagonal?
+        return
+    ondiag0 = (diag0 == 0)
+    t0 = transp0[mu0]
 
-    for mu1 in range(MU1):
-        i[1] = bidx1[mu1, 0]
-        j[1] = bidx1[mu1, 1]
+    if ondiag0:     # skip blocks above the diagonal
+        blk1 = &lower1[0]
+        nblk1 = lower1.shape[0]
+    else:
+        blk1 = &blocks1[0]
+        nblk1 = MU1
+    for m1 in range(nblk1):
+        mu1 = blk1[m1]
+        i1 = bidx1_i[mu1]
+        j1 = bidx1_j[mu1]
 
-        if symmetric:
-            diag1 = <int>j[1] - <int>i[1]
-            if diag0 == 0 and diag1 > 0:
-                continue
+        ondiag1 = ondiag0 & (j1 == i1)
+        t1 = transp1[mu1]
 
-        asm.entry_impl(i, j, &entries[ mu0, mu1, 0 ])
+        src = &entries[ mu0, mu1, 0 ]
+        memset(src, 0, ncc * sizeof(double))
+        asm.entry_impl(i0, i1, j0, j1, src)
+
+        if not ondiag1:     # are we off the diagonal?
+            # both blocks are contiguous; copy the transposed block through raw pointers
+            dst = &entries[ t0, t1, 0 ]
+            for row in range(nc1):
+                for col in range(nc0):
+                    dst[col*nc0 + row] = src[row*nc0 + col]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+@cython.cdivision(True)
+cdef void _asm_core_vec_2d_kernel_nosym(
+    BaseVectorAssembler2D asm,
+    unsigned[::1] bidx0_i, unsigned[::1] bidx0_j, unsigned[::1] bidx1_i, unsigned[::1] bidx1_j,
+    size_t[2] numcomp,
+    double[:, :, ::1] entries,
+    long _flat
+) nogil:
+    cdef size_t i0, i1, j0, j1
+    cdef long mu0, mu1, MU0, MU1
+    cdef double* src
+    # copy the component counts into locals; they cannot change across the
+    # opaque entry_impl() calls, which the compiler cannot know for numcomp[]
+    cdef size_t nc0 = numcomp[0], nc1 = numcomp[1], ncc = nc0 * nc1
+
+    # without symmetry, all blocks are independent; the caller runs a single
+    # flat loop over the whole block space and we decompose the flat index
+    # into the multi-index (mu0, ..., mu1) in C order
+    MU0, MU1 = bidx0_i.shape[0], bidx1_i.shape[0]
+    mu1 = _flat % MU1
+    _flat = _flat // MU1
+    mu0 = _flat
+
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
+    i1 = bidx1_i[mu1]
+    j1 = bidx1_j[mu1]
+
+    src = &entries[ mu0, mu1, 0 ]
+    memset(src, 0, ncc * sizeof(double))
+    asm.entry_impl(i0, i1, j0, j1, src)
 
-        if symmetric:
-            if diag0 != 0 or diag1 != 0:     # are we off the diagonal?
-                for row in range(numcomp[1]):
-                    for col in range(numcomp[0]):
-                        entries[transp0[mu0], transp1[mu1], col*numcomp[0] + row] = entries[mu0, mu1, row*numcomp[0] + col]
 
 ################################################################################
 # 3D Assemblers
@@ -369,7 +615,7 @@ cdef struct SpaceInfo3:
     ssize_t[:,::1] meshsupp0
     ssize_t[:,::1] meshsupp1
     ssize_t[:,::1] meshsupp2
-    # 1D basis values. Indices: basis function, mesh point, derivative
+    # 1D basis values. Indices: basis function, derivative, mesh point
     double[:, :, ::1] C0
     double[:, :, ::1] C1
     double[:, :, ::1] C2
@@ -412,7 +658,7 @@ cdef class BaseAssembler3D:
         clear_spaceinfo3(self.S0)
         clear_spaceinfo3(self.S1)
 
-    cdef double entry_impl(self, size_t[3] i, size_t[3] j) nogil:
+    cdef double entry_impl(self, size_t i0, size_t i1, size_t i2, size_t j0, size_t j1, size_t j2) nogil:
         return -9999.99  # Not implemented
 
     cpdef double entry1(self, size_t i):
@@ -422,7 +668,7 @@ cdef class BaseAssembler3D:
         cdef size_t[3] I, J
         with nogil:
             from_seq3(i, self.S0.ndofs, I)
-            return self.entry_impl(I, <size_t*>0)
+            return self.entry_impl(I[0], I[1], I[2], 0, 0, 0)
 
     cpdef double entry(self, size_t i, size_t j):
         """Compute an entry of the matrix."""
@@ -432,20 +678,28 @@ cdef class BaseAssembler3D:
         with nogil:
             from_seq3(i, self.S1.ndofs, I)
             from_seq3(j, self.S0.ndofs, J)
-            return self.entry_impl(I, J)
+            return self.entry_impl(I[0], I[1], I[2], J[0], J[1], J[2])
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cdef void multi_entries_chunk(self, size_t[:,::1] idx_arr, double[::1] out) nogil:
+    cdef void multi_entries_chunk(self, size_t[:,::1] idx_arr, double[::1] out, size_t sta, size_t end) nogil:
+        """Compute the entries with indices `sta <= k < end` in `idx_arr`."""
         if self.arity != 2:
             return
         cdef size_t[3] I, J
         cdef size_t k
 
-        for k in range(idx_arr.shape[0]):
+        for k in range(sta, end):
             from_seq3(idx_arr[k,0], self.S1.ndofs, I)
             from_seq3(idx_arr[k,1], self.S0.ndofs, J)
-            out[k] = self.entry_impl(I, J)
+            out[k] = self.entry_impl(I[0], I[1], I[2], J[0], J[1], J[2])
+
+    @cython.cdivision(True)
+    cdef void multi_entries_parallel(self, size_t[:,::1] idx_arr, double[::1] out, int num_threads) nogil:
+        cdef size_t n = idx_arr.shape[0]
+        cdef int t
+        for t in prange(num_threads, num_threads=num_threads, schedule='static'):
+            self.multi_entries_chunk(idx_arr, out, t * n // num_threads, (t + 1) * n // num_threads)
 
     def multi_entries(self, indices):
         """Compute all entries given by `indices`.
@@ -464,22 +718,12 @@ cdef class BaseAssembler3D:
 
         cdef double[::1] result = np.empty(idx_arr.shape[0])
 
-        num_threads = pyiga.get_max_threads()
-        if num_threads <= 1:
-            self.multi_entries_chunk(idx_arr, result)
-        else:
-            thread_pool = get_thread_pool()
-
-            def asm_chunk(idxchunk, out):
-                cdef size_t[:, ::1] idxchunk_ = idxchunk
-                cdef double[::1] out_ = out
-                with nogil:
-                    self.multi_entries_chunk(idxchunk_, out_)
-
-            results = thread_pool.map(asm_chunk,
-                        chunk_tasks(idx_arr, num_threads),
-                        chunk_tasks(result, num_threads))
-            list(results)   # wait for threads to finish
+        cdef int num_threads = pyiga.get_max_threads()
+        with nogil:
+            if num_threads <= 1:
+                self.multi_entries_chunk(idx_arr, result, 0, idx_arr.shape[0])
+            else:
+                self.multi_entries_parallel(idx_arr, result, num_threads)
         return result
 
     @cython.boundscheck(False)
@@ -491,15 +735,21 @@ cdef class BaseAssembler3D:
         cdef double[:, :, ::1] _result = result
         cdef double* out = &_result[ 0, 0, 0 ]
 
-        cdef size_t[3] I, zero
-        zero[0] = zero[1] = zero[2] = 0
+        cdef size_t[3] I
         I[0] = I[1] = I[2] = 0
         with nogil:
             while True:
-               out[0] = self.entry_impl(I, <size_t*>0)
-               out += 1
-               if not next_lexicographic3(I, zero, self.S0.ndofs):
-                   break
+                out[0] = self.entry_impl(I[0], I[1], I[2], 0, 0, 0)
+                out += 1
+                I[2] += 1
+                if I[2] == self.S0.ndofs[2]:
+                    I[2] = 0
+                    I[1] += 1
+                    if I[1] == self.S0.ndofs[1]:
+                        I[1] = 0
+                        I[0] += 1
+                        if I[0] == self.S0.ndofs[0]:
+                            break
         return result
 
     def entry_func_ptr(self):
@@ -518,6 +768,15 @@ def generic_assemble_core_3d(BaseAssembler3D asm, bidx, bint symmetric=False):
     bidx0, bidx1, bidx2 = bidx
     MU0, MU1, MU2 = bidx0.shape[0], bidx1.shape[0], bidx2.shape[0]
 
+    # the kernels read row and column indices from separate contiguous arrays
+    cdef unsigned[::1] bidx0_i, bidx0_j, bidx1_i, bidx1_j, bidx2_i, bidx2_j
+    bidx0_i = np.ascontiguousarray(bidx[0][:, 0])
+    bidx0_j = np.ascontiguousarray(bidx[0][:, 1])
+    bidx1_i = np.ascontiguousarray(bidx[1][:, 0])
+    bidx1_j = np.ascontiguousarray(bidx[1][:, 1])
+    bidx2_i = np.ascontiguousarray(bidx[2][:, 0])
+    bidx2_j = np.ascontiguousarray(bidx[2][:, 1])
+
     cdef size_t[::1] transp0, transp1, transp2
     if symmetric:
         transp0 = get_transpose_idx_for_bidx(bidx0)
@@ -525,15 +784,88 @@ def generic_assemble_core_3d(BaseAssembler3D asm, bidx, bint symmetric=False):
         transp2 = get_transpose_idx_for_bidx(bidx2)
     else:
         transp0 = transp1 = transp2 = None
+    cdef size_t[::1] blocks1 = np.arange(MU1, dtype=np.uintp)
+    cdef size_t[::1] lower1 = np.flatnonzero(bidx[1][:, 1] <= bidx[1][:, 0]).astype(np.uintp)
+    cdef size_t[::1] blocks2 = np.arange(MU2, dtype=np.uintp)
+    cdef size_t[::1] lower2 = np.flatnonzero(bidx[2][:, 1] <= bidx[2][:, 0]).astype(np.uintp)
 
-    entries = np.zeros((MU0, MU1, MU2))
+
+    # every entry is written by the kernel, either directly or as a transposed entry
+    entries = np.empty((MU0, MU1, MU2))
 
     cdef int num_threads = pyiga.get_max_threads()
 
-    for mu0 in prange(MU0, num_threads=num_threads, nogil=True):
+    # rows of blocks differ in cost (in symmetric assembly, rows near the
+    # diagonal skip many blocks), so distribute them dynamically
+    for mu0 in prange(MU0, num_threads=num_threads, nogil=True, schedule='dynamic'):
         _asm_core_3d_kernel(asm, symmetric,
-            bidx0, bidx1, bidx2,
+            bidx0_i, bidx0_j, bidx1_i, bidx1_j, bidx2_i, bidx2_j,
             transp0, transp1, transp2,
+            lower1, blocks1,
+            lower2, blocks2,
+            entries,
+            mu0)
+    return entries
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def generic_assemble_core_multi_3d(asms, bidx, bint symmetric=False):
+    """Assemble several bilinear forms over the same pair of spaces in a
+    single sweep over their common sparsity pattern.
+
+    Returns an array of entries whose first axis corresponds to `asms`.
+    """
+    cdef BaseAssembler3D asm
+    cdef vector[void*] asm_ptrs
+    for asm in asms:
+        if asm.arity != 2:
+            return None
+        asm_ptrs.push_back(<void*>asm)
+    cdef size_t num_asm = asm_ptrs.size()
+    if num_asm == 0:
+        return None
+    cdef void** asm_arr = &asm_ptrs[0]
+
+    cdef unsigned[:, ::1] bidx0, bidx1, bidx2
+    cdef long mu0, mu1, mu2, MU0, MU1, MU2
+    cdef double[:, :, :, ::1] entries
+
+    bidx0, bidx1, bidx2 = bidx
+    MU0, MU1, MU2 = bidx0.shape[0], bidx1.shape[0], bidx2.shape[0]
+
+    cdef unsigned[::1] bidx0_i, bidx0_j, bidx1_i, bidx1_j, bidx2_i, bidx2_j
+    bidx0_i = np.ascontiguousarray(bidx[0][:, 0])
+    bidx0_j = np.ascontiguousarray(bidx[0][:, 1])
+    bidx1_i = np.ascontiguousarray(bidx[1][:, 0])
+    bidx1_j = np.ascontiguousarray(bidx[1][:, 1])
+    bidx2_i = np.ascontiguousarray(bidx[2][:, 0])
+    bidx2_j = np.ascontiguousarray(bidx[2][:, 1])
+
+    cdef size_t[::1] transp0, transp1, transp2
+    if symmetric:
+        transp0 = get_transpose_idx_for_bidx(bidx0)
+        transp1 = get_transpose_idx_for_bidx(bidx1)
+        transp2 = get_transpose_idx_for_bidx(bidx2)
+    else:
+        transp0 = transp1 = transp2 = None
+    cdef size_t[::1] blocks1 = np.arange(MU1, dtype=np.uintp)
+    cdef size_t[::1] lower1 = np.flatnonzero(bidx[1][:, 1] <= bidx[1][:, 0]).astype(np.uintp)
+    cdef size_t[::1] blocks2 = np.arange(MU2, dtype=np.uintp)
+    cdef size_t[::1] lower2 = np.flatnonzero(bidx[2][:, 1] <= bidx[2][:, 0]).astype(np.uintp)
+
+
+    entries = np.empty((num_asm, MU0, MU1, MU2))
+
+    cdef int num_threads = pyiga.get_max_threads()
+
+    # rows of blocks differ in cost (in symmetric assembly, rows near the
+    # diagonal skip many blocks), so distribute them dynamically
+    for mu0 in prange(MU0, num_threads=num_threads, nogil=True, schedule='dynamic'):
+        _asm_core_multi_3d_kernel(asm_arr, num_asm, symmetric,
+            bidx0_i, bidx0_j, bidx1_i, bidx1_j, bidx2_i, bidx2_j,
+            transp0, transp1, transp2,
+            lower1, blocks1,
+            lower2, blocks2,
             entries,
             mu0)
     return entries
@@ -544,56 +876,165 @@ def generic_assemble_core_3d(BaseAssembler3D asm, bidx, bint symmetric=False):
 cdef void _asm_core_3d_kernel(
     BaseAssembler3D asm,
     bint symmetric,
-    unsigned[:, ::1] bidx0, unsigned[:, ::1] bidx1, unsigned[:, ::1] bidx2,
+    unsigned[::1] bidx0_i, unsigned[::1] bidx0_j, unsigned[::1] bidx1_i, unsigned[::1] bidx1_j, unsigned[::1] bidx2_i, unsigned[::1] bidx2_j,
     size_t[::1] transp0, size_t[::1] transp1, size_t[::1] transp2,
+    size_t[::1] lower1, size_t[::1] blocks1,
+    size_t[::1] lower2, size_t[::1] blocks2,
     double[:, :, ::1] entries,
     long _mu0
 ) nogil:
-    cdef size_t[3] i, j
-    cdef int diag0, diag1, diag2
+    cdef size_t i0, i1, i2, j0, j1, j2
+    cdef int diag0
+    cdef bint ondiag0, ondiag1, ondiag2
     cdef double entry
     cdef long mu0, mu1, mu2, MU0, MU1, MU2
+    cdef size_t t0, t1, t2      # transposed block indices
+    cdef size_t* blk1
+    cdef size_t* blk2
+    cdef size_t nblk1, nblk2, m1, m2
 
     mu0 = _mu0
-    MU0, MU1, MU2 = bidx0.shape[0], bidx1.shape[0], bidx2.shape[0]
+    MU0, MU1, MU2 = bidx0_i.shape[0], bidx1_i.shape[0], bidx2_i.shape[0]
 
-    i[0] = bidx0[mu0, 0]
-    j[0] = bidx0[mu0, 1]
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
 
+    ondiag0 = ondiag1 = ondiag2 = False
+    t0 = t1 = t2 = 0
     if symmetric:
-        diag0 = <int>j[0] - <int>i[0]
+        diag0 = <int>j0 - <int>i0
         if diag0 > 0:       # block is above diagonal?
             return
+        ondiag0 = (diag0 == 0)
+        t0 = transp0[mu0]
 
-    for mu1 in range(MU1):
-        i[1] = bidx1[mu1, 0]
-        j[1] = bidx1[mu1, 1]
+    if ondiag0:     # skip blocks above the diagonal
+        blk1 = &lower1[0]
+        nblk1 = lower1.shape[0]
+    else:
+        blk1 = &blocks1[0]
+        nblk1 = MU1
+    for m1 in range(nblk1):
+        mu1 = blk1[m1]
+        i1 = bidx1_i[mu1]
+        j1 = bidx1_j[mu1]
 
         if symmetric:
-            diag1 = <int>j[1] - <int>i[1]
-            if diag0 == 0 and diag1 > 0:
-                continue
+            ondiag1 = ondiag0 & (j1 == i1)
+            t1 = transp1[mu1]
 
-        for mu2 in range(MU2):
-            i[2] = bidx2[mu2, 0]
-            j[2] = bidx2[mu2, 1]
+        if ondiag1:     # skip blocks above the diagonal
+            blk2 = &lower2[0]
+            nblk2 = lower2.shape[0]
+        else:
+            blk2 = &blocks2[0]
+            nblk2 = MU2
+        for m2 in range(nblk2):
+            mu2 = blk2[m2]
+            i2 = bidx2_i[mu2]
+            j2 = bidx2_j[mu2]
 
             if symmetric:
-                diag2 = <int>j[2] - <int>i[2]
-                if diag0 == 0 and diag1 == 0 and diag2 > 0:
-                    continue
+                ondiag2 = ondiag1 & (j2 == i2)
+                t2 = transp2[mu2]
 
-            entry = asm.entry_impl(i, j)
+            entry = asm.entry_impl(i0, i1, i2, j0, j1, j2)
             entries[mu0, mu1, mu2] = entry
 
             if symmetric:
-                if diag0 != 0 or diag1 != 0 or diag2 != 0:     # are we off the diagonal?
-                    entries[ transp0[mu0], transp1[mu1], transp2[mu2] ] = entry   # then also write into the transposed entry
+                if not ondiag2:     # are we off the diagonal?
+                    entries[ t0, t1, t2 ] = entry   # then also write into the transposed entry
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+cdef void _asm_core_multi_3d_kernel(
+    void** asms,
+    size_t num_asm,
+    bint symmetric,
+    unsigned[::1] bidx0_i, unsigned[::1] bidx0_j, unsigned[::1] bidx1_i, unsigned[::1] bidx1_j, unsigned[::1] bidx2_i, unsigned[::1] bidx2_j,
+    size_t[::1] transp0, size_t[::1] transp1, size_t[::1] transp2,
+    size_t[::1] lower1, size_t[::1] blocks1,
+    size_t[::1] lower2, size_t[::1] blocks2,
+    double[:, :, :, ::1] entries,
+    long _mu0
+) nogil:
+    cdef size_t i0, i1, i2, j0, j1, j2
+    cdef int diag0
+    cdef bint ondiag0, ondiag1, ondiag2
+    cdef double entry
+    cdef long mu0, mu1, mu2, MU0, MU1, MU2
+    cdef size_t t0, t1, t2      # transposed block indices
+    cdef size_t* blk1
+    cdef size_t* blk2
+    cdef size_t nblk1, nblk2, m1, m2
+    cdef size_t a
+
+    mu0 = _mu0
+    MU0, MU1, MU2 = bidx0_i.shape[0], bidx1_i.shape[0], bidx2_i.shape[0]
+
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
+
+    ondiag0 = ondiag1 = ondiag2 = False
+    t0 = t1 = t2 = 0
+    if symmetric:
+        diag0 = <int>j0 - <int>i0
+        if diag0 > 0:       # block is above diagonal?
+            return
+        ondiag0 = (diag0 == 0)
+        t0 = transp0[mu0]
+
+    if ondiag0:     # skip blocks above the diagonal
+        blk1 = &lower1[0]
+        nblk1 = lower1.shape[0]
+    else:
+        blk1 = &blocks1[0]
+        nblk1 = MU1
+    for m1 in range(nblk1):
+        mu1 = blk1[m1]
+        i1 = bidx1_i[mu1]
+        j1 = bidx1_j[mu1]
+
+        if symmetric:
+            ondiag1 = ondiag0 & (j1 == i1)
+            t1 = transp1[mu1]
+
+        if ondiag1:     # skip blocks above the diagonal
+            blk2 = &lower2[0]
+            nblk2 = lower2.shape[0]
+        else:
+            blk2 = &blocks2[0]
+            nblk2 = MU2
+        for m2 in range(nblk2):
+            mu2 = blk2[m2]
+            i2 = bidx2_i[mu2]
+            j2 = bidx2_j[mu2]
+
+            if symmetric:
+                ondiag2 = ondiag1 & (j2 == i2)
+                t2 = transp2[mu2]
 
+            for a in range(num_asm):
+                entry = (<BaseAssembler3D>asms[a]).entry_impl(i0, i1, i2, j0, j1, j2)
+                entries[a, mu0, mu1, mu2] = entry
 
-# helper function for fast low-rank assembler
+                if symmetric:
+                    if not ondiag2:     # are we off the diagonal?
+                        entries[ a, t0, t1, t2 ] = entry   # then also write into the transposed entry
+
+
+# helper function for fast low-rank assembler; calls entry_impl directly to
+# avoid the cpdef dispatch and the GIL release in entry() for every entry
 cdef double _entry_func_3d(size_t i, size_t j, void * data):
-    return (<BaseAssembler3D>data).entry(i, j)
+    cdef BaseAssembler3D asm = <BaseAssembler3D>data
+    cdef size_t[3] I, J
+    if asm.arity != 2:
+        return 0.0
+    from_seq3(i, asm.S1.ndofs, I)
+    from_seq3(j, asm.S0.ndofs, J)
+    return asm.entry_impl(I[0], I[1], I[2], J[0], J[1], J[2])
 
 
 
@@ -632,7 +1073,7 @@ cdef class BaseVectorAssembler3D:
         i /= self.S0.ndofs[1]
         out[0] = i
 
-    cdef void entry_impl(self, size_t[3] i, size_t[3] j, double result[]) nogil:
+    cdef void entry_impl(self, size_t i0, size_t i1, size_t i2, size_t j0, size_t j1, size_t j2, double result[]) nogil:
         pass
 
     @cython.boundscheck(False)
@@ -640,20 +1081,36 @@ cdef class BaseVectorAssembler3D:
     def assemble_vector(self):
         if self.arity != 1:
             return None
-        result = np.zeros(tuple(self.S0.ndofs) + (self.numcomp[0],), order='C')
+        # each component is stored as a contiguous grid (structure of arrays);
+        # the result is returned as a view with the components as the last axis
+        cdef size_t nc = self.numcomp[0]
+        result = np.empty((nc,) + tuple(self.S0.ndofs), order='C')
         cdef double[:, :, :, ::1] _result = result
         cdef double* out = &_result[ 0, 0, 0, 0 ]
+        cdef size_t stride = self.S0.ndofs[0] * self.S0.ndofs[1] * self.S0.ndofs[2]
+        cdef double[::1] buf = np.empty(nc)
+        cdef size_t c
 
-        cdef size_t[3] I, zero
-        zero[0] = zero[1] = zero[2] = 0
+        cdef size_t[3] I
         I[0] = I[1] = I[2] = 0
         with nogil:
             while True:
-               self.entry_impl(I, <size_t*>0, out)
-               out += self.numcomp[0]
-               if not next_lexicographic3(I, zero, self.S0.ndofs):
-                   break
-        return result
+                for c in range(nc):
+                    buf[c] = 0.0
+                self.entry_impl(I[0], I[1], I[2], 0, 0, 0, &buf[0])
+                for c in range(nc):
+                    out[c * stride] = buf[c]
+                out += 1
+                I[2] += 1
+                if I[2] == self.S0.ndofs[2]:
+                    I[2] = 0
+                    I[1] += 1
+                    if I[1] == self.S0.ndofs[1]:
+                        I[1] = 0
+                        I[0] += 1
+                        if I[0] == self.S0.ndofs[0]:
+                            break
+        return np.moveaxis(result, 0, -1)
 
 
 @cython.boundscheck(False)
@@ -662,13 +1119,22 @@ def generic_assemble_core_vec_3d(BaseVectorAssembler3D asm, bidx, bint symmetric
     if asm.arity != 2:
         return None
     cdef unsigned[:, ::1] bidx0, bidx1, bidx2
-    cdef long mu0, mu1, mu2, MU0, MU1, MU2
+    cdef long mu0, mu1, mu2, MU0, MU1, MU2, flat
     cdef double[:, :, :, ::1] entries
     cdef size_t[2] numcomp
 
     bidx0, bidx1, bidx2 = bidx
     MU0, MU1, MU2 = bidx0.shape[0], bidx1.shape[0], bidx2.shape[0]
 
+    # the kernels read row and column indices from separate contiguous arrays
+    cdef unsigned[::1] bidx0_i, bidx0_j, bidx1_i, bidx1_j, bidx2_i, bidx2_j
+    bidx0_i = np.ascontiguousarray(bidx[0][:, 0])
+    bidx0_j = np.ascontiguousarray(bidx[0][:, 1])
+    bidx1_i = np.ascontiguousarray(bidx[1][:, 0])
+    bidx1_j = np.ascontiguousarray(bidx[1][:, 1])
+    bidx2_i = np.ascontiguousarray(bidx[2][:, 0])
+    bidx2_j = np.ascontiguousarray(bidx[2][:, 1])
+
     cdef size_t[::1] transp0, transp1, transp2
     if symmetric:
         transp0 = get_transpose_idx_for_bidx(bidx0)
@@ -676,71 +1142,155 @@ def generic_assemble_core_vec_3d(BaseVectorAssembler3D asm, bidx, bint symmetric
         transp2 = get_transpose_idx_for_bidx(bidx2)
     else:
         transp0 = transp1 = transp2 = None
+    cdef size_t[::1] blocks1 = np.arange(MU1, dtype=np.uintp)
+    cdef size_t[::1] lower1 = np.flatnonzero(bidx[1][:, 1] <= bidx[1][:, 0]).astype(np.uintp)
+    cdef size_t[::1] blocks2 = np.arange(MU2, dtype=np.uintp)
+    cdef size_t[::1] lower2 = np.flatnonzero(bidx[2][:, 1] <= bidx[2][:, 0]).astype(np.uintp)
+
 
     numcomp[:] = asm.num_components()
-    entries = np.zeros((MU0, MU1, MU2, numcomp[0]*numcomp[1]))
+    # every block is cleared by the kernel right before it is computed
+    entries = np.empty((MU0, MU1, MU2, numcomp[0]*numcomp[1]))
 
     cdef int num_threads = pyiga.get_max_threads()
 
-    for mu0 in prange(MU0, num_threads=num_threads, nogil=True):
-        _asm_core_vec_3d_kernel(asm, symmetric,
-            bidx0, bidx1, bidx2,
-            transp0, transp1, transp2,
-            numcomp,
-            entries,
-            mu0)
+    if symmetric:
+        for mu0 in prange(MU0, num_threads=num_threads, nogil=True, schedule='dynamic'):
+            _asm_core_vec_3d_kernel_sym(asm,
+                bidx0_i, bidx0_j, bidx1_i, bidx1_j, bidx2_i, bidx2_j,
+                transp0, transp1, transp2,
+                lower1, blocks1,
+                lower2, blocks2,
+                numcomp,
+                entries,
+                mu0)
+    else:
+        # collapse the block loops into one flat parallel loop
+        for flat in prange(MU0 * MU1 * MU2, num_threads=num_threads, nogil=True):
+            _asm_core_vec_3d_kernel_nosym(asm,
+                bidx0_i, bidx0_j, bidx1_i, bidx1_j, bidx2_i, bidx2_j,
+                numcomp,
+                entries,
+                flat)
     return entries
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.initializedcheck(False)
-cdef void _asm_core_vec_3d_kernel(
+@cython.cdivision(True)
+cdef void _asm_core_vec_3d_kernel_sym(
     BaseVectorAssembler3D asm,
-    bint symmetric,
-    unsigned[:, ::1] bidx0, unsigned[:, ::1] bidx1, unsigned[:, ::1] bidx2,
+    unsigned[::1] bidx0_i, unsigned[::1] bidx0_j, unsigned[::1] bidx1_i, unsigned[::1] bidx1_j, unsigned[::1] bidx2_i, unsigned[::1] bidx2_j,
     size_t[::1] transp0, size_t[::1] transp1, size_t[::1] transp2,
+    size_t[::1] lower1, size_t[::1] blocks1,
+    size_t[::1] lower2, size_t[::1] blocks2,
     size_t[2] numcomp,
     double[:, :, :, ::1] entries,
     long _mu0
 ) nogil:
-    cdef size_t[3] i, j
-    cdef int diag0, diag1, diag2
-    cdef long mu0, mu1, mu2, MU0, MU1, MU2
+    cdef size_t i0, i1, i2, j0, j1, j2
+    cdef int diag0
+    cdef bint ondiag0, ondiag1, ondiag2
     cdef int row, col
+    cdef double* dst
+    cdef size_t t0, t1, t2      # transposed block indices
+    cdef size_t* blk1
+    cdef size_t* blk2
+    cdef size_t nblk1, nblk2, m1, m2
+    cdef long mu0, mu1, mu2, MU0, MU1, MU2
+    cdef double* src
+    # copy the component counts into locals; they cannot change across the
+    # opaque entry_impl() calls, which the compiler cannot know for numcomp[]
+    cdef size_t nc0 = numcomp[0], nc1 = numcomp[1], ncc = nc0 * nc1
 
     mu0 = _mu0
-    MU0, MU1, MU2 = bidx0.shape[0], bidx1.shape[0], bidx2.shape[0]
+    MU0, MU1, MU2 = bidx0_i.shape[0], bidx1_i.shape[0], bidx2_i.shape[0]
 
-    i[0] = bidx0[mu0, 0]
-    j[0] = bidx0[mu0, 1]
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
 
-    if symmetric:
-        diag0 = <int>j[0] - <int>i[0]
-        if diag0 > 0:       # block is above diagonal?
-            return
+    diag0 = <int>j0 - <int>i0
+    if diag0 > 0:       # block is above diagonal?
+        return
+    ondiag0 = (diag0 == 0)
+    t0 = transp0[mu0]
+
+    if ondiag0:     # skip blocks above the diagonal
+        blk1 = &lower1[0]
+        nblk1 = lower1.shape[0]
+    else:
+        blk1 = &blocks1[0]
+        nblk1 = MU1
+    for m1 in range(nblk1):
+        mu1 = blk1[m1]
+        i1 = bidx1_i[mu1]
+        j1 = bidx1_j[mu1]
+
+        ondiag1 = ondiag0 & (j1 == i1)
+        t1 = transp1[mu1]
+
+        if ondiag1:     # skip blocks above the diagonal
+            blk2 = &lower2[0]
+            nblk2 = lower2.shape[0]
+        else:
+            blk2 = &blocks2[0]
+            nblk2 = MU2
+        for m2 in range(nblk2):
+            mu2 = blk2[m2]
+            i2 = bidx2_i[mu2]
+            j2 = bidx2_j[mu2]
 
-    for mu1 in range(MU1):
-        i[1] = bidx1[mu1, 0]
-        j[1] = bidx1[mu1, 1]
+            ondiag2 = ondiag1 & (j2 == i2)
+            t2 = transp2[mu2]
 
-        if symmetric:
-            diag1 = <int>j[1] - <int>i[1]
-            if diag0 == 0 and diag1 > 0:
-                continue
+            src = &entries[ mu0, mu1, mu2, 0 ]
+            memset(src, 0, ncc * sizeof(double))
+            asm.entry_impl(i0, i1, i2, j0, j1, j2, src)
 
-        for mu2 in range(MU2):
-            i[2] = bidx2[mu2, 0]
-            j[2] = bidx2[mu2, 1]
+            if not ondiag2:     # are we off the diagonal?
+                # both blocks are contiguous; copy the transposed block through raw pointers
+                dst = &entries[ t0, t1, t2, 0 ]
+                for row in range(nc1):
+                    for col in range(nc0):
+                        dst[col*nc0 + row] = src[row*nc0 + col]
 
-            if symmetric:
-                diag2 = <int>j[2] - <int>i[2]
-                if diag0 == 0 and diag1 == 0 and diag2 > 0:
-                    continue
 
-            asm.entry_impl(i, j, &entries[ mu0, mu1, mu2, 0 ])
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+@cython.cdivision(True)
+cdef void _asm_core_vec_3d_kernel_nosym(
+    BaseVectorAssembler3D asm,
+    unsigned[::1] bidx0_i, unsigned[::1] bidx0_j, unsigned[::1] bidx1_i, unsigned[::1] bidx1_j, unsigned[::1] bidx2_i, unsigned[::1] bidx2_j,
+    size_t[2] numcomp,
+    double[:, :, :, ::1] entries,
+    long _flat
+) nogil:
+    cdef size_t i0, i1, i2, j0, j1, j2
+    cdef long mu0, mu1, mu2, MU0, MU1, MU2
+    cdef double* src
+    # copy the component counts into locals; they cannot change across the
+    # opaque entry_impl() calls, which the compiler cannot know for numcomp[]
+    cdef size_t nc0 = numcomp[0], nc1 = numcomp[1], ncc = nc0 * nc1
+
+    # without symmetry, all blocks are independent; the caller runs a single
+    # flat loop over the whole block space and we decompose the flat index
+    # into the multi-index (mu0, ..., mu2) in C order
+    MU0, MU1, MU2 = bidx0_i.shape[0], bidx1_i.shape[0], bidx2_i.shape[0]
+    mu2 = _flat % MU2
+    _flat = _flat // MU2
+    mu1 = _flat % MU1
+    _flat = _flat // MU1
+    mu0 = _flat
+
+    i0 = bidx0_i[mu0]
+    j0 = bidx0_j[mu0]
+    i1 = bidx1_i[mu1]
+    j1 = bidx1_j[mu1]
+    i2 = bidx2_i[mu2]
+    j2 = bidx2_j[mu2]
+
+    src = &entries[ mu0, mu1, mu2, 0 ]
+    memset(src, 0, ncc * sizeof(double))
+    asm.entry_impl(i0, i1, i2, j0, j1, j2, src)
 
-            if symmetric:
-                if diag0 != 0 or diag1 != 0 or diag2 != 0:     # are we off the diagonal?
-                    for row in range(numcomp[1]):
-                        for col in range(numcomp[0]):
-                            entries[transp0[mu0], transp1[mu1], transp2[mu2], col*numcomp[0] + row] = entries[mu0, mu1, mu2, row*numcomp[0] + col]
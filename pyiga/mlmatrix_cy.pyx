@@ -259,10 +259,12 @@ def get_transpose_idx_for_bidx(bidx):
 
 def symmetrize_X_2d(X, bidx):
     cdef unsigned[:, ::1] bidx0, bidx1
-    cdef unsigned MU0, MU1
+    cdef unsigned MU0, MU1, mu0, mu1
     cdef size_t[::1] transp0, transp1
     cdef double[:, ::1] values = X
     cdef size_t[2] i, j
+    cdef int diag0, diag1
+    cdef bint ondiag0
 
     bidx0, bidx1 = bidx
     MU0, MU1 = bidx0.shape[0], bidx1.shape[0]
@@ -270,8 +272,6 @@ def symmetrize_X_2d(X, bidx):
     transp0 = get_transpose_idx_for_bidx(bidx0)
     transp1 = get_transpose_idx_for_bidx(bidx1)
 
-    entries = np.zeros((MU0, MU1))
-
     for mu0 in range(MU0):
         i[0] = bidx0[mu0, 0]
         j[0] = bidx0[mu0, 1]
@@ -279,16 +279,18 @@ def symmetrize_X_2d(X, bidx):
         diag0 = <int>j[0] - <int>i[0]
         if diag0 > 0:       # block is above diagonal?
             continue
+        ondiag0 = (diag0 == 0)
 
         for mu1 in range(MU1):
             i[1] = bidx1[mu1, 0]
             j[1] = bidx1[mu1, 1]
 
+            # combine the conditions with '&' to avoid a chain of branches
             diag1 = <int>j[1] - <int>i[1]
-            if (diag0 == 0) and (diag1 > 0):
+            if ondiag0 & (diag1 > 0):       # block is above diagonal?
                 continue
 
-            if diag0 != 0 or diag1 != 0:
+            if not (ondiag0 & (diag1 == 0)):   # are we off the diagonal?
                 values[ transp0[mu0], transp1[mu1] ] = values[ mu0, mu1 ]
 
 
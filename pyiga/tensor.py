@@ -31,6 +31,8 @@ from __future__ import print_function
 import numpy as np
 import numpy.linalg
 import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 
 from functools import reduce
 import operator
@@ -103,6 +105,22 @@ def asarray(X):
     else:
         return np.asanyarray(X)
 
+def _asarray_into(X, out):
+    """Add the tensor `X` in full format to the ndarray `out`."""
+    if hasattr(X, 'asarray_into'):
+        X.asarray_into(out)
+    else:
+        out += asarray(X)
+
+def _result_dtype(X):
+    """Return the dtype of the full representation of the tensor `X`."""
+    if isinstance(X, TuckerTensor):
+        return np.result_type(X.X, *(U.dtype for U in X.Us))
+    elif isinstance(X, (CanonicalTensor, TensorSum, TensorProd)):
+        return np.result_type(*(_result_dtype(Y) for Y in X.Xs))
+    else:
+        return np.asanyarray(X).dtype
+
 def matricize(X, k):
     """Return the mode-`k` matricization of the ndarray `X`."""
     nk = X.shape[k]
@@ -139,34 +157,68 @@ def hosvd(X):
         being square and orthogonal.
     """
     # left singular vectors for each matricization
-    U = [scipy.linalg.svd(matricize(X,k), full_matrices=False, check_finite=False)[0]
-            for k in range(X.ndim)]
+    if X.ndim > 1 and len(set(X.shape)) == 1:
+        # all matricizations have the same shape: compute their SVDs in one batch
+        M = np.stack([matricize(X,k) for k in range(X.ndim)])
+        U = list(np.linalg.svd(M, full_matrices=False)[0])
+    else:
+        U = [scipy.linalg.svd(matricize(X,k), full_matrices=False, check_finite=False)[0]
+                for k in range(X.ndim)]
     C = apply_tprod(tuple(Uk.T for Uk in U), X)   # core tensor (same size as X)
     return TuckerTensor(U, C)
 
-def _find_best_truncation_axis(X):
-    """Find the axis along which truncating the last slice causes the smallest error."""
-    errors = [np.linalg.norm(np.swapaxes(X, i, 0)[-1].ravel())
-              for i in range(X.ndim)]
-    i = np.argmin(errors)
-    return i, errors[i]
-
 def find_truncation_rank(X, tol=1e-12):
     """A greedy algorithm for finding a good truncation rank for a HOSVD core tensor."""
+    d = X.ndim
+    Xsq = X**2
+    # squared norms of all slices along each axis; these are updated as slices
+    # are truncated instead of being recomputed from the truncated tensor
+    slice_sq = [Xsq.sum(axis=tuple(j for j in range(d) if j != k)) for k in range(d)]
+    shape = list(X.shape)
     total_err_squ = 0.0
     tolsq = tol**2
-    while X.size > 0:
-        ax,err = _find_best_truncation_axis(X)
-        total_err_squ += err**2
+    while min(shape) > 0:
+        # find the axis along which truncating the last slice causes the smallest error
+        errors = [slice_sq[k][shape[k] - 1] for k in range(d)]
+        ax = int(np.argmin(errors))
+        total_err_squ += errors[ax]
         if total_err_squ > tolsq:
             break
         else:
-            # truncate one slice off axis ax
-            sl = X.ndim * [slice(None)]
-            sl[ax] = slice(None, -1)
-            X = X[sl]
-    return X.shape
-
+            # truncate one slice off axis ax and remove its contribution
+            # from the slice norms along the other axes
+            sl = [slice(None, n) for n in shape]
+            sl[ax] = shape[ax] - 1
+            S = Xsq[tuple(sl)]
+            others = _without_k(list(range(d)), ax)
+            for i, k in enumerate(others):
+                slice_sq[k][:shape[k]] -= S.sum(axis=tuple(j for j in range(d - 1) if j != i))
+            shape[ax] -= 1
+    return tuple(shape)
+
+
+def _einsum_labels(n):
+    """Return `n` distinct single-letter axis labels for use with `np.einsum`."""
+    letters = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    assert n <= len(letters), 'too many axes for einsum'
+    return letters[:n]
+
+_einsum_paths = {}
+
+def _einsum(subscripts, *operands):
+    """Evaluate `np.einsum` with an optimized contraction order.
+
+    The contraction path is planned once for each combination of subscripts
+    and operand shapes and then reused.
+    """
+    key = (subscripts,) + tuple(op.shape for op in operands)
+    path = _einsum_paths.get(key)
+    if path is None:
+        path = np.einsum_path(subscripts, *operands, optimize='greedy')[0]
+        if len(_einsum_paths) >= 256:   # keep the cache bounded
+            _einsum_paths.clear()
+        _einsum_paths[key] = path
+    return np.einsum(subscripts, *operands, optimize=path)
 
 def outer(*xs):
     """Outer product of an arbitrary number of vectors.
@@ -176,10 +228,10 @@ def outer(*xs):
     Returns:
         ndarray: the outer product as an `ndarray` with `d` dimensions
     """
-    if len(xs) == 1:
-        return xs[0]
-    else:
-        return outer(*xs[:-1])[..., None] * xs[-1][None, ...]
+    # a single einsum call, e.g. 'a,b,c->abc', avoids the intermediate arrays
+    # of a sequence of pairwise outer products
+    idx = _einsum_labels(len(xs))
+    return np.einsum(','.join(idx) + '->' + ''.join(idx), *xs)
 
 def array_outer(*xs):
     """Outer product of an arbitrary number of ndarrays.
@@ -192,8 +244,8 @@ def array_outer(*xs):
     """
     if len(xs) == 1:
         return xs[0]
-    else:
-        return np.multiply.outer(array_outer(*xs[:-1]), xs[-1])
+    # np.multiply.outer writes each pairwise product directly into its output
+    return reduce(np.multiply.outer, xs)
 
 
 ################################################################################
@@ -201,20 +253,46 @@ def array_outer(*xs):
 ################################################################################
 
 
-def _dot_rank1(xs, ys):
-    """Compute the inner (Frobenius) product of two rank 1 tensors."""
-    return np.prod(tuple(np.dot(xs[j], ys[j]) for j in range(len(xs))))
+def _stack_sparse(mats):
+    """Represent a list of sparse matrices of identical shape on their joint
+    sparsity pattern.
 
-def _apply_lowrank(Ts, xs):
-    """Apply a sum of rank 1 operators to a rank 1 tensor."""
-    return list(
-            tuple(T[j].dot(xs[j])
-                for j in range(len(T)))
-            for T in Ts)
+    Returns:
+        A pair `(P, D)`, where `P` is a CSR matrix with the union of the
+        sparsity patterns and `D` is an array of shape `(len(mats), P.nnz)`
+        such that ``mats[i]`` equals `P` with its data replaced by ``D[i]``.
+    """
+    mats = [M.tocoo() for M in mats]
+    m, n = mats[0].shape
+    keys = [M.row.astype(np.int64) * n + M.col for M in mats]
+    allkeys = np.unique(np.concatenate(keys))
+    P = scipy.sparse.csr_matrix(
+            (np.ones(len(allkeys)), (allkeys // n, allkeys % n)), shape=(m, n))
+    D = np.zeros((len(mats), len(allkeys)))
+    for i, M in enumerate(mats):
+        # allkeys is in row-major order, i.e., in the CSR order of P;
+        # duplicate COO entries are summed
+        np.add.at(D[i], np.searchsorted(allkeys, keys[i]), M.data)
+    return P, D
+
+def _kron_sum(Bs):
+    """Sum of Kronecker products of matrices.
 
-def _multi_kron(As):
-    """Kronecker product of an arbitrary number of matrices."""
-    return As[0] if len(As)==1 else np.kron(As[0], _multi_kron(As[1:]))
+    Args:
+        Bs: a list of `d` arrays of shape `(N, m_k, n_k)`
+    Returns:
+        ndarray: the sum over `j < N` of the Kronecker products
+        ``Bs[0][j] x ... x Bs[d-1][j]``
+    """
+    # form the entries in one contraction over the summation index as a
+    # 2d-dimensional tensor, e.g. 'zai,zbj,zck->abcijk', and group its
+    # row and column axes
+    d = len(Bs)
+    idx = _einsum_labels(2 * d + 1)
+    rows, cols, j = idx[:d], idx[d:2*d], idx[-1]
+    subs = ','.join(j + r + c for (r, c) in zip(rows, cols)) + '->' + rows + cols
+    K = _einsum(subs, *Bs)
+    return K.reshape((np.prod([B.shape[1] for B in Bs]), np.prod([B.shape[2] for B in Bs])))
 
 
 def als1(A, tol=1e-15):
@@ -249,6 +327,19 @@ def _without_k(L, k):
     return L[:k] + L[k+1:]
 
 
+def _contract_rank1_rows(A, xs, k):
+    """For a full tensor `A` and matrices `xs[j]` of size `R x n_j`, compute the
+    `R x n_k` matrix whose `r`-th row is `A` contracted with the `r`-th rows of
+    all `xs[j]`, `j != k`, along all axes except `k`.
+    """
+    d = A.ndim
+    idx = _einsum_labels(d + 1)
+    r = idx[d]
+    subs = [idx[:d]] + [r + idx[j] for j in range(d) if j != k]
+    return np.einsum(','.join(subs) + '->' + r + idx[k],
+            A, *_without_k(xs, k), optimize=True)
+
+
 def als(A, R, tol=1e-10, maxiter=10000, startval=None):
     """Compute best rank `R` approximation to tensor `A` using Alternating Least Squares.
 
@@ -283,21 +374,40 @@ def als(A, R, tol=1e-10, maxiter=10000, startval=None):
 
     for it in range(maxiter):
         delta = 0.0
+        # entrywise products of the matrices x_j x_j^T for j < k (already
+        # updated in this sweep) and for j > k (from the previous sweep)
+        prefix = np.ones((R, R))
+        suffix = [np.ones((R, R))]
+        for j in reversed(range(1, d)):
+            suffix.append(suffix[-1] * xxT[j])
+        suffix.reverse()    # suffix[k] = product over j > k
+
         for k in range(d):
-            C = np.empty((R, A.shape[k]))
-            for r in range(R):
-                for j in range(d):
-                    ys[j] = xs[j][r:r+1,:]
-                ys[k] = None
-                C[r, :] = apply_tprod(ys, A).ravel()
+            if isinstance(A, np.ndarray):
+                C = _contract_rank1_rows(A, xs, k)
+            else:
+                C = np.empty((R, A.shape[k]))
+                for r in range(R):
+                    for j in range(d):
+                        ys[j] = xs[j][r:r+1,:]
+                    ys[k] = None
+                    C[r, :] = apply_tprod(ys, A).ravel()
 
             # entrywise product of the matrices (x_j x_j^T) (size R x R) for all j != k
-            Gamma = np.prod(_without_k(xxT, k), axis=0)
+            Gamma = prefix * suffix[k]
 
             delta = delta + fro_norm(-C + Gamma.dot(xs[k]))**2
-            xs[k] = np.linalg.solve(Gamma, C)
+            # Gamma is symmetric positive semidefinite; use a Cholesky solve
+            # unless it is numerically singular
+            try:
+                xs[k] = scipy.linalg.cho_solve(
+                        scipy.linalg.cho_factor(Gamma, check_finite=False),
+                        C, check_finite=False)
+            except np.linalg.LinAlgError:
+                xs[k] = np.linalg.solve(Gamma, C)
             # update x[k] x[k]^T
             xxT[k] = xs[k].dot(xs[k].T)
+            prefix *= xxT[k]
         if (np.sqrt(delta) / A_norm) < tol:
             break
     return CanonicalTensor((x.T for x in xs))
@@ -305,14 +415,16 @@ def als(A, R, tol=1e-10, maxiter=10000, startval=None):
 
 def grou(A, R, tol=1e-12, return_errors=False):
     """Approximation by Greedy rank one updates."""
-    E = asarray(A)
+    A = asarray(A)
+    # residual; copy since it is updated in place
+    E = np.array(A, dtype=np.result_type(A, np.float64))
     terms = []
     errors = []
 
     for j in range(R):
         xs = als1(E)
         terms.append(xs)
-        E = E - outer(*xs)
+        E -= outer(*xs)
         err = fro_norm(E)
         errors.append(err)
         if err < tol:
@@ -327,23 +439,35 @@ def als1_ls(A, B, tol=1e-15, maxiter=10000):
     rankA = len(A)
     xs = list(np.random.rand(B.shape[j]) for j in range(d))
 
-    # precompute the sparse matrices Ai^A A_j for each coordinate axis
-    AitAj = [[[ (A[i][k].T.dot(A[j][k])).tocsr()
-                for j in range(rankA)]
-                for i in range(rankA)]
+    # precompute the sparse matrices Ai^A A_j for each coordinate axis,
+    # stored as data arrays on a common sparsity pattern per axis
+    AitAj = [_stack_sparse(
+                [(A[i][k].T.dot(A[j][k])).tocsr()
+                    for i in range(rankA)
+                    for j in range(rankA)])
                 for k in range(d)]
 
+    # the vectors A_j[k] x_k; only those for the axis which was just solved
+    # for change, so they are updated one axis at a time
+    Ax = [[A[j][k].dot(xs[k]) for k in range(d)] for j in range(rankA)]
+
     for it in range(maxiter):
         delta = 1.0
         for k in range(d):
-            ys = _apply_lowrank([_without_k(Ar,k) for Ar in A], _without_k(xs, k))
+            ys = [_without_k(Axj, k) for Axj in Ax]
 
             # compute left-hand side matrix
-            #ZtZ = sum(dot_rank1(ys[i], ys[j]) * A[i][k].T.dot(A[j][k])
+            #ZtZ = sum(<ys[i], ys[j]> * A[i][k].T.dot(A[j][k])
             #          for j in range(rankA) for i in range(rankA))
-            ZtZ = reduce(operator.add,
-                         (_dot_rank1(ys[i], ys[j]) * AitAj[k][i][j]
-                             for j in range(rankA) for i in range(rankA)))
+            # where the inner products of the rank 1 tensors ys[i] are the
+            # entrywise products of the Gram matrices along all axes but k
+            W = reduce(np.multiply,
+                    (Y.dot(Y.T) for Y in
+                        (np.array([Ax[j][l] for j in range(rankA)]) for l in range(d) if l != k)),
+                    np.ones((rankA, rankA)))
+            P, D = AitAj[k]
+            ZtZ = scipy.sparse.csr_matrix(
+                    (W.ravel().dot(D), P.indices, P.indptr), shape=P.shape)
 
             # compute right-hand side
             b = np.zeros(B.shape[k])
@@ -357,6 +481,8 @@ def als1_ls(A, B, tol=1e-15, maxiter=10000):
             xk = scipy.sparse.linalg.spsolve(ZtZ, b)
             delta *= np.linalg.norm(xs[k] - xk)
             xs[k] = xk
+            for j in range(rankA):
+                Ax[j][k] = A[j][k].dot(xk)
 
         if delta < tol:
             break
@@ -379,7 +505,8 @@ def gta(A, R, tol=1e-12, rtol=1e-12, return_errors=False):
         X = asarray(apply_tprod(tuple(u.T for u in U), A))
         T = TuckerTensor(U, X)
 
-        E = A - T
+        # expand the residual once; it is needed both for the error and for als1
+        E = asarray(A - T)
         err = fro_norm(E)
         errors.append(err)
 
@@ -411,9 +538,8 @@ def gta_ls(A, F, R, tol=1e-12, verbose=0, gs=None):
 
     for it in range(R):
         # construct reduced linear system in tensor product basis U
-        A_U = reduce(operator.add,
-                     (_multi_kron([U[k].T.dot(A[j][k].dot(U[k])) for k in range(d)])
-                      for j in range(rankA)))
+        A_U = _kron_sum([np.stack([U[k].T.dot(A[j][k].dot(U[k])) for j in range(rankA)])
+                         for k in range(d)])
         F_U = apply_tprod([u.T for u in U], F).ravel()
         shpX = tuple(U[k].shape[1] for k in range(d))
 
@@ -528,10 +654,19 @@ class CanonicalTensor:
 
     def asarray(self):
         """Convert canonical tensor to a full `ndarray`."""
-        X = np.zeros(self.shape)
+        # sum over all rank 1 terms in one contraction, e.g. 'az,bz,cz->abc'
+        idx = _einsum_labels(self.ndim + 1)
+        out, r = idx[:-1], idx[-1]
+        return _einsum(','.join(i + r for i in out) + '->' + out, *self.Xs)
+
+    def asarray_into(self, out):
+        """Add the full representation of this tensor to the `ndarray` `out`."""
+        tmp = np.empty(self.shape)  # reused for all rank 1 terms
+        idx = _einsum_labels(self.ndim)
+        subs = ','.join(idx) + '->' + idx
         for r in range(self.R):
-            X += outer(*tuple(X[:,r] for X in self.Xs))
-        return X
+            np.einsum(subs, *(X[:,r] for X in self.Xs), out=tmp)
+            out += tmp
 
     def terms(self):
         """Return the rank one components as a list of tuples."""
@@ -540,10 +675,10 @@ class CanonicalTensor:
 
     def norm(self):
         """Compute the Frobenius norm of the tensor."""
-        return np.sqrt(
-            sum(_dot_rank1(ti, tj)
-                for ti in self.terms()
-                for tj in self.terms()))
+        # the inner product of terms i and j is the product over all axes of
+        # the entries (i,j) of the Gram matrices X^T X
+        G = reduce(np.multiply, (X.T.dot(X) for X in self.Xs))
+        return np.sqrt(max(G.sum(), 0.0))
 
     def nway_prod(self, Bs):
         """Implements :func:`apply_tprod` for canonical tensors.
@@ -625,9 +760,33 @@ class TuckerTensor:
         """Create a deep copy of this tensor."""
         return TuckerTensor((U.copy() for U in self.Us), self.X.copy())
 
-    def asarray(self):
-        """Convert Tucker tensor to a full `ndarray`."""
-        return apply_tprod(self.Us, self.X)
+    def asarray(self, dtype=None):
+        """Convert Tucker tensor to a full `ndarray`.
+
+        Args:
+            dtype: if given, the basis matrices and the core tensor are
+                converted to this type (e.g., `np.float32`) before the
+                expansion, which is then also computed in this precision.
+                This reduces the memory traffic when full accuracy is not
+                needed. If some of the basis matrices are sparse matrices or
+                `LinearOperator` objects, only the core tensor and the
+                result are converted.
+        """
+        if not all(isinstance(U, np.ndarray) for U in self.Us):
+            if dtype is None:
+                return apply_tprod(self.Us, self.X)
+            X = apply_tprod(self.Us, self.X.astype(dtype, copy=False))
+            return X.astype(dtype, copy=False)
+        if dtype is not None:
+            return TuckerTensor((U.astype(dtype, copy=False) for U in self.Us),
+                    self.X.astype(dtype, copy=False)).asarray()
+        # contract the core with all basis matrices at once, e.g. 'ad,be,cf,def->abc',
+        # in the cheapest pairwise order
+        d = self.ndim
+        idx = _einsum_labels(2 * d)
+        out, core = idx[:d], idx[d:]
+        subs = ','.join(o + c for (o, c) in zip(out, core)) + ',' + core + '->' + out
+        return _einsum(subs, *(self.Us + (self.X,)))
 
     def orthogonalize(self):
         """Compute an equivalent Tucker representation of the current tensor
@@ -654,7 +813,10 @@ class TuckerTensor:
 
     def norm(self):
         """Compute the Frobenius norm of the tensor."""
-        return fro_norm(self.orthogonalize().X)
+        # ||T||^2 = <X, (U_1^T U_1 x ... x U_d^T U_d) X>, which avoids
+        # orthogonalizing the bases
+        GX = apply_tprod([U.T.dot(U) for U in self.Us], self.X)
+        return np.sqrt(max(np.vdot(self.X, GX), 0.0))
 
     def truncate(self, k):
         """Truncate a Tucker tensor `T` to the given rank `k`."""
@@ -744,11 +906,15 @@ class TensorSum:
 
     def asarray(self):
         """Convert sum of tensors to a full `ndarray`."""
-        A = np.array(asarray(self.Xs[0]))
-        for X in self.Xs[1:]:
-            A += asarray(X)
+        A = np.zeros(self.shape, dtype=_result_dtype(self))
+        self.asarray_into(A)
         return A
 
+    def asarray_into(self, out):
+        """Add the full representation of this tensor to the `ndarray` `out`."""
+        for X in self.Xs:
+            _asarray_into(X, out)
+
     def ravel(self):
         """Return the vectorization of this tensor."""
         return self.asarray().ravel()
@@ -676,9 +676,11 @@ class LiteralVectorExpr(Expr):
 class LiteralMatrixExpr(Expr):
     """Matrix expression which is represented by a 2D array of individual expressions."""
     def __init__(self, entries):
-        entries = np.array(entries, dtype=object)
-        self.shape = entries.shape
-        self.children = tuple(as_expr(e) for e in entries.flat)
+        rows = tuple(tuple(row) for row in entries)
+        if not rows or any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError('matrix entries should be given as a nonempty 2D array')
+        self.shape = (len(rows), len(rows[0]))
+        self.children = tuple(as_expr(e) for row in rows for e in row)
         if not all(e.is_scalar() for e in self.children):
             raise ValueError('all matrix entries should be scalars')
     def __str__(self):
@@ -714,7 +716,7 @@ class MatrixEntryExpr(Expr):
     def to_seq(self, i, j):
         if self.x.symmetric and i > j:
             i, j = j, i
-        return i * self.x.shape[0] + j
+        return i * self.x.shape[1] + j
     def hash_key(self):
         return (self.i, self.j)
     def gencode(self):
@@ -1254,7 +1256,7 @@ def wave_st_vf(dim):
 def divdiv_vf(dim):
     V = VForm(dim, vec=dim**2)
     u, v = V.basisfuns(components=(dim,dim))
-    V.add(div(u) * div(v) * dx)
+    V.add(div(u) * (div(v) * dx))
     return V
 
 def L2functional_vf(dim):
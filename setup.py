@@ -1,3 +1,7 @@
+import os
+import shutil
+import tempfile
+
 from setuptools import setup
 from setuptools.extension import Extension
 from Cython.Build import cythonize
@@ -6,7 +10,30 @@ import numpy
 import Cython.Compiler.Options
 Cython.Compiler.Options.cimport_from_pyx = True
 
-USE_OPENMP = True
+
+def has_openmp():
+    """Check whether the C compiler can build and link an OpenMP program."""
+    from distutils.ccompiler import new_compiler
+    from distutils.sysconfig import customize_compiler
+    from distutils.errors import CompileError, LinkError
+
+    cc = new_compiler()
+    customize_compiler(cc)
+    tmpdir = tempfile.mkdtemp()
+    try:
+        src = os.path.join(tmpdir, 'omptest.c')
+        with open(src, 'w') as f:
+            f.write('#include <omp.h>\nint main() { return omp_get_max_threads() > 0 ? 0 : 1; }\n')
+        objs = cc.compile([src], output_dir=tmpdir, extra_postargs=['-fopenmp'])
+        cc.link_executable(objs, os.path.join(tmpdir, 'omptest'), extra_postargs=['-fopenmp'])
+        return True
+    except (CompileError, LinkError):
+        return False
+    finally:
+        shutil.rmtree(tmpdir)
+
+# without OpenMP, the prange loops in the assembler kernels simply run serially
+USE_OPENMP = has_openmp()
 
 c_args = ['-O3', '-march=native', '-ffast-math']
 
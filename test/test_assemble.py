@@ -148,6 +148,18 @@ def test_stiffness_geo_3d():
         "poisson_neu_d3_p2_n10_stiff.mtx.gz"))
     assert abs(A - A_ref).max() < 1e-14
 
+def test_assemble_multi():
+    for dim, geo in ((2, geometry.bspline_quarter_annulus()), (3, geometry.twisted_box())):
+        kvs = dim * (bspline.make_knots(2, 0.0, 1.0, 5),)
+        if dim == 2:
+            asms = (assemblers.MassAssembler2D(kvs, geo), assemblers.StiffnessAssembler2D(kvs, geo))
+        else:
+            asms = (assemblers.MassAssembler3D(kvs, geo), assemblers.StiffnessAssembler3D(kvs, geo))
+        for symmetric in (False, True):
+            M, A = assemble_multi(asms, symmetric=symmetric)
+            assert abs(M - mass(kvs, geo)).max() < 1e-14
+            assert abs(A - stiffness(kvs, geo)).max() < 1e-14
+
 def test_divdiv_geo_2d():
     kv = bspline.make_knots(3, 0.0, 1.0, 15)
     geo = geometry.bspline_quarter_annulus()
@@ -193,6 +205,18 @@ def test_fast_stiffness_geo_3d():
         "poisson_neu_d3_p2_n10_stiff.mtx.gz"))
     assert abs(A - A_ref).max() < 1e-9
 
+def test_compute_values_derivs():
+    from pyiga.assemble_tools_cy import compute_values_derivs
+    kv = bspline.make_knots(3, 0.0, 1.0, 6)
+    grid = np.linspace(0.0, 1.0, 17)
+    C = compute_values_derivs(kv, grid, derivs=2)
+    # layout: basis function, derivative, grid point
+    assert C.shape == (kv.numdofs, 3, len(grid))
+    assert C.flags.c_contiguous
+    colloc = bspline.collocation_derivs(kv, grid, derivs=2)
+    for d in range(3):
+        assert np.allclose(C[:, d, :], colloc[d].T.A)
+
 ################################################################################
 # Test right-hand side
 ################################################################################
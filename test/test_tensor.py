@@ -41,6 +41,12 @@ def test_tucker():
     assert np.allclose(T.asarray(), T.copy().asarray())
     ###
     X = _random_tucker((3,4,5), 2)
+    # single precision expansion
+    Y = X.asarray(dtype=np.float32)
+    assert Y.dtype == np.float32 and np.allclose(Y, X.asarray(), rtol=1e-5)
+    Z = TuckerTensor((aslinearoperator(U) for U in X.Us), X.X)
+    Y = Z.asarray(dtype=np.float32)
+    assert Y.dtype == np.float32 and np.allclose(Y, X.asarray(), rtol=1e-5)
     # orthogonalize
     assert np.allclose(X.asarray(), X.orthogonalize().asarray())
     # add and sub
@@ -152,6 +158,10 @@ def test_grou():
     assert np.allclose(X.asarray(), Y.asarray())
     Y = grou(X.asarray(), R=2)
     assert np.allclose(X.asarray(), Y.asarray())
+    # integer input
+    A = np.arange(60).reshape(3,4,5)
+    Y = grou(A, R=2)
+    assert Y.shape == A.shape and fro_norm(A - Y.asarray()) < fro_norm(A)
 
 def test_tensorsum():
     X = _random_canonical((3,4,5), R=2)
@@ -164,6 +174,15 @@ def test_tensorsum():
     assert np.allclose(
             apply_tprod(U, X).asarray(),
             apply_tprod(U, AB).asarray())
+    # the result has the common dtype of all terms
+    C = rand(3,4,5) + 1j * rand(3,4,5)
+    D = rand(3,4,5)
+    for S in (TensorSum(C, D), TensorSum(D, C)):
+        assert S.asarray().dtype == np.complex128
+        assert np.allclose(S.asarray(), C + D)
+    T = _random_tucker((3,4,5), 2)
+    T = TuckerTensor((U.astype(np.float32) for U in T.Us), T.X.astype(np.float32))
+    assert TensorSum(T, T).asarray().dtype == np.float32
 
 def test_tensorprod():
     A = _random_tucker((2,3), 2)